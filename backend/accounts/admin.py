@@ -1,10 +1,11 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from core.db_router import ReplicaChangeListMixin
 from .models import User, Profile
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(ReplicaChangeListMixin, BaseUserAdmin):
     """사용자 관리자"""
     list_display = ('email', 'username', 'is_staff', 'is_active', 'created_at')
     list_filter = ('is_staff', 'is_active', 'created_at')
@@ -0,0 +1,103 @@
+"""비밀번호 해시 설정과 해시 계산용 스레드 풀
+
+해시 비용(반복 횟수, 메모리)은 설정(환경변수)으로 정하며, 저장된 해시의 비용이
+현재 설정과 다르면 다음 로그인 때 새 설정으로 다시 해시해서 저장된다.
+
+해시 계산(hashlib, argon2)은 GIL 을 놓고 실행되므로 스레드 풀에서 돌리면 같은
+워커의 다른 요청 스레드가 계속 처리된다. 동시에 계산하는 수를 PASSWORD_HASH_WORKERS 로,
+대기하는 수를 PASSWORD_HASH_QUEUE 로 제한하고, 넘치면 기다리지 않고 503 을 반환한다.
+(DRF 밖의 관리자 로그인 등은 accounts.middleware.HashingBusyMiddleware 가 503 으로 바꿈)
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class TunedArgon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """PASSWORD_ARGON2_* 설정을 따르는 Argon2 해셔"""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class TunedPBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PASSWORD_PBKDF2_ITERATIONS 설정을 따르는 PBKDF2 해셔"""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = '요청이 많아 잠시 후 다시 시도해주세요.'
+    default_code = 'hashing_busy'
+    # DRF 기본 예외 처리기가 Retry-After 헤더로 내려준다
+    wait = 1
+
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def _get_pool():
+    global _executor, _slots
+    with _executor_lock:
+        if _executor is None:
+            workers = settings.PASSWORD_HASH_WORKERS
+            _slots = threading.BoundedSemaphore(workers + settings.PASSWORD_HASH_QUEUE)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+    return _executor, _slots
+
+
+def _run_marked(function, args):
+    _local.in_pool = True
+    try:
+        return function(*args)
+    finally:
+        _local.in_pool = False
+
+
+def run_hashing(function, *args):
+    """해시 계산을 스레드 풀에서 실행하고 결과를 반환 (풀이 가득 차면 HashingBusy)"""
+    if not settings.PASSWORD_HASH_WORKERS or getattr(_local, 'in_pool', False):
+        return function(*args)
+    executor, slots = _get_pool()
+    if not slots.acquire(blocking=False):
+        raise HashingBusy()
+    try:
+        return executor.submit(_run_marked, function, args).result()
+    finally:
+        slots.release()
+
+
+def _verify(raw_password, encoded):
+    # 다시 해시해야 하는지만 기록하고 저장은 호출한 스레드에서 한다 (풀 스레드에서 DB 사용 안 함)
+    must_update = []
+    is_correct = hashers.check_password(raw_password, encoded, setter=must_update.append)
+    return is_correct, bool(must_update)
+
+
+def verify_password(raw_password, encoded):
+    """(비밀번호 일치 여부, 다시 해시해야 하는지) 를 스레드 풀에서 계산"""
+    return run_hashing(_verify, raw_password, encoded)
+
+
+def make_password(raw_password):
+    """스레드 풀에서 계산한 비밀번호 해시"""
+    return run_hashing(hashers.make_password, raw_password)
@@ -0,0 +1,123 @@
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+PASSWORD = 'benchmark-password-1234'
+
+# (메모리 KiB, 반복 횟수) 후보, 앞쪽 다섯 개는 OWASP 권장 최소 조합
+ARGON2_CANDIDATES = [
+    (7168, 5), (9216, 4), (12288, 3), (19456, 2), (47104, 1),
+    (19456, 3), (47104, 2), (65536, 2), (65536, 3), (102400, 2),
+]
+PBKDF2_MIN_ITERATIONS = 600000
+
+
+class Command(BaseCommand):
+    help = '이 서버에서 비밀번호 해셔별 해시 시간을 측정하고 목표 시간에 맞는 비용 설정을 추천합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target-ms', type=float, default=100, help='해시 한 번에 허용할 시간(ms)')
+        parser.add_argument('--rounds', type=int, default=5, help='측정 반복 횟수')
+
+    def handle(self, *args, **options):
+        self.rounds = options['rounds']
+        target = options['target_ms']
+
+        self.stdout.write(f'현재 설정 (CPU {os.cpu_count()}개, 목표 {target:.0f}ms)')
+        self.stdout.write(f'{"해셔":<48}{"해시":>10}{"확인":>10}')
+        for path in settings.PASSWORD_HASHERS:
+            hasher = import_string(path)()
+            try:
+                hasher.encode(PASSWORD, hasher.salt())
+            except ValueError:
+                self.stdout.write(f'{path:<48}{"(라이브러리 없음)":>20}')
+                continue
+            encoded = hasher.encode(PASSWORD, hasher.salt())
+            self.stdout.write(
+                f'{path:<48}{self.measure(hasher.encode, PASSWORD, hasher.salt()):>8.1f}ms'
+                f'{self.measure(hasher.verify, PASSWORD, encoded):>8.1f}ms'
+            )
+
+        self.stdout.write('\n추천 설정')
+        argon2 = self.recommend_argon2(target)
+        pbkdf2 = self.recommend_pbkdf2(target)
+        workers = self.recommend_workers(argon2 or pbkdf2)
+        self.stdout.write(f'PASSWORD_HASH_WORKERS={workers}')
+
+    def measure(self, function, *args):
+        """함수 실행 시간의 중앙값(ms)"""
+        timings = []
+        for _ in range(self.rounds):
+            started = time.perf_counter()
+            function(*args)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def recommend_argon2(self, target):
+        hasher = hashers.Argon2PasswordHasher()
+        try:
+            hasher._load_library()
+        except ValueError:
+            self.stdout.write('argon2-cffi 가 설치되어 있지 않아 Argon2 는 건너뜁니다.')
+            return None
+
+        hasher.parallelism = 1
+        best = None
+        for memory_cost, time_cost in ARGON2_CANDIDATES:
+            hasher.memory_cost, hasher.time_cost = memory_cost, time_cost
+            elapsed = self.measure(hasher.encode, PASSWORD, hasher.salt())
+            self.stdout.write(f'  argon2 m={memory_cost:<7} t={time_cost}  {elapsed:>8.1f}ms')
+            # 목표 시간 안에서 메모리 x 반복 횟수가 가장 큰 조합
+            if elapsed <= target and (best is None or memory_cost * time_cost > best[0] * best[1]):
+                best = (memory_cost, time_cost)
+
+        if best is None:
+            self.stdout.write(self.style.WARNING('목표 시간 안에 드는 Argon2 조합이 없습니다. --target-ms 를 늘려보세요.'))
+            return None
+        self.stdout.write(self.style.SUCCESS(
+            f'PASSWORD_HASHER=argon2\n'
+            f'PASSWORD_ARGON2_MEMORY_COST={best[0]}\n'
+            f'PASSWORD_ARGON2_TIME_COST={best[1]}\n'
+            f'PASSWORD_ARGON2_PARALLELISM=1'
+        ))
+        hasher.memory_cost, hasher.time_cost = best
+        return hasher
+
+    def recommend_pbkdf2(self, target):
+        hasher = hashers.PBKDF2PasswordHasher()
+        sample = 100000
+        elapsed = self.measure(hasher.encode, PASSWORD, hasher.salt(), sample)
+        iterations = int(sample * target / elapsed) // 10000 * 10000
+        self.stdout.write(f'  pbkdf2 {sample}회 {elapsed:.1f}ms -> 목표 시간 안에 {iterations}회')
+        if iterations < PBKDF2_MIN_ITERATIONS:
+            self.stdout.write(self.style.WARNING(
+                f'PBKDF2 는 목표 시간 안에서 권장 최소 {PBKDF2_MIN_ITERATIONS}회를 채우지 못합니다. Argon2 를 권장합니다.'
+            ))
+            return None
+        self.stdout.write(f'(pbkdf2 사용 시) PASSWORD_PBKDF2_ITERATIONS={iterations}')
+        hasher.iterations = iterations
+        return hasher
+
+    def recommend_workers(self, hasher):
+        """스레드 수를 늘려도 처리량이 거의 늘지 않는 지점 (해시 계산은 GIL 을 놓고 실행)"""
+        hasher = hasher or import_string(settings.PASSWORD_HASHERS[0])()
+        cpus = os.cpu_count() or 1
+        counts = sorted({1, 2, max(1, cpus // 2), cpus})
+        throughputs = {}
+        for count in counts:
+            jobs = count * self.rounds
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=count) as executor:
+                list(executor.map(lambda _: hasher.encode(PASSWORD, hasher.salt()), range(jobs)))
+            throughputs[count] = jobs / (time.perf_counter() - started)
+            self.stdout.write(f'  스레드 {count:<3} {throughputs[count]:>8.1f} 해시/초')
+
+        best = max(throughputs.values())
+        # 다른 요청이 쓸 CPU 를 남기기 위해 최대 처리량의 80% 에 처음 도달하는 스레드 수
+        return next(count for count in counts if throughputs[count] >= best * 0.8)
@@ -0,0 +1,20 @@
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+from .hashers import HashingBusy
+
+
+class HashingBusyMiddleware(MiddlewareMixin):
+    """DRF 밖(관리자 로그인 등)에서 발생한 HashingBusy 를 500 대신 503 으로 응답
+
+    DRF 뷰에서는 DRF 예외 처리기가 먼저 503 으로 바꾸므로 여기까지 오지 않는다.
+    """
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, HashingBusy):
+            return None
+        response = HttpResponse(
+            str(exception.detail), status=exception.status_code, content_type='text/plain; charset=utf-8',
+        )
+        response['Retry-After'] = str(exception.wait)
+        return response
@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from . import hashers
+
 
 class User(AbstractUser):
     """커스텀 사용자 모델"""
@@ -15,6 +17,19 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
 
+    def set_password(self, raw_password):
+        self.password = hashers.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """비밀번호 확인 (해시 비용 설정이 바뀌었으면 새 설정으로 다시 해시해서 저장)"""
+        is_correct, must_update = hashers.verify_password(raw_password, self.password)
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=['password'])
+        return is_correct
+
 
 class Profile(models.Model):
     """사용자 프로필 확장 정보"""
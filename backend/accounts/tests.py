@@ -0,0 +1,137 @@
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.test import Client, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.authentication import user_cache
+from core.testing import (
+    PASSWORD, COVERED_URLS, TEST_SETTINGS, EndpointPerformanceTestCase, covers, create_ledger, url_names,
+)
+from transactions.seeding import create_users
+
+from .hashers import HashingBusy
+from .models import User
+
+
+class AccountEndpointTests(EndpointPerformanceTestCase):
+    """accounts.urls 엔드포인트의 쿼리 수 / 응답 시간"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, _ = create_ledger('accounts-perf@example.com')
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.authenticate(self.user)
+
+    @covers('register')
+    def test_register(self):
+        emails = (f'new-{index}@example.com' for index in range(100))
+
+        def register(email):
+            return APIClient().post('/api/auth/register/', {
+                'email': email, 'username': email.split('@')[0],
+                'password': PASSWORD, 'password_confirm': PASSWORD,
+            }, format='json')
+        self.check('accounts:register POST', register, max_queries=4, status=201, setup=lambda: (next(emails),))
+
+    @covers('login')
+    def test_login(self):
+        self.check('accounts:login POST', lambda: APIClient().post('/api/auth/login/', {
+            'email': self.user.email, 'password': PASSWORD,
+        }, format='json'), max_queries=2)
+
+    @covers('logout')
+    def test_logout(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        # token_blacklist 앱이 설치되어 있지 않아 블랙리스트 등록은 실패로 응답한다
+        self.check('accounts:logout POST', lambda: self.client.post('/api/auth/logout/', {
+            'refresh': refresh,
+        }, format='json'), max_queries=1, status=400)
+
+    @covers('profile')
+    def test_profile(self):
+        self.check('accounts:profile GET', lambda: self.client.get('/api/auth/profile/'), max_queries=2)
+        self.check('accounts:profile PATCH', lambda: self.client.patch('/api/auth/profile/', {
+            'monthly_budget': '1500000.00',
+        }, format='json'), max_queries=2)
+
+    @covers('user-profile')
+    def test_user_profile(self):
+        self.check('accounts:user-profile GET', lambda: self.client.get('/api/auth/user/'), max_queries=2)
+        self.check('accounts:user-profile PATCH', lambda: self.client.patch('/api/auth/user/', {
+            'first_name': '길동',
+        }, format='json'), max_queries=3)
+
+    @covers('change-password')
+    def test_change_password(self):
+        def reset_password():
+            User.objects.filter(pk=self.user.pk).update(password=make_password(PASSWORD))
+            return ()
+
+        self.check('accounts:change-password POST', lambda: self.client.post('/api/auth/change-password/', {
+            'current_password': PASSWORD, 'new_password': 'changed-password-1234',
+        }, format='json'), max_queries=3, setup=reset_password)
+
+    def test_all_urls_covered(self):
+        self.assertEqual(url_names('accounts.urls') - COVERED_URLS, set())
+
+    def test_hashing_busy(self):
+        # 해시 스레드 풀이 가득 차면 DRF 로그인과 관리자 로그인 모두 500 이 아닌 503
+        with mock.patch('accounts.hashers.run_hashing', side_effect=HashingBusy):
+            api = APIClient().post('/api/auth/login/', {
+                'email': self.user.email, 'password': PASSWORD,
+            }, format='json')
+            admin = Client().post('/admin/login/', {'username': self.user.email, 'password': PASSWORD})
+        for response in (api, admin):
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response['Retry-After'], '1')
+
+
+@override_settings(**TEST_SETTINGS, AUTH_USER_CACHE_TIMEOUT=300)
+class AuthUserCacheTests(TestCase):
+    """사용자 정보가 바뀌면 같은 프로세스의 다음 요청부터 인증 캐시 대신 새 값을 쓰는지"""
+
+    def setUp(self):
+        user_cache.clear()
+        self.user, = create_users(['auth-cache@example.com'], make_password(PASSWORD))
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        # 캐시를 채워 둠
+        self.assertEqual(self.client.get('/api/auth/user/').status_code, 200)
+        self.assertIsNotNone(user_cache.get(self.user.pk))
+
+    def change_password(self, current, new):
+        return self.client.post('/api/auth/change-password/', {
+            'current_password': current, 'new_password': new,
+        }, format='json')
+
+    def test_change_password(self):
+        self.assertEqual(self.change_password(PASSWORD, 'changed-password-1234').status_code, 200)
+        # 이전 비밀번호는 더 이상 맞지 않고 새 비밀번호로 다시 바꿀 수 있음
+        self.assertEqual(self.change_password(PASSWORD, 'another-password-1234').status_code, 400)
+        self.assertEqual(self.change_password('changed-password-1234', 'another-password-1234').status_code, 200)
+
+    def test_deactivated_user(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        self.assertEqual(self.client.get('/api/auth/user/').status_code, 401)
+        self.assertEqual(self.client.get('/api/transactions/').status_code, 401)
+
+    def test_profile_update(self):
+        response = self.client.patch('/api/auth/user/', {'username': 'renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/auth/user/').json()['username'], 'renamed')
+
+        # 관리자 화면 등 API 밖에서 저장한 경우도 같음
+        user = User.objects.get(pk=self.user.pk)
+        user.username = 'admin-renamed'
+        user.save()
+        self.assertEqual(self.client.get('/api/auth/user/').json()['username'], 'admin-renamed')
+
+        response = self.client.patch('/api/auth/profile/', {'monthly_budget': '2500000.00'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/auth/user/').json()['profile']['monthly_budget'], '2500000.00')
@@ -3,7 +3,6 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
-from django.contrib.auth.hashers import check_password
 from .models import User, Profile
 from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserSerializer, ProfileSerializer
 
@@ -70,6 +69,9 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
+        # 인증 캐시의 사용자 값은 잠시 지난 값일 수 있으므로 수정할 때는 새로 조회
+        if self.request.method not in permissions.SAFE_METHODS:
+            return User.objects.get(pk=self.request.user.pk)
         return self.request.user
 
 
@@ -86,7 +88,7 @@ def change_password(request):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     # 현재 비밀번호 확인
-    if not check_password(current_password, user.password):
+    if not user.check_password(current_password):
         return Response({
             'current_password': '현재 비밀번호가 올바르지 않습니다.'
         }, status=status.HTTP_400_BAD_REQUEST)
@@ -97,15 +99,15 @@ def change_password(request):
             'new_password': '새 비밀번호는 최소 8자 이상이어야 합니다.'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    # 현재 비밀번호와 새 비밀번호가 같은지 확인
-    if check_password(new_password, user.password):
+    # 현재 비밀번호와 새 비밀번호가 같은지 확인 (현재 비밀번호는 확인했으므로 해시 없이 비교)
+    if new_password == current_password:
         return Response({
             'new_password': '새 비밀번호는 현재 비밀번호와 달라야 합니다.'
         }, status=status.HTTP_400_BAD_REQUEST)
     
     # 비밀번호 변경
     user.set_password(new_password)
-    user.save()
+    user.save(update_fields=['password', 'updated_at'])
     
     return Response({
         'message': '비밀번호가 성공적으로 변경되었습니다.'
@@ -1,9 +1,10 @@
 from django.contrib import admin
-from .models import Budget
+from core.db_router import ReplicaChangeListMixin
+from .models import Budget, BudgetSnapshot
 
 
 @admin.register(Budget)
-class BudgetAdmin(admin.ModelAdmin):
+class BudgetAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     """예산 관리자"""
     list_display = ('name', 'amount', 'period', 'category', 'user', 'usage_percentage', 'is_active', 'start_date', 'end_date')
     list_filter = ('period', 'is_active', 'start_date', 'created_at')
@@ -27,7 +28,26 @@ class BudgetAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        # 목록의 모든 예산 사용 금액을 한 번의 쿼리로 조회
+        return super().get_queryset(request).select_related('category', 'user').with_snapshot()
+
     def usage_percentage(self, obj):
         """예산 사용률"""
         return f"{obj.usage_percentage:.1f}%"
-    usage_percentage.short_description = '사용률' 
\ No newline at end of file
+    usage_percentage.short_description = '사용률' 
+
+
+@admin.register(BudgetSnapshot)
+class BudgetSnapshotAdmin(admin.ModelAdmin):
+    """예산 스냅샷 관리자 (조회 전용, refresh_budget_snapshots 로 갱신)"""
+    list_display = ('budget', 'spent', 'remaining', 'usage', 'level', 'level_changed_at', 'refreshed_at')
+    list_filter = ('level',)
+    list_select_related = ('budget',)
+    ordering = ('-usage',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class BudgetsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'budgets' 
\ No newline at end of file
+    name = 'budgets'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,16 @@
+from core.aio import async_api_view, json_response, run_in_pool
+from core.conditional import async_conditional_per_user
+from core.db_router import async_use_read_replica
+from transactions.models import Category, Transaction
+
+from .models import Budget
+from .summary import budget_summary
+
+
+# 동기 뷰(/api/budgets/summary/)와 같은 이름을 써서 ETag 를 공유함
+@async_api_view
+@async_use_read_replica
+@async_conditional_per_user('budget-summary', Budget, Transaction, Category)
+async def async_budget_summary(request):
+    """활성 예산 사용 현황 요약"""
+    return json_response(await run_in_pool(budget_summary, request.user.pk))
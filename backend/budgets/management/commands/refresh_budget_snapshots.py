@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from budgets import snapshots
+from budgets.models import Budget, BudgetSnapshot
+
+
+class Command(BaseCommand):
+    help = (
+        '활성 예산의 사용 현황 스냅샷을 원본 거래로부터 나눠서 다시 계산하고 '
+        '이번 실행에서 알림 단계가 바뀐 예산을 보고합니다. (주기적으로 실행)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='users', default=[],
+                            help='대상 사용자 이메일 (여러 번 지정 가능, 기본값: 전체)')
+        parser.add_argument('--all', action='store_true', help='비활성 예산도 포함')
+        parser.add_argument('--chunk-size', type=int, default=500, help='한 번에 처리할 예산 수')
+
+    def handle(self, *args, **options):
+        budgets = Budget.objects.order_by('pk')
+        if not options['all']:
+            budgets = budgets.filter(is_active=True)
+        if options['users']:
+            budgets = budgets.filter(user__email__in=options['users'])
+
+        started_at = timezone.now()
+        started = time.perf_counter()
+        refreshed = 0
+        last_pk = 0
+        while True:
+            chunk = list(budgets.filter(pk__gt=last_pk).values_list('pk', flat=True)[:options['chunk_size']])
+            if not chunk:
+                break
+            with transaction.atomic():
+                refreshed += snapshots.refresh(Budget.objects.filter(pk__in=chunk))
+            last_pk = chunk[-1]
+
+        crossed = BudgetSnapshot.objects.crossed_since(started_at).select_related('budget')
+        for snapshot in crossed:
+            self.stdout.write(
+                f'  {snapshot.budget.name} (사용자 {snapshot.budget.user_id}): '
+                f'사용률 {snapshot.usage}% → {snapshot.level}% 단계'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'예산 {refreshed}개의 스냅샷을 {time.perf_counter() - started:.1f}초 만에 갱신했습니다. '
+            f'(알림 단계 변경 {len(crossed)}개)'
+        ))
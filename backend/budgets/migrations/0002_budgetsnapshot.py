@@ -0,0 +1,74 @@
+# Generated by Django 4.2 on 2026-10-17 04:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("budgets", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BudgetSnapshot",
+            fields=[
+                (
+                    "budget",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="snapshot",
+                        serialize=False,
+                        to="budgets.budget",
+                    ),
+                ),
+                (
+                    "spent",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=15, verbose_name="사용 금액"
+                    ),
+                ),
+                (
+                    "remaining",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=15, verbose_name="남은 금액"
+                    ),
+                ),
+                (
+                    "usage",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=9, verbose_name="사용률(%)"
+                    ),
+                ),
+                (
+                    "level",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="알림 단계"
+                    ),
+                ),
+                (
+                    "level_changed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="알림 단계 변경 시각"
+                    ),
+                ),
+                ("refreshed_at", models.DateTimeField(verbose_name="갱신 시각")),
+            ],
+            options={
+                "verbose_name": "예산 스냅샷",
+                "verbose_name_plural": "예산 스냅샷",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="budgetsnapshot",
+            index=models.Index(fields=["usage"], name="budget_snapshot_usage_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="budgetsnapshot",
+            index=models.Index(
+                fields=["level_changed_at"], name="budget_snapshot_level_idx"
+            ),
+        ),
+    ]
@@ -1,6 +1,51 @@
+from decimal import Decimal
 from django.db import models
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
-from transactions.models import Category
+from transactions.models import Category, Transaction
+
+
+SPENT_FIELD = DecimalField(max_digits=15, decimal_places=2)
+
+
+class BudgetQuerySet(models.QuerySet):
+    def _live_spent(self):
+        """원본 거래로부터 계산한 예산별 사용 금액 식 (없으면 NULL)"""
+        expenses = Transaction.objects.filter(
+            user=OuterRef('user'),
+            type='expense',
+            date__gte=OuterRef('start_date'),
+            date__lte=OuterRef('end_date'),
+        )
+        # 전체 예산은 기간 내 모든 지출, 카테고리 예산은 해당 카테고리 지출만 합산
+        overall = expenses.order_by().values('user').annotate(total=Sum('amount')).values('total')
+        scoped = expenses.filter(category=OuterRef('category')).order_by().values('category').annotate(
+            total=Sum('amount')
+        ).values('total')
+
+        return models.Case(
+            models.When(category__isnull=True, then=Subquery(overall, output_field=SPENT_FIELD)),
+            default=Subquery(scoped, output_field=SPENT_FIELD),
+        )
+
+    def with_spent(self):
+        """예산별 사용 금액을 원본 거래에서 한 번의 쿼리로 함께 조회 (spent_total 어노테이션)"""
+        return self.annotate(
+            spent_total=Coalesce(self._live_spent(), Value(Decimal('0')), output_field=SPENT_FIELD)
+        )
+
+    def with_snapshot(self):
+        """사용 금액을 BudgetSnapshot 에서 읽고, 스냅샷이 없는 예산만 원본 거래로 계산
+
+        COALESCE 는 앞의 값이 NULL 일 때만 뒤의 서브쿼리를 실행하므로
+        스냅샷이 있는 예산은 거래 테이블을 읽지 않는다.
+        """
+        return self.select_related('snapshot').annotate(
+            spent_total=Coalesce(
+                F('snapshot__spent'), self._live_spent(), Value(Decimal('0')), output_field=SPENT_FIELD,
+            )
+        )
 
 
 class Budget(models.Model):
@@ -21,6 +66,8 @@ class Budget(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BudgetQuerySet.as_manager()
+
     class Meta:
         verbose_name = "예산"
         verbose_name_plural = "예산"
@@ -29,20 +76,27 @@ class Budget(models.Model):
     def __str__(self):
         return f"{self.name} - {self.amount}원"
 
+    def save(self, *args, **kwargs):
+        # 기간/카테고리가 바뀌었을 수 있으므로 미리 조회한 사용 금액은 버림
+        self.__dict__.pop('spent_total', None)
+        super().save(*args, **kwargs)
+
     @property
     def spent_amount(self):
         """해당 예산 기간 동안 사용된 금액"""
-        from transactions.models import Transaction
-        
+        spent_total = getattr(self, 'spent_total', None)
+        if spent_total is not None:
+            return spent_total
+
         transactions = Transaction.objects.filter(
-            user=self.user,
+            user_id=self.user_id,
             type='expense',
             date__gte=self.start_date,
             date__lte=self.end_date
         )
         
-        if self.category:
-            transactions = transactions.filter(category=self.category)
+        if self.category_id:
+            transactions = transactions.filter(category_id=self.category_id)
         
         return transactions.aggregate(total=models.Sum('amount'))['total'] or 0
 
@@ -56,4 +110,39 @@ class Budget(models.Model):
         """예산 사용률 (백분율)"""
         if self.amount == 0:
             return 0
-        return (self.spent_amount / self.amount) * 100 
\ No newline at end of file
+        return (self.spent_amount / self.amount) * 100 
+
+
+class BudgetSnapshotQuerySet(models.QuerySet):
+    def over(self, usage):
+        """사용률이 usage(%) 이상인 스냅샷 (usage 인덱스 사용)"""
+        return self.filter(usage__gte=usage)
+
+    def crossed_since(self, since):
+        """since 이후 알림 단계(level)가 올라간 스냅샷 (level_changed_at 인덱스 사용)"""
+        return self.filter(level_changed_at__gt=since, level__gt=0)
+
+
+class BudgetSnapshot(models.Model):
+    """예산별 사용 현황 스냅샷 (budgets.snapshots 에서 거래/예산 변경 시 갱신)"""
+    budget = models.OneToOneField(Budget, on_delete=models.CASCADE, primary_key=True, related_name='snapshot')
+    spent = models.DecimalField(max_digits=15, decimal_places=2, verbose_name="사용 금액")
+    remaining = models.DecimalField(max_digits=15, decimal_places=2, verbose_name="남은 금액")
+    usage = models.DecimalField(max_digits=9, decimal_places=2, verbose_name="사용률(%)")
+    # settings.BUDGET_ALERT_THRESHOLDS 중 도달한 가장 높은 값 (도달한 것이 없으면 0)
+    level = models.PositiveSmallIntegerField(default=0, verbose_name="알림 단계")
+    level_changed_at = models.DateTimeField(null=True, blank=True, verbose_name="알림 단계 변경 시각")
+    refreshed_at = models.DateTimeField(verbose_name="갱신 시각")
+
+    objects = BudgetSnapshotQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "예산 스냅샷"
+        verbose_name_plural = "예산 스냅샷"
+        indexes = [
+            models.Index(fields=['usage'], name='budget_snapshot_usage_idx'),
+            models.Index(fields=['level_changed_at'], name='budget_snapshot_level_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.budget_id}: {self.usage}%"
@@ -0,0 +1,55 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_data_version
+from transactions import rollups
+from transactions.models import Transaction
+from transactions.signals import transactions_bulk_created, transactions_bulk_updated
+
+from . import snapshots
+from .models import Budget
+
+
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=Budget)
+def invalidate_cached_responses(sender, instance, **kwargs):
+    """예산이 바뀌면 해당 사용자의 캐시된 응답을 무효화"""
+    bump_data_version(instance.user_id)
+
+
+@receiver(post_save, sender=Budget)
+def refresh_snapshot_on_save(sender, instance, raw, **kwargs):
+    """예산 금액/기간/카테고리가 바뀌었을 수 있으므로 스냅샷을 다시 계산"""
+    if raw:
+        return
+    snapshots.refresh(Budget.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Transaction)
+def refresh_snapshots_on_transaction_save(sender, instance, raw, **kwargs):
+    """거래 생성/수정 시 수정 전/후 날짜와 카테고리를 포함하는 예산의 스냅샷 갱신"""
+    if raw:
+        return
+    rows = [rollups.row_for(instance)]
+    # transactions.signals.remember_rollup_row 가 pre_save 에서 기억한 수정 전 값
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous:
+        rows.append(previous)
+    snapshots.record(rows)
+
+
+@receiver(post_delete, sender=Transaction)
+def refresh_snapshots_on_transaction_delete(sender, instance, **kwargs):
+    snapshots.record([rollups.row_for(instance)])
+
+
+@receiver(transactions_bulk_created, sender=Transaction)
+def refresh_snapshots_on_bulk_create(sender, created, **kwargs):
+    snapshots.record([rollups.row_for(instance) for instance in created])
+
+
+@receiver(transactions_bulk_updated, sender=Transaction)
+def refresh_snapshots_on_bulk_update(sender, updated, **kwargs):
+    snapshots.record(
+        [previous for previous, _ in updated] + [rollups.row_for(instance) for _, instance in updated]
+    )
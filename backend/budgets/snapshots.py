@@ -0,0 +1,108 @@
+"""예산 사용 현황 스냅샷(BudgetSnapshot) 갱신
+
+예산을 저장하면 그 예산의 스냅샷을 만들거나 갱신하고, 지출 거래가 바뀌면
+그 거래의 날짜/카테고리를 포함하는 예산의 스냅샷만 다시 계산한다. (호출하는 쪽의
+트랜잭션 안에서 실행되므로 스냅샷과 거래가 어긋나지 않음)
+refresh_budget_snapshots 명령은 활성 예산 전체를 나눠서 다시 계산한다.
+"""
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Budget, BudgetSnapshot
+
+UPDATE_FIELDS = ('spent', 'remaining', 'usage', 'level', 'level_changed_at', 'refreshed_at')
+
+MAX_USAGE = Decimal('9999999.99')
+
+_deferred = threading.local()
+
+
+def alert_level(usage):
+    """usage(%) 가 도달한 가장 높은 BUDGET_ALERT_THRESHOLDS 값 (없으면 0)"""
+    return max((threshold for threshold in settings.BUDGET_ALERT_THRESHOLDS if usage >= threshold), default=0)
+
+
+def refresh(budgets, create=True):
+    """budgets(queryset)의 스냅샷을 한 번의 조회와 한 번의 upsert 로 다시 계산
+
+    create=False 이면 이미 스냅샷이 있는 예산만 갱신한다. (거래 변경 시그널은
+    CASCADE 삭제 도중에도 발생하므로 지워지는 예산의 스냅샷을 새로 만들지 않도록)
+    """
+    if not create:
+        budgets = budgets.filter(snapshot__isnull=False)
+    rows = budgets.with_spent().annotate(previous_level=F('snapshot__level')).values_list(
+        'pk', 'amount', 'spent_total', 'previous_level', 'snapshot__level_changed_at',
+    )
+
+    now = timezone.now()
+    snapshots = []
+    for budget_id, amount, spent, previous_level, level_changed_at in rows:
+        usage = min(spent / amount * 100, MAX_USAGE) if amount else Decimal('0')
+        usage = usage.quantize(Decimal('0.01'))
+        level = alert_level(usage)
+        if level != (previous_level or 0):
+            level_changed_at = now
+        snapshots.append(BudgetSnapshot(
+            budget_id=budget_id, spent=spent, remaining=amount - spent, usage=usage,
+            level=level, level_changed_at=level_changed_at, refreshed_at=now,
+        ))
+
+    if snapshots:
+        BudgetSnapshot.objects.bulk_create(
+            snapshots, batch_size=500,
+            update_conflicts=True, unique_fields=['budget'], update_fields=UPDATE_FIELDS,
+        )
+    return len(snapshots)
+
+
+def affected_budgets(rows):
+    """거래 값(rollups.ROW_FIELDS) 목록이 사용 금액에 영향을 주는 예산 queryset (없으면 None)"""
+    by_user = {}
+    for user_id, category_id, type_, day, _ in rows:
+        if type_ != 'expense':
+            continue
+        first, last, categories = by_user.get(user_id, (day, day, set()))
+        categories.add(category_id)
+        by_user[user_id] = (min(first, day), max(last, day), categories)
+    if not by_user:
+        return None
+
+    condition = Q()
+    for user_id, (first, last, categories) in by_user.items():
+        condition |= Q(user_id=user_id, start_date__lte=last, end_date__gte=first) & (
+            Q(category__isnull=True) | Q(category_id__in=categories)
+        )
+    return Budget.objects.filter(condition)
+
+
+@contextmanager
+def deferred():
+    """블록 안에서 바뀐 거래들을 모아 두었다가 끝날 때 관련 예산을 한 번에 갱신 (rollups.deferred 와 같음)"""
+    if getattr(_deferred, 'rows', None) is not None:
+        yield
+        return
+
+    _deferred.rows = []
+    try:
+        yield
+        rows = _deferred.rows
+    finally:
+        _deferred.rows = None
+    record(rows)
+
+
+def record(rows):
+    """바뀐 거래의 값(수정 전/후 모두) 목록으로 관련 예산의 스냅샷을 갱신"""
+    pending = getattr(_deferred, 'rows', None)
+    if pending is not None:
+        pending.extend(rows)
+        return
+
+    budgets = affected_budgets(rows)
+    if budgets is not None:
+        refresh(budgets, create=False)
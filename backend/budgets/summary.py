@@ -0,0 +1,20 @@
+"""활성 예산 사용 현황 요약 (동기/비동기 뷰 공용)"""
+from decimal import Decimal
+
+from .models import Budget
+from .serializers import BudgetSerializer
+
+
+def budget_summary(user_id):
+    """활성 예산 목록과 전체 예산/사용 금액, 초과 예산 수 (쿼리 한 번)"""
+    budgets = list(
+        Budget.objects.filter(user_id=user_id, is_active=True).select_related('category').with_snapshot()
+    )
+    total_amount = sum((budget.amount for budget in budgets), Decimal('0'))
+    total_spent = sum((budget.spent_amount for budget in budgets), Decimal('0'))
+    return {
+        'total_amount': f'{total_amount:.2f}',
+        'total_spent': f'{total_spent:.2f}',
+        'over_budget_count': sum(1 for budget in budgets if budget.spent_amount > budget.amount),
+        'budgets': BudgetSerializer(budgets, many=True).data,
+    }
@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.testing import (
+    COVERED_URLS, TEST_SETTINGS, AsyncEndpointPerformanceTestCase, EndpointPerformanceTestCase, covers,
+    create_ledger, url_names,
+)
+from transactions.models import Transaction
+
+from .models import Budget, BudgetSnapshot
+
+
+class BudgetEndpointTests(EndpointPerformanceTestCase):
+    """budgets.urls 엔드포인트의 쿼리 수 / 응답 시간"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.categories = create_ledger('budgets-perf@example.com')
+        cls.budget = Budget.objects.filter(user=cls.user, category__isnull=False).first()
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.authenticate(self.user)
+
+    def new_budget(self):
+        today = date.today()
+        return (Budget.objects.create(
+            user=self.user, name='삭제할 예산', amount=10000, start_date=today, end_date=today,
+        ),)
+
+    @covers('budget-list-create')
+    def test_budget_list_create(self):
+        # 예산 수와 관계없이 사용 금액을 한 번에 조회
+        self.check('budgets:budget-list-create GET', lambda: self.client.get('/api/budgets/'), max_queries=4)
+        self.check('budgets:budget-list-create POST', lambda: self.client.post('/api/budgets/', {
+            'name': '교통비 예산', 'amount': '100000.00', 'category': self.categories['expense'][1].id,
+            'start_date': date.today().replace(day=1).isoformat(), 'end_date': date.today().isoformat(),
+        }, format='json'), max_queries=13, status=201)
+
+    @covers('budget-summary')
+    def test_budget_summary(self):
+        self.check('budgets:budget-summary GET', lambda: self.client.get('/api/budgets/summary/'), max_queries=3)
+
+    @covers('budget-detail')
+    def test_budget_detail(self):
+        url = f'/api/budgets/{self.budget.id}/'
+        self.check('budgets:budget-detail GET', lambda: self.client.get(url), max_queries=2)
+        self.check('budgets:budget-detail PATCH', lambda: self.client.patch(url, {
+            'amount': '250000.00',
+        }, format='json'), max_queries=12)
+        self.check(
+            'budgets:budget-detail DELETE', lambda budget: self.client.delete(f'/api/budgets/{budget.id}/'),
+            max_queries=8, status=204, setup=self.new_budget,
+        )
+
+    def test_all_urls_covered(self):
+        self.assertEqual(url_names('budgets.urls') - COVERED_URLS, set())
+
+
+class AsyncBudgetEndpointTests(AsyncEndpointPerformanceTestCase):
+    """비동기 예산 요약 (스레드 풀에서 실행된 쿼리까지 셈)"""
+
+    def setUp(self):
+        super().setUp()
+        self.user, _ = create_ledger('budgets-async-perf@example.com')
+        self.client = self.authenticate(self.user)
+
+    @covers('async-budget-summary')
+    def test_async_budget_summary(self):
+        self.check('budgets:async-budget-summary GET', lambda: self.client.get('/api/async/budgets/summary/'), max_queries=2)
+
+
+@override_settings(**TEST_SETTINGS, BUDGET_ALERT_THRESHOLDS=[80, 90, 100])
+class BudgetSnapshotTests(TestCase):
+    """거래/예산 변경 시 BudgetSnapshot 이 원본 거래로 계산한 값과 같게 유지되는지"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.categories = create_ledger('budgets-snapshot@example.com', transactions=100)
+        cls.food = cls.categories['expense'][0]
+
+    def assertSnapshotsMatch(self):
+        for budget in Budget.objects.filter(user=self.user).with_spent().select_related('snapshot'):
+            self.assertEqual(budget.snapshot.spent, budget.spent_total, budget.name)
+            self.assertEqual(budget.snapshot.remaining, budget.amount - budget.spent_total, budget.name)
+
+    def test_incremental_refresh(self):
+        self.assertSnapshotsMatch()
+        transaction = Transaction.objects.create(
+            user=self.user, category=self.food, title='점심', amount=Decimal('12000'),
+            type='expense', date=date.today(),
+        )
+        self.assertSnapshotsMatch()
+
+        # 다른 카테고리, 예산 기간 밖으로 이동
+        transaction.category = self.categories['expense'][5]
+        transaction.date = date.today() - timedelta(days=70)
+        transaction.save()
+        self.assertSnapshotsMatch()
+
+        transaction.delete()
+        self.assertSnapshotsMatch()
+
+    def test_threshold_crossing(self):
+        budget = Budget.objects.get(user=self.user, category=self.food)
+        started = timezone.now()
+        Transaction.objects.create(
+            user=self.user, category=self.food, title='회식', amount=budget.amount,
+            type='expense', date=date.today(),
+        )
+        crossed = BudgetSnapshot.objects.crossed_since(started)
+        self.assertIn(budget.pk, {snapshot.pk for snapshot in crossed})
+        self.assertEqual(BudgetSnapshot.objects.get(pk=budget.pk).level, 100)
+        self.assertIn(budget.pk, set(BudgetSnapshot.objects.over(90).values_list('pk', flat=True)))
@@ -1,7 +1,11 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path('budgets/', views.BudgetListCreateView.as_view(), name='budget-list-create'),
+    path('budgets/summary/', views.budget_summary_view, name='budget-summary'),
     path('budgets/<int:pk>/', views.BudgetDetailView.as_view(), name='budget-detail'),
+
+    # ASGI 비동기 버전
+    path('async/budgets/summary/', async_views.async_budget_summary, name='async-budget-summary'),
 ] 
\ No newline at end of file
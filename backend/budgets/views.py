@@ -1,6 +1,13 @@
 from rest_framework import generics, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from core.cache import cache_per_user
+from core.conditional import conditional_per_user
+from core.db_router import use_read_replica
+from transactions.models import Category, Transaction
 from .models import Budget
 from .serializers import BudgetSerializer
+from .summary import budget_summary
 
 
 class BudgetListCreateView(generics.ListCreateAPIView):
@@ -8,8 +15,16 @@ class BudgetListCreateView(generics.ListCreateAPIView):
     serializer_class = BudgetSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @use_read_replica
+    @conditional_per_user('budgets', Budget, Transaction, Category)
+    @cache_per_user('budgets')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_queryset(self):
-        queryset = Budget.objects.filter(user=self.request.user)
+        queryset = Budget.objects.filter(
+            user=self.request.user
+        ).select_related('category').with_snapshot()
         is_active = self.request.query_params.get('is_active', None)
         if is_active is not None:
             is_active = is_active.lower() == 'true'
@@ -23,4 +38,15 @@ class BudgetDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Budget.objects.filter(user=self.request.user) 
\ No newline at end of file
+        return Budget.objects.filter(
+            user=self.request.user
+        ).select_related('category').with_snapshot()
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@use_read_replica
+@conditional_per_user('budget-summary', Budget, Transaction, Category)
+def budget_summary_view(request):
+    """활성 예산 사용 현황 요약"""
+    return Response(budget_summary(request.user.pk))
@@ -1,6 +1,8 @@
 import os
+import tempfile
 from pathlib import Path
-from decouple import config
+from corsheaders.defaults import default_headers
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -42,23 +44,29 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    'core',
     'accounts',
     'transactions',
     'budgets',
+    'sync',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'core.profiling.RequestProfilingMiddleware',
+    'core.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.middleware.HashingBusyMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.db_router.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -81,6 +89,31 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Database connection management (DB_CONNECTION_MODE)
+# request: 요청마다 새로 연결 (Django 기본 동작)
+# persistent: 연결을 DB_CONN_MAX_AGE 초 동안 재사용하고, 재사용 전에 연결 상태를 확인
+# pgbouncer: persistent 와 같고 PGHOST/PGPORT 를 트랜잭션 풀링 모드의 pgbouncer 로 지정할 때 사용
+#   (트랜잭션마다 서버 연결이 바뀌므로 서버 측 커서를 쓰지 않음, 내보내기는 결과를 한 번에 받음)
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=600, cast=int)
+DB_CONNECTION_PROFILES = {
+    'request': {
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': False,
+        'DISABLE_SERVER_SIDE_CURSORS': False,
+    },
+    'persistent': {
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': False,
+    },
+    'pgbouncer': {
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': True,
+    },
+}
+DB_CONNECTION_MODE = config('DB_CONNECTION_MODE', default='persistent')
+
 # Database
 # Railway에서는 PostgreSQL 사용, 로컬에서는 SQLite 사용
 if RAILWAY_ENVIRONMENT:
@@ -92,6 +125,7 @@ if RAILWAY_ENVIRONMENT:
             'PASSWORD': config('PGPASSWORD'),
             'HOST': config('PGHOST'),
             'PORT': config('PGPORT', default=5432),
+            **DB_CONNECTION_PROFILES[DB_CONNECTION_MODE],
         }
     }
 else:
@@ -99,9 +133,126 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            **DB_CONNECTION_PROFILES[DB_CONNECTION_MODE],
         }
     }
 
+# Read replicas (쉼표로 구분, PostgreSQL 은 host[:port], SQLite 는 파일 경로)
+# 통계/목록/내보내기/관리자 목록 같은 읽기 전용 화면만 복제본에서 읽는다 (core.db_router)
+DB_REPLICAS = config('DB_REPLICAS', default='', cast=Csv())
+REPLICA_DATABASES = []
+for index, replica in enumerate(DB_REPLICAS, start=1):
+    alias = f'replica{index}'
+    if RAILWAY_ENVIRONMENT:
+        host, _, port = replica.partition(':')
+        location = {'HOST': host, 'PORT': port or DATABASES['default']['PORT']}
+    else:
+        location = {'NAME': replica}
+    # 테스트에서는 복제본 대신 default 를 사용
+    DATABASES[alias] = {**DATABASES['default'], **location, 'TEST': {'MIRROR': 'default'}}
+    REPLICA_DATABASES.append(alias)
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter'] if REPLICA_DATABASES else []
+# 쓰기 후 이 시간(초) 동안은 해당 사용자의 읽기도 주 DB 에서 (복제 지연 대비)
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
+# Cache
+# 기본값은 파일 캐시 (같은 서버의 gunicorn 워커들이 공유), 단일 프로세스라면 locmem 도 가능
+CACHE_BACKEND = config('CACHE_BACKEND', default='file')
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': config(
+            'CACHE_LOCATION',
+            default=os.path.join(tempfile.gettempdir(), 'budget-tracker-cache'),
+        ),
+    }
+}
+
+# 사용자별 응답 캐시 유지 시간(초), 0 이면 사용하지 않음
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+
+# 비동기 뷰에서 독립적인 쿼리를 동시에 실행할 스레드 수 (프로세스당 DB 연결 수 상한)
+ASYNC_DB_WORKERS = config('ASYNC_DB_WORKERS', default=8, cast=int)
+
+# 동기화 삭제 기록 보관 기간(일), 이보다 오래 동기화하지 않은 클라이언트는 전체 재동기화
+SYNC_TOMBSTONE_RETENTION_DAYS = config('SYNC_TOMBSTONE_RETENTION_DAYS', default=30, cast=int)
+
+# 예산 사용률 알림 단계(%), BudgetSnapshot.level 은 도달한 가장 높은 값
+BUDGET_ALERT_THRESHOLDS = config('BUDGET_ALERT_THRESHOLDS', default='80,90,100', cast=Csv(int))
+
+# PostgreSQL 에서 거래 테이블을 date 연도별 파티션 테이블로 사용 (transactions.partitioning)
+# 켜고 migrate 하면 기존 테이블을 변환함, 다른 DB 에서는 무시
+TRANSACTION_PARTITIONING = config('TRANSACTION_PARTITIONING', default=False, cast=bool)
+# partition_transactions 명령이 미리 만들어 둘 파티션 (올해 + N년)
+TRANSACTION_PARTITION_YEARS_AHEAD = config('TRANSACTION_PARTITION_YEARS_AHEAD', default=2, cast=int)
+
+# Request profiling (core.profiling)
+# 응답마다 요청 로그(DB/직렬화/렌더링 시간)와 Server-Timing 헤더를 남김
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=True, cast=bool)
+# Server-Timing 헤더는 내부 처리 정보(쿼리 수 등)를 드러내므로 기본적으로 DEBUG 에서만 붙임
+PROFILING_SERVER_TIMING = config('PROFILING_SERVER_TIMING', default=DEBUG, cast=bool)
+# 이 비율의 요청을 cProfile 로 실행하고 PROFILING_SLOW_REQUEST_MS 이상 걸린 것만 PROFILING_DIR 에 저장
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_SLOW_REQUEST_MS = config('PROFILING_SLOW_REQUEST_MS', default=500, cast=float)
+PROFILING_DIR = config('PROFILING_DIR', default=os.path.join(tempfile.gettempdir(), 'budget-tracker-profiles'))
+PROFILING_MAX_FILES = config('PROFILING_MAX_FILES', default=200, cast=int)
+# 이보다 오래 걸린 쿼리는 실행 계획(EXPLAIN)을 로그로 남김, 0 이면 사용하지 않음
+PROFILING_SLOW_QUERY_MS = config('PROFILING_SLOW_QUERY_MS', default=200, cast=float)
+
+# Metrics (core.metrics, /metrics 에서 Prometheus 텍스트 형식으로 노출)
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+# 워커별 값 파일을 두는 디렉터리 (core.apps 가 prometheus_client 를 불러오기 전에 환경 변수로 지정)
+# 비워 두면 gunicorn 은 임시 디렉터리의 budget-tracker-metrics 를 워커들이 함께 쓰고,
+# 그 밖의 서버(runserver 등)와 관리 명령은 프로세스 전용 임시 디렉터리를 쓰고 종료할 때 지움
+METRICS_DIR = config('PROMETHEUS_MULTIPROC_DIR', default='')
+# /metrics 요청에 필요한 Authorization: Bearer <METRICS_TOKEN>, 비워 두면 DEBUG 에서만 응답
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Logging
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.profiling': {
+            'handlers': ['console'],
+            'level': config('PROFILING_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+# Password hashing
+# 새 해시에 쓸 알고리즘 (argon2, pbkdf2, scrypt), 나머지는 기존 해시 확인용
+# 비용 값은 benchmark_hashers 명령으로 서버에서 측정해서 정한다
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='argon2')
+PASSWORD_HASHER_CLASSES = {
+    'argon2': 'accounts.hashers.TunedArgon2PasswordHasher',
+    'pbkdf2': 'accounts.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+]
+# Argon2id 비용 (메모리는 KiB, 기본값은 OWASP 권장 최소값 19MiB/2회)
+PASSWORD_ARGON2_TIME_COST = config('PASSWORD_ARGON2_TIME_COST', default=2, cast=int)
+PASSWORD_ARGON2_MEMORY_COST = config('PASSWORD_ARGON2_MEMORY_COST', default=19456, cast=int)
+PASSWORD_ARGON2_PARALLELISM = config('PASSWORD_ARGON2_PARALLELISM', default=1, cast=int)
+PASSWORD_PBKDF2_ITERATIONS = config('PASSWORD_PBKDF2_ITERATIONS', default=600000, cast=int)
+
+# 프로세스당 동시에 비밀번호 해시를 계산할 스레드 수와 대기 가능한 요청 수 (0 이면 요청 스레드에서 계산)
+PASSWORD_HASH_WORKERS = config('PASSWORD_HASH_WORKERS', default=2, cast=int)
+PASSWORD_HASH_QUEUE = config('PASSWORD_HASH_QUEUE', default=8, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -138,7 +289,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -160,6 +311,9 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
 }
 
+# JWT 인증 시 사용자 정보를 프로세스 메모리에 보관하는 시간(초), 0 이면 매 요청 조회
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=30, cast=int)
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # React 개발 서버
@@ -173,5 +327,9 @@ if FRONTEND_URL not in CORS_ALLOWED_ORIGINS:
 
 CORS_ALLOW_CREDENTIALS = True
 
+# 조건부 GET (ETag / If-None-Match) 을 교차 출처 요청에서도 사용
+CORS_ALLOW_HEADERS = (*default_headers, 'if-none-match')
+CORS_EXPOSE_HEADERS = ['ETag', 'Last-Modified', 'Server-Timing']
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User' 
\ No newline at end of file
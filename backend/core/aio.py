@@ -0,0 +1,99 @@
+"""비동기(ASGI) 뷰 공용 도구
+
+DRF 3.14 는 비동기 뷰를 지원하지 않으므로 Django 비동기 뷰에서 JWT 인증과
+JSON 응답을 직접 처리한다. Django 4.2 의 비동기 ORM 호출은 모두 같은 스레드에서
+차례로 실행되므로, 서로 독립적인 쿼리는 크기가 제한된 스레드 풀에서 동시에 실행한다.
+
+풀에서 실행하는 함수는 요청의 contextvar(요청 측정값, 복제본 라우팅 상태)를 복사한
+컨텍스트에서 실행되고, 그 스레드의 DB 연결도 요청 측정값으로 감싼다.
+(DB 연결 자체는 asgiref Local 이 스레드별로 나누므로 복사되지 않음)
+프로젝트 미들웨어는 모두 비동기를 지원하지만 whitenoise 6.4 는 동기 전용이라
+Django 가 그 아래 단계를 한 번 sync_to_async/async_to_sync 로 감싼다.
+"""
+import asyncio
+import contextvars
+import functools
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework.exceptions import NotAuthenticated
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .authentication import CachedJWTAuthentication
+from .profiling import current_metrics, measure
+
+_executor = None
+_jwt_authentication = CachedJWTAuthentication()
+
+
+def get_executor():
+    """DB 작업용 스레드 풀 (ASYNC_DB_WORKERS 개, 프로세스당 하나)"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ASYNC_DB_WORKERS, thread_name_prefix='async-db'
+        )
+    return _executor
+
+
+def _run_and_release(function, args):
+    metrics = current_metrics()
+    try:
+        if metrics is None:
+            return function(*args)
+        with measure(metrics):
+            return function(*args)
+    finally:
+        # 풀 스레드의 DB 연결은 요청 주기 밖에 있으므로 직접 정리 (CONN_MAX_AGE 를 따름)
+        close_old_connections()
+
+
+async def run_in_pool(function, *args):
+    """동기 함수를 DB 스레드 풀에서 실행"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), context.run, _run_and_release, function, args)
+
+
+async def gather_in_pool(*calls):
+    """(함수, 인자, ...) 들을 DB 스레드 풀에서 동시에 실행하고 결과를 순서대로 반환"""
+    return await asyncio.gather(*(run_in_pool(call[0], *call[1:]) for call in calls))
+
+
+def _authenticate(request):
+    try:
+        result = _jwt_authentication.authenticate(request)
+    except (AuthenticationFailed, InvalidToken):
+        return None
+    return result[0] if result else None
+
+
+def json_response(data, status=200):
+    """DRF 와 같은 규칙(Decimal 문자열, 날짜 ISO 형식)으로 직렬화한 JSON 응답"""
+    content = json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+    response = HttpResponse(content, status=status, content_type='application/json')
+    # DRF Response 처럼 원본 데이터를 남겨 응답 캐시가 동기 뷰와 같은 형태로 저장하도록
+    response.data = data
+    return response
+
+
+def async_api_view(view):
+    """JWT 로 인증하는 GET 전용 비동기 뷰 데코레이터 (request.user 를 채워서 호출)"""
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return json_response({'detail': f'메소드(Method) "{request.method}"는 허용되지 않습니다.'}, status=405)
+
+        user = await run_in_pool(_authenticate, request)
+        if user is None:
+            response = json_response({'detail': str(NotAuthenticated.default_detail)}, status=401)
+            response['WWW-Authenticate'] = _jwt_authentication.authenticate_header(request)
+            return response
+
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
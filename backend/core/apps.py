@@ -0,0 +1,43 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+from django.apps import AppConfig
+
+
+def configure_metrics_dir(settings):
+    """prometheus_client multiprocess 모드의 값 파일 디렉터리를 PROMETHEUS_MULTIPROC_DIR 로 지정
+
+    prometheus_client 를 불러오기 전에 지정해야 한다. gunicorn 은 gunicorn.conf.py 가 마스터에서
+    지정하고 비우며, 그 밖에는 프로세스 전용 임시 디렉터리를 만들어 종료할 때 지운다.
+    (gunicorn 이 아닌 서버로 워커를 여러 개 띄우면 PROMETHEUS_MULTIPROC_DIR 을 지정하고 시작할 때 비워야 함)
+    """
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR') or settings.METRICS_DIR
+    if not directory:
+        directory = tempfile.mkdtemp(prefix='budget-tracker-metrics-')
+        atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = directory
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def import_models(self):
+        # ready() 는 늦음: 먼저 실행되는 admin 의 autodiscover 가 core.db_router 를 거쳐 core.metrics 를 불러옴
+        from django.conf import settings
+
+        if settings.METRICS_ENABLED:
+            configure_metrics_dir(settings)
+        super().import_models()
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import signals  # noqa: F401
+        from .profiling import instrument_serializers
+
+        if settings.PROFILING_ENABLED:
+            instrument_serializers()
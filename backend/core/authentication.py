@@ -0,0 +1,105 @@
+"""요청마다 사용자 행을 조회하지 않는 JWT 인증
+
+대부분의 API 는 request.user.pk 로 범위를 좁히는 데만 사용자를 쓰므로, 비밀번호를 뺀
+사용자 필드 값을 프로세스 메모리에 잠시(AUTH_USER_CACHE_TIMEOUT 초) 보관하고
+그 값으로 User 객체를 만든다. 비밀번호처럼 보관하지 않은 필드는 처음 접근할 때
+Django 의 지연 로딩(deferred field)으로 조회된다.
+
+사용자가 저장/삭제되면 시그널에서 같은 프로세스의 캐시를 지우지만 다른 워커 프로세스의
+캐시는 지울 수 없다. 따라서 비활성화된 사용자도 다른 워커에서는 토큰 만료와 관계없이
+최대 AUTH_USER_CACHE_TIMEOUT 초 동안 요청이 허용되며, 이는 알고 받아들인 한계다.
+(즉시 차단이 필요하면 0 으로 설정)
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .metrics import record_cache
+
+# 캐시에 보관하지 않는 필드 (필요할 때 지연 로딩)
+UNCACHED_FIELDS = {'password'}
+
+
+class UserCache:
+    """사용자 id -> (만료 시각, 필드 값) 를 보관하는 크기 제한 LRU 캐시"""
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, values = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return values
+
+    def set(self, user_id, values, timeout):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + timeout, values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def evict(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+def cached_field_names():
+    """캐시에 보관하는 사용자 필드 이름 (User._meta.concrete_fields 순서)"""
+    return [
+        field.attname for field in get_user_model()._meta.concrete_fields
+        if field.attname not in UNCACHED_FIELDS
+    ]
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """토큰의 사용자 id 로 캐시된 필드 값에서 User 객체를 만드는 JWTAuthentication"""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        timeout = settings.AUTH_USER_CACHE_TIMEOUT
+        names = cached_field_names()
+        values = None
+        if timeout:
+            values = user_cache.get(user_id)
+            record_cache('auth_user', values is not None)
+        if values is None:
+            values = self.user_model.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values_list(*names).first()
+            if values is None:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            if timeout:
+                user_cache.set(user_id, values, timeout)
+
+        user = self.user_model.from_db(router.db_for_read(self.user_model), names, values)
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
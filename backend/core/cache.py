@@ -0,0 +1,169 @@
+"""사용자별 데이터 버전을 키에 포함하는 응답 캐시
+
+사용자의 거래/카테고리/예산이 바뀌면 시그널에서 버전만 올리므로 해당 사용자의
+캐시된 응답 전체가 O(1) 로 무효화된다. 이전 버전으로 저장된 응답은 RESPONSE_CACHE_TIMEOUT
+후에 만료되고, 버전 키 자체도 그 두 배의 시간이 지나면 만료된다. 버전 키가 만료되면
+시간 기반의 새 번호로 다시 시작하므로 이전 버전의 응답이 다시 쓰이지는 않는다.
+키에는 오늘 날짜도 들어가므로 기본 기간이 이번 달인 통계/대시보드는 날짜가 바뀌면
+(월이 바뀌어 데이터 변경 없이 결과가 달라지는 경우 포함) 다시 계산된다. (core.conditional 의 ETag 와 같음)
+"""
+import functools
+import hashlib
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from .aio import json_response, run_in_pool
+from .metrics import record_cache
+
+HITS_KEY = 'response-cache:hits'
+MISSES_KEY = 'response-cache:misses'
+
+
+def _version_key(user_id):
+    return f'data-version:{user_id}'
+
+
+def _new_version():
+    # 캐시에서 버전 키가 사라져도 예전 버전 번호를 다시 쓰지 않도록 시간 기반으로 시작
+    return time.time_ns() // 1000
+
+
+def _version_timeout():
+    # 버전 키가 응답보다 먼저 만료되면 캐시된 응답이 적중하지 않으므로 응답 캐시 시간보다 길게
+    return max(settings.RESPONSE_CACHE_TIMEOUT, 60) * 2
+
+
+def get_data_version(user_id):
+    """사용자의 현재 데이터 버전"""
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), timeout=_version_timeout())
+        version = cache.get(key)
+    return version
+
+
+def _incr_version(user_id):
+    key = _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), timeout=_version_timeout())
+
+
+def bump_data_version(user_id):
+    """사용자의 데이터 버전을 올려 캐시된 응답을 모두 무효화
+
+    커밋 전에 다른 요청이 이전 데이터를 새 버전으로 캐시할 수 있으므로
+    커밋 후에도 한 번 더 올린다.
+    """
+    if user_id is None:
+        return
+    _incr_version(user_id)
+    transaction.on_commit(lambda: _incr_version(user_id))
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def get_stats():
+    """응답 캐시 적중/실패 횟수"""
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0,
+    }
+
+
+def reset_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+def query_string(request):
+    """정렬한 쿼리 문자열 (DRF Request 와 Django HttpRequest 모두)"""
+    params = getattr(request, 'query_params', request.GET)
+    return '&'.join(sorted(f'{key}={value}' for key, values in params.lists() for value in values))
+
+
+def _response_key(name, request):
+    digest = hashlib.md5(query_string(request).encode()).hexdigest()
+    user_id = request.user.pk
+    return f'response:{name}:{user_id}:{get_data_version(user_id)}:{date.today().isoformat()}:{digest}'
+
+
+def _lookup(name, request):
+    """(캐시 키, 캐시된 응답 데이터 또는 None) 조회하고 적중 여부를 기록"""
+    key = _response_key(name, request)
+    data = cache.get(key)
+    record_cache('response', data is not None)
+    _count(HITS_KEY if data is not None else MISSES_KEY)
+    return key, data
+
+
+def cache_per_user(name):
+    """GET 응답 데이터를 사용자/데이터 버전별로 캐시하는 뷰 데코레이터
+
+    함수형 뷰(request, ...)와 클래스 뷰 메서드(self, request, ...) 모두에 사용할 수 있다.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            request = next(arg for arg in args if hasattr(arg, 'query_params'))
+            if request.method != 'GET' or not settings.RESPONSE_CACHE_TIMEOUT:
+                return view(*args, **kwargs)
+
+            key, data = _lookup(name, request)
+            if data is not None:
+                response = Response(data)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = view(*args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def async_cache_per_user(name):
+    """cache_per_user 의 비동기 뷰(core.aio.async_api_view) 버전
+
+    같은 name 을 쓰면 동기 뷰와 캐시를 공유한다. (응답 데이터가 같은 경우)
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or not settings.RESPONSE_CACHE_TIMEOUT:
+                return await view(request, *args, **kwargs)
+
+            key, data = await run_in_pool(_lookup, name, request)
+            if data is not None:
+                response = json_response(data)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = await view(request, *args, **kwargs)
+            if response.status_code == 200:
+                await run_in_pool(cache.set, key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
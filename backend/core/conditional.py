@@ -0,0 +1,110 @@
+"""ETag / Last-Modified 기반 조건부 GET
+
+응답 본문을 만들기 전에 사용자 데이터의 최근 수정 시각과 행 수만 한 번의 쿼리로
+조회해 검증값을 만든다. 클라이언트가 보낸 If-None-Match 가 같으면 조회/직렬화
+없이 304 Not Modified 를 반환한다.
+"""
+import functools
+import hashlib
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, DateTimeField, IntegerField, Max, OuterRef, Subquery
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .aio import run_in_pool
+from .cache import query_string
+
+
+def _aggregate(model, function, output_field):
+    rows = model.objects.filter(user=OuterRef('pk')).order_by().values('user').annotate(
+        value=function
+    ).values('value')
+    return Subquery(rows, output_field=output_field)
+
+
+def data_validators(user, models):
+    """models 각각의 사용자별 (최근 수정 시각, 행 수) 를 한 번의 쿼리로 조회
+
+    행 수를 함께 보므로 수정 시각이 바뀌지 않는 삭제도 감지된다.
+    """
+    annotations = {}
+    for index, model in enumerate(models):
+        annotations[f'modified_{index}'] = _aggregate(model, Max('updated_at'), DateTimeField())
+        annotations[f'count_{index}'] = _aggregate(model, Count('id'), IntegerField())
+    row = get_user_model().objects.filter(pk=user.pk).annotate(**annotations).values(
+        *annotations
+    ).get()
+    return [(row[f'modified_{index}'], row[f'count_{index}'] or 0) for index in range(len(models))]
+
+
+def _validators(name, request, models):
+    """(ETag, Last-Modified 타임스탬프 또는 None)"""
+    validators = data_validators(request.user, models)
+    parts = [name, str(request.user.pk), query_string(request), date.today().isoformat()]
+    parts += [f'{modified.isoformat() if modified else "-"}:{count}' for modified, count in validators]
+    etag = quote_etag(hashlib.md5('|'.join(parts).encode()).hexdigest())
+    modified = [value for value, _ in validators if value is not None]
+    return etag, int(max(modified).timestamp()) if modified else None
+
+
+def _set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+
+
+def _private(response):
+    # 사용자마다 응답이 다르고, 매번 검증값을 확인하도록 함
+    patch_vary_headers(response, ['Authorization'])
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_per_user(name, *models):
+    """models 의 사용자 데이터가 바뀌지 않았으면 304 를 반환하는 GET 뷰 데코레이터
+
+    ETag 에는 뷰 이름, 쿼리 문자열, 오늘 날짜(기본 기간이 이번 달인 통계용)와
+    각 모델의 검증값이 들어간다. cache_per_user 보다 바깥에 두어야 캐시 조회도 생략된다.
+    함수형 뷰(request, ...)와 클래스 뷰 메서드(self, request, ...) 모두에 사용할 수 있다.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            request = next(arg for arg in args if hasattr(arg, 'query_params'))
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+
+            etag, last_modified = _validators(name, request, models)
+            # 삭제는 최근 수정 시각을 바꾸지 않으므로 If-Modified-Since 만으로는 판단하지 않고
+            # 행 수까지 반영된 ETag(If-None-Match)로만 304 를 결정한다.
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(*args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                _set_validators(response, etag, last_modified)
+            return _private(response)
+        return wrapper
+    return decorator
+
+
+def async_conditional_per_user(name, *models):
+    """conditional_per_user 의 비동기 뷰(core.aio.async_api_view) 버전"""
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view(request, *args, **kwargs)
+
+            etag, last_modified = await run_in_pool(_validators, name, request, models)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                _set_validators(response, etag, last_modified)
+            return _private(response)
+        return wrapper
+    return decorator
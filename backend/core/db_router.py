@@ -0,0 +1,184 @@
+"""읽기 전용 복제본(replica) 라우팅
+
+기본적으로 모든 읽기/쓰기는 default(주 DB)로 간다. 무거운 읽기 전용 뷰에만
+read_replica 로 표시해서 복제본(settings.REPLICA_DATABASES)에서 읽는다.
+
+사용자가 자신이 쓴 데이터를 바로 볼 수 있도록
+- 같은 요청 안에서 한 번이라도 쓰면 이후 읽기는 주 DB 로 가고
+- 쓴 사용자는 REPLICA_PIN_SECONDS 초 동안(복제 지연 대비) 복제본을 쓰지 않는다.
+요청 단위 상태는 ReplicaRoutingMiddleware 가 contextvar 에 만든다.
+"""
+import functools
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from .aio import run_in_pool
+from .profiling import request_user
+
+
+class _RoutingState:
+    __slots__ = ('replica', 'wrote')
+
+    def __init__(self):
+        self.replica = False
+        self.wrote = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+def _pin_key(user_id):
+    return f'db-primary-pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """user_id 의 읽기를 REPLICA_PIN_SECONDS 초 동안 주 DB 로 고정"""
+    cache.set(_pin_key(user_id), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return bool(cache.get(_pin_key(user_id)))
+
+
+@contextmanager
+def read_replica(user_id=None):
+    """블록 안의 읽기를 복제본으로 보냄 (복제본이 없거나 user_id 가 최근에 썼으면 주 DB)"""
+    if not settings.REPLICA_DATABASES or (user_id is not None and is_pinned(user_id)):
+        yield
+        return
+
+    state = _state.get()
+    token = None
+    if state is None:
+        state = _RoutingState()
+        token = _state.set(state)
+    previous = state.replica
+    state.replica = True
+    try:
+        yield
+    finally:
+        state.replica = previous
+        if token is not None:
+            _state.reset(token)
+
+
+def use_read_replica(view):
+    """뷰의 읽기를 복제본으로 보내는 데코레이터
+
+    함수형 뷰(request, ...)와 클래스 뷰 메서드(self, request, ...) 모두에 사용할 수 있다.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        request = next(arg for arg in args if hasattr(arg, 'query_params'))
+        if request.method not in ('GET', 'HEAD'):
+            return view(*args, **kwargs)
+        with read_replica(request.user.pk):
+            return view(*args, **kwargs)
+    return wrapper
+
+
+def async_use_read_replica(view):
+    """use_read_replica 의 비동기 뷰(core.aio.async_api_view) 버전
+
+    DB 스레드 풀에서 실행하는 쿼리도 복사된 컨텍스트로 같은 라우팅 상태를 본다.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not settings.REPLICA_DATABASES:
+            return await view(request, *args, **kwargs)
+        if await run_in_pool(is_pinned, request.user.pk):
+            return await view(request, *args, **kwargs)
+        with read_replica():
+            return await view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    """read_replica 안의 읽기만 복제본으로 보내고 나머지는 주 DB 로 보내는 라우터"""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica or state.wrote:
+            return 'default'
+        return random.choice(settings.REPLICA_DATABASES)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본은 주 DB 와 같은 데이터
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """요청마다 라우팅 상태를 새로 만들고, 쓰기가 있었던 사용자는 잠시 주 DB 로 고정 (WSGI/ASGI)"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.REPLICA_DATABASES:
+            return self.get_response(request)
+
+        state = _RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        user = self.writer(request, state)
+        if user is not None:
+            pin_to_primary(user.pk)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.REPLICA_DATABASES:
+            return await self.get_response(request)
+
+        # 비동기 뷰가 스레드 풀에서 실행한 쿼리도 같은 상태를 봄 (core.aio.run_in_pool 이 컨텍스트를 복사)
+        state = _RoutingState()
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        user = self.writer(request, state)
+        if user is not None:
+            await sync_to_async(pin_to_primary)(user.pk)
+        return response
+
+    def writer(self, request, state):
+        """이 요청에서 쓰기를 한 인증된 사용자 (없으면 None)"""
+        # DRF 가 인증한 사용자는 request.user 에도 설정된다
+        user = request_user(request)
+        if state.wrote and user is not None and user.is_authenticated:
+            return user
+        return None
+
+
+class ReplicaChangeListMixin:
+    """관리자 목록 화면(GET)을 복제본에서 읽는 ModelAdmin 믹스인"""
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method != 'GET':
+            return super().changelist_view(request, extra_context)
+        with read_replica(request.user.pk):
+            response = super().changelist_view(request, extra_context)
+            # TemplateResponse 는 반환된 뒤에 렌더링되므로 복제본을 쓰는 동안 렌더링한다
+            return response.render() if hasattr(response, 'render') else response
@@ -0,0 +1,53 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.authentication import CachedJWTAuthentication, user_cache
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = '기존 JWTAuthentication 과 CachedJWTAuthentication 의 요청당 쿼리 수/인증 시간을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='인증 반복 횟수')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['requests'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def run(self, requests):
+        user = get_user_model().objects.create_user(email='auth-bench@example.com', username='auth-bench')
+        token = str(RefreshToken.for_user(user).access_token)
+        request = RequestFactory().get('/api/stats/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        user_cache.clear()
+
+        self.stdout.write(f'{"인증 클래스":<26}{"요청당 쿼리":>12}{"평균":>12}{"p95":>12}')
+        for authentication in (JWTAuthentication(), CachedJWTAuthentication()):
+            timings = []
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(requests):
+                    started = time.perf_counter()
+                    authenticated, _ = authentication.authenticate(request)
+                    timings.append((time.perf_counter() - started) * 1_000_000)
+            assert authenticated.pk == user.pk
+            timings.sort()
+            self.stdout.write(
+                f'{type(authentication).__name__:<26}{len(queries) / requests:>12.3f}'
+                f'{statistics.mean(timings):>10.1f}us{timings[int(len(timings) * 0.95)]:>10.1f}us'
+            )
+        user_cache.clear()
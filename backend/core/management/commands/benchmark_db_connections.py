@@ -0,0 +1,88 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from transactions.seeding import create_users, seed_ledger
+
+
+class Command(BaseCommand):
+    help = 'DB 연결 관리 모드(DB_CONNECTION_MODE)별 요청 지연 시간과 새로 연 연결 수를 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='모드별 요청 수')
+        parser.add_argument('--transactions', type=int, default=200, help='생성할 거래 수')
+        parser.add_argument('--path', default='/api/transactions/', help='요청할 경로')
+        parser.add_argument('--pgbouncer-host', help='pgbouncer 주소 (지정하면 pgbouncer 모드도 측정)')
+        parser.add_argument('--pgbouncer-port', type=int, default=6432)
+
+    def handle(self, *args, **options):
+        # 모드마다 새 연결로 읽어야 하므로 롤백하지 않고 커밋한 뒤 마지막에 삭제
+        user, = create_users(['db-bench@example.com'])
+        try:
+            seed_ledger(user, options['transactions'])
+            token = str(RefreshToken.for_user(user).access_token)
+            client = Client(HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_HOST='localhost')
+            self.run(client, options)
+        finally:
+            user.delete()
+
+    def run(self, client, options):
+        connection = connections['default']
+        self.stdout.write(
+            f'{connection.vendor} {options["path"]} 요청 {options["requests"]}개\n'
+            f'{"모드":<14}{"p50":>10}{"p95":>10}{"평균":>10}{"새 연결":>8}'
+        )
+        modes = ['request', 'persistent']
+        if options['pgbouncer_host']:
+            modes.append('pgbouncer')
+
+        original = dict(connection.settings_dict)
+        try:
+            for mode in modes:
+                connection.close()
+                connection.settings_dict.update(settings.DB_CONNECTION_PROFILES[mode])
+                if mode == 'pgbouncer':
+                    connection.settings_dict.update(
+                        HOST=options['pgbouncer_host'], PORT=options['pgbouncer_port']
+                    )
+                self.report(mode, *self.measure(client, options))
+                connection.settings_dict.clear()
+                connection.settings_dict.update(original)
+        finally:
+            connection.close()
+            connection.settings_dict.clear()
+            connection.settings_dict.update(original)
+
+    def measure(self, client, options):
+        opened = []
+
+        def count(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        # 테스트 클라이언트는 요청 시작/종료 때의 연결 정리를 끄므로 WSGI 핸들러처럼 직접 호출
+        connection_created.connect(count)
+        timings = []
+        try:
+            for _ in range(options['requests']):
+                started = time.perf_counter()
+                close_old_connections()
+                status = client.get(options['path']).status_code
+                close_old_connections()
+                timings.append((time.perf_counter() - started) * 1000)
+                assert status == 200, status
+        finally:
+            connection_created.disconnect(count)
+        return timings, len(opened)
+
+    def report(self, mode, timings, opened):
+        timings.sort()
+        self.stdout.write(
+            f'{mode:<14}{statistics.median(timings):>8.2f}ms{timings[int(len(timings) * 0.95)]:>8.2f}ms'
+            f'{statistics.mean(timings):>8.2f}ms{opened:>8}'
+        )
@@ -0,0 +1,174 @@
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from transactions.seeding import EXPENSE_TITLES
+
+# 화면별 기본 방문 비율
+DEFAULT_MIX = 'dashboard=5,transactions=3,budgets=2'
+
+
+def percentile(values, q):
+    """정렬된 values 의 q 백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))]
+
+
+def page_requests(page, rng):
+    """화면을 열 때 프론트엔드가 보내는 (이름, 경로) 요청 목록"""
+    if page == 'dashboard':
+        return [('dashboard', '/api/dashboard/')]
+    if page == 'transactions':
+        roll = rng.random()
+        if roll < 0.7:
+            listing = ('transactions', '/api/transactions/?page=1')
+        elif roll < 0.9:
+            listing = ('transactions (page 2+)', f'/api/transactions/?page={rng.randint(2, 5)}')
+        else:
+            listing = ('transactions (search)', '/api/transactions/?' + urlencode({
+                'page': 1, 'search': rng.choice(EXPENSE_TITLES),
+            }))
+        return [listing, ('categories', '/api/categories/')]
+    if page == 'budgets':
+        return [('budgets', '/api/budgets/'), ('categories', '/api/categories/')]
+    raise ValueError(page)
+
+
+class Command(BaseCommand):
+    help = (
+        '실행 중인 서버에 seed_ledger 로 만든 사용자들의 대시보드/거래/예산 화면 요청을 보내고 '
+        '엔드포인트별 p50/p95/p99 지연 시간과 처리량을 보고합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='서버 주소')
+        parser.add_argument('--prefix', default='load', help='seed_ledger 로 만든 사용자 이메일 접두어')
+        parser.add_argument('--users', type=int, default=200, help='요청에 사용할 사용자 수')
+        parser.add_argument('--concurrency', type=int, default=16, help='동시에 화면을 여는 가상 사용자 수')
+        parser.add_argument('--duration', type=float, default=30, help='실행 시간(초)')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help=f'화면별 방문 비율 (기본값: {DEFAULT_MIX})')
+        parser.add_argument('--think-ms', type=float, default=0, help='화면 사이 대기 시간(ms)')
+        parser.add_argument('--no-revalidate', action='store_true',
+                            help='프론트엔드처럼 If-None-Match 로 재검증하지 않고 항상 전체 응답 요청')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        try:
+            mix = {
+                name: float(weight)
+                for name, weight in (item.split('=') for item in options['mix'].split(','))
+            }
+            for page in mix:
+                page_requests(page, random.Random())
+        except ValueError:
+            raise CommandError(f'--mix 형식이 올바르지 않습니다: {options["mix"]}')
+
+        # 서버와 같은 SECRET_KEY 로 토큰을 직접 발급 (로그인 요청의 비밀번호 해시 비용은 제외)
+        user_ids = list(
+            get_user_model().objects.filter(email__startswith=f'{options["prefix"]}-')
+            .order_by('pk').values_list('pk', flat=True)[:options['users']]
+        )
+        if not user_ids:
+            raise CommandError(f'"{options["prefix"]}-" 사용자가 없습니다. seed_ledger 를 먼저 실행하세요.')
+        tokens = [str(AccessToken.for_user(get_user_model()(pk=user_id))) for user_id in user_ids]
+
+        self.stdout.write(
+            f'{options["url"]} 사용자 {len(tokens)}명, 동시 {options["concurrency"]}명, {options["duration"]:.0f}초'
+        )
+        results, elapsed = self.run(tokens, mix, options)
+        report = self.report(results, elapsed)
+        if options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump({'options': {
+                    key: options[key] for key in ('url', 'users', 'concurrency', 'duration', 'mix', 'no_revalidate')
+                }, 'elapsed': elapsed, 'endpoints': report}, f, ensure_ascii=False, indent=2)
+
+    def run(self, tokens, mix, options):
+        results = []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options['duration']
+        pages, weights = list(mix), list(mix.values())
+
+        def virtual_user(worker):
+            rng = random.Random(options['seed'] * 1_000_003 + worker)
+            # 프론트엔드의 재검증 캐시처럼 (토큰, 경로) 별 ETag 를 보관
+            etags = {}
+            local = []
+            while time.perf_counter() < deadline:
+                token = rng.choice(tokens)
+                page = rng.choices(pages, weights)[0]
+                for name, path in page_requests(page, rng):
+                    local.append((name, *self.request(options['url'] + path, token, etags, options)))
+                if options['think_ms']:
+                    time.sleep(options['think_ms'] / 1000)
+            with lock:
+                results.extend(local)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            list(executor.map(virtual_user, range(options['concurrency'])))
+        return results, time.perf_counter() - started
+
+    def request(self, url, token, etags, options):
+        headers = {'Authorization': f'Bearer {token}'}
+        key = (token, url)
+        if not options['no_revalidate'] and key in etags:
+            headers['If-None-Match'] = etags[key]
+
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as response:
+                response.read()
+                status = response.status
+                etag = response.headers.get('ETag')
+        except urllib.error.HTTPError as e:
+            status, etag = e.code, None
+        except OSError:
+            status, etag = 0, None
+        elapsed = (time.perf_counter() - started) * 1000
+        if etag:
+            etags[key] = etag
+        return status, elapsed
+
+    def report(self, results, elapsed):
+        by_endpoint = {}
+        for name, status, duration in results:
+            by_endpoint.setdefault(name, []).append((status, duration))
+        by_endpoint['(전체)'] = [(status, duration) for _, status, duration in results]
+
+        self.stdout.write(
+            f'\n{"엔드포인트":<24}{"요청":>8}{"오류":>6}{"304":>6}'
+            f'{"p50":>10}{"p95":>10}{"p99":>10}{"처리량":>12}'
+        )
+        report = {}
+        for name, entries in by_endpoint.items():
+            timings = sorted(duration for _, duration in entries)
+            errors = sum(1 for status, _ in entries if status not in (200, 304))
+            not_modified = sum(1 for status, _ in entries if status == 304)
+            report[name] = {
+                'requests': len(entries),
+                'errors': errors,
+                'not_modified': not_modified,
+                'p50_ms': round(percentile(timings, 50), 2),
+                'p95_ms': round(percentile(timings, 95), 2),
+                'p99_ms': round(percentile(timings, 99), 2),
+                'throughput': round(len(entries) / elapsed, 2),
+            }
+            row = report[name]
+            self.stdout.write(
+                f'{name:<24}{row["requests"]:>8}{errors:>6}{not_modified:>6}'
+                f'{row["p50_ms"]:>8.1f}ms{row["p95_ms"]:>8.1f}ms{row["p99_ms"]:>8.1f}ms'
+                f'{row["throughput"]:>8.1f}req/s'
+            )
+        return report
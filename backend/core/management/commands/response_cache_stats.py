@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core import cache
+
+
+class Command(BaseCommand):
+    help = '사용자별 응답 캐시의 적중/실패 횟수를 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='출력 후 횟수를 초기화')
+
+    def handle(self, *args, **options):
+        stats = cache.get_stats()
+        self.stdout.write(
+            f'적중 {stats["hits"]}회, 실패 {stats["misses"]}회 (적중률 {stats["hit_ratio"]:.1%})'
+        )
+        if options['reset']:
+            cache.reset_stats()
+            self.stdout.write('횟수를 초기화했습니다.')
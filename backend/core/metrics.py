@@ -0,0 +1,219 @@
+"""Prometheus 지표 (/metrics)
+
+gunicorn 워커마다 값이 따로 쌓이므로 prometheus_client 의 multiprocess 모드를 사용한다.
+각 프로세스는 PROMETHEUS_MULTIPROC_DIR(core.apps.configure_metrics_dir 가 지정)에 값 파일을 쓰고,
+/metrics 는 어느 워커가 받든 디렉터리의 모든 파일을 합쳐서 응답한다.
+(gunicorn.conf.py 가 시작할 때 디렉터리를 비우고, 종료된 워커의 진행 중 요청 수를 정리함)
+/metrics 는 METRICS_TOKEN 을 Bearer 토큰으로 보내야 하며, 토큰이 없으면 DEBUG 에서만 응답한다.
+
+- http_requests_total, http_request_duration_seconds, http_request_db_queries: 뷰(URL 이름)별
+- cache_requests_total: 캐시별 적중/실패 횟수, cache_hit_ratio: 이를 합산한 적중률
+- active_users: 최근 5분/15분/1시간/24시간 안에 요청한 서로 다른 사용자 수
+  (워커마다 사용자별 마지막 요청 시각을 active-users-<pid>.json 에 주기적으로 기록하고 합산)
+"""
+import glob
+import hmac
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from .profiling import RequestMetrics, current_metrics, measure, request_user
+
+# active_users 집계 구간 (라벨, 초)
+ACTIVE_USER_WINDOWS = (('5m', 300), ('15m', 900), ('1h', 3600), ('24h', 86400))
+# 워커가 사용자별 마지막 요청 시각을 파일에 쓰는 최소 간격(초)
+ACTIVE_USER_FLUSH_SECONDS = 10
+
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+REQUESTS = Counter(
+    'http_requests', '처리한 요청 수', ['view', 'method', 'status'],
+)
+LATENCY = Histogram(
+    'http_request_duration_seconds', '요청 처리 시간', ['view', 'method'],
+)
+DB_QUERIES = Histogram(
+    'http_request_db_queries', '요청당 DB 쿼리 수', ['view', 'method'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, float('inf')),
+)
+IN_PROGRESS = Gauge(
+    'http_requests_in_progress', '처리 중인 요청 수', multiprocess_mode='livesum',
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests', '캐시 조회 수', ['cache', 'result'],
+)
+
+
+def record_cache(name, hit):
+    """캐시 조회 결과를 cache_requests_total 에 기록"""
+    if settings.METRICS_ENABLED:
+        CACHE_REQUESTS.labels(name, 'hit' if hit else 'miss').inc()
+
+
+class ActiveUsers:
+    """이 프로세스에서 요청한 사용자별 마지막 요청 시각 (파일로 다른 워커와 공유)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen = {}
+        self._flushed = 0.0
+
+    def _path(self, pid=None):
+        return os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], f'active-users-{pid or os.getpid()}.json')
+
+    def seen(self, user_id):
+        now = time.time()
+        with self._lock:
+            self._seen[user_id] = now
+            if now - self._flushed < ACTIVE_USER_FLUSH_SECONDS:
+                return
+            self._flushed = now
+        self.flush()
+
+    def flush(self):
+        oldest = time.time() - ACTIVE_USER_WINDOWS[-1][1]
+        with self._lock:
+            self._seen = {user_id: ts for user_id, ts in self._seen.items() if ts >= oldest}
+            data = json.dumps(self._seen)
+        path = self._path()
+        temp = f'{path}.tmp'
+        with open(temp, 'w') as f:
+            f.write(data)
+        os.replace(temp, path)
+
+    def counts(self):
+        """모든 프로세스의 파일을 합쳐서 구간별 서로 다른 사용자 수"""
+        self.flush()
+        now = time.time()
+        latest = {}
+        for path in glob.glob(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], 'active-users-*.json')):
+            try:
+                if os.path.getmtime(path) < now - ACTIVE_USER_WINDOWS[-1][1]:
+                    # 오래전에 종료된 워커의 파일
+                    os.remove(path)
+                    continue
+                with open(path) as f:
+                    seen = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for user_id, ts in seen.items():
+                if ts > latest.get(user_id, 0):
+                    latest[user_id] = ts
+        return {
+            label: sum(1 for ts in latest.values() if ts >= now - seconds)
+            for label, seconds in ACTIVE_USER_WINDOWS
+        }
+
+
+active_users = ActiveUsers()
+
+
+class ActiveUsersCollector:
+    def collect(self):
+        gauge = GaugeMetricFamily('active_users', '최근 요청한 서로 다른 사용자 수', labels=['window'])
+        for label, count in active_users.counts().items():
+            gauge.add_metric([label], count)
+        yield gauge
+
+
+class CacheHitRatioCollector:
+    """모든 프로세스의 cache_requests_total 을 합산한 캐시별 적중률"""
+
+    def __init__(self, source):
+        self.source = source
+
+    def collect(self):
+        totals = {}
+        for family in self.source.collect():
+            if family.name != 'cache_requests':
+                continue
+            for sample in family.samples:
+                if sample.name == 'cache_requests_total':
+                    counts = totals.setdefault(sample.labels['cache'], {'hit': 0, 'miss': 0})
+                    counts[sample.labels['result']] += sample.value
+        gauge = GaugeMetricFamily('cache_hit_ratio', '캐시 적중률 (프로세스 시작 이후)', labels=['cache'])
+        for name, counts in sorted(totals.items()):
+            total = counts['hit'] + counts['miss']
+            gauge.add_metric([name], counts['hit'] / total if total else 0.0)
+        yield gauge
+
+
+def metrics_view(request):
+    """Prometheus 텍스트 형식 지표 (Bearer METRICS_TOKEN 필요, 토큰을 설정하지 않았으면 DEBUG 에서만)"""
+    token = settings.METRICS_TOKEN
+    if not settings.METRICS_ENABLED or not (token or settings.DEBUG):
+        # 운영 환경에서 토큰 없이 내부 지표가 공개되지 않도록
+        return HttpResponse(status=404)
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+
+    registry = CollectorRegistry()
+    source = MultiProcessCollector(registry)
+    registry.register(CacheHitRatioCollector(source))
+    registry.register(ActiveUsersCollector())
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """뷰별 요청 수/처리 시간/DB 쿼리 수와 활성 사용자를 기록하는 미들웨어 (WSGI/ASGI)"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        # RequestProfilingMiddleware 가 이미 쿼리를 세고 있으면 그 값을 사용
+        metrics = current_metrics()
+        started = time.perf_counter()
+        with IN_PROGRESS.track_inprogress():
+            with nullcontext(metrics) if metrics is not None else measure(RequestMetrics()) as metrics:
+                queries_before = metrics.db_count
+                response = self.get_response(request)
+                queries = metrics.db_count - queries_before
+        self.record(request, response, time.perf_counter() - started, queries)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        metrics = current_metrics()
+        started = time.perf_counter()
+        with IN_PROGRESS.track_inprogress():
+            with nullcontext(metrics) if metrics is not None else measure(RequestMetrics()) as metrics:
+                queries_before = metrics.db_count
+                response = await self.get_response(request)
+                queries = metrics.db_count - queries_before
+        self.record(request, response, time.perf_counter() - started, queries)
+        return response
+
+    def record(self, request, response, elapsed, queries):
+        match = request.resolver_match
+        view = match.view_name if match is not None else '<unmatched>'
+        method = request.method if request.method in METHODS else 'OTHER'
+        REQUESTS.labels(view, method, str(response.status_code)).inc()
+        LATENCY.labels(view, method).observe(elapsed)
+        DB_QUERIES.labels(view, method).observe(queries)
+
+        user = request_user(request)
+        if user is not None and user.is_authenticated:
+            active_users.seen(user.pk)
@@ -0,0 +1,289 @@
+"""요청별 성능 측정 (Server-Timing 헤더, 구조화 로그, 샘플 프로파일, 느린 쿼리 실행 계획)
+
+RequestProfilingMiddleware 가 요청마다 다음을 측정한다.
+- db: 이 요청 스레드의 DB 연결에서 실행한 쿼리 수와 시간
+- serialize: DRF 시리얼라이저 .data 계산 시간 (중첩된 시리얼라이저는 바깥 것에 포함)
+- render: 응답 렌더링(JSON 변환) 시간
+- total: 미들웨어 안쪽 전체 처리 시간
+
+Server-Timing 헤더는 PROFILING_SERVER_TIMING 이 켜져 있을 때만 붙인다. (기본값 DEBUG)
+스트리밍 응답(내보내기 등)은 본문을 내보내는 동안 실행한 쿼리까지 세고, 요청 로그는
+응답을 닫을 때(본문 전송 후) 남긴다. 헤더는 본문보다 먼저 나가므로 그 전까지의 값만 담긴다.
+
+PROFILING_SAMPLE_RATE 비율의 요청은 cProfile 로 실행하고, 그중 PROFILING_SLOW_REQUEST_MS
+이상 걸린 요청의 프로파일을 PROFILING_DIR 에 저장한다. (python -m pstats 로 확인)
+PROFILING_SLOW_QUERY_MS 보다 오래 걸린 SELECT 는 응답을 보낸 뒤(response.close) EXPLAIN 결과를
+로그로 남긴다.
+"""
+import cProfile
+import json
+import logging
+import os
+import random
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from threading import Lock
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger('core.profiling')
+
+# 실행 계획을 남길 느린 쿼리 수 상한 (요청당)
+MAX_EXPLAINED_QUERIES = 5
+
+
+class RequestMetrics:
+    __slots__ = (
+        'db_count', 'db_ms', 'serialize_ms', 'render_ms', 'serializer_depth', 'render_started', 'slow_queries',
+        '_lock',
+    )
+
+    def __init__(self):
+        self.db_count = 0
+        self.db_ms = 0.0
+        self.serialize_ms = 0.0
+        self.render_ms = 0.0
+        self.serializer_depth = 0
+        self.render_started = None
+        self.slow_queries = []
+        # 비동기 뷰는 DB 스레드 풀의 여러 스레드에서 동시에 기록함 (core.aio.run_in_pool)
+        self._lock = Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper 로 등록되는 쿼리 측정기
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self.db_count += 1
+                self.db_ms += elapsed
+                threshold = settings.PROFILING_SLOW_QUERY_MS
+                if threshold and elapsed >= threshold and not many:
+                    self.slow_queries.append((context['connection'].alias, sql, params, elapsed))
+
+
+_current = ContextVar('request_metrics', default=None)
+
+
+def current_metrics():
+    """진행 중인 요청의 RequestMetrics (측정 중이 아니면 None)"""
+    return _current.get()
+
+
+@contextmanager
+def measure(metrics):
+    """블록 안에서 실행한 쿼리와 시리얼라이저 시간을 metrics 에 기록
+
+    DB 연결은 스레드마다 따로이므로 다른 스레드에서 실행하는 작업은 그 스레드에서
+    같은 metrics 로 다시 감싼다. (core.aio.run_in_pool)
+    """
+    token = _current.set(metrics)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            yield metrics
+    finally:
+        _current.reset(token)
+
+
+def instrument_serializers():
+    """BaseSerializer.data 에 걸린 시간을 현재 요청의 serialize 시간에 더하도록 감쌈"""
+    original = BaseSerializer.data
+    if getattr(original.fget, 'profiled', False):
+        return
+
+    def data(self):
+        metrics = _current.get()
+        if metrics is None or metrics.serializer_depth:
+            return original.fget(self)
+        metrics.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            metrics.serializer_depth -= 1
+            metrics.serialize_ms += (time.perf_counter() - started) * 1000
+
+    data.profiled = True
+    BaseSerializer.data = property(data)
+
+
+def server_timing(metrics, total_ms):
+    return ', '.join([
+        f'db;dur={metrics.db_ms:.1f};desc="{metrics.db_count} queries"',
+        f'serialize;dur={metrics.serialize_ms:.1f}',
+        f'render;dur={metrics.render_ms:.1f}',
+        f'total;dur={total_ms:.1f}',
+    ])
+
+
+def explain(alias, sql, params):
+    """SELECT 의 실행 계획 (SQLite 는 EXPLAIN QUERY PLAN, PostgreSQL 은 EXPLAIN)"""
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+        return '\n'.join(' | '.join(str(value) for value in row) for row in cursor.fetchall())
+
+
+def _log_slow_queries(metrics):
+    for alias, sql, params, elapsed in metrics.slow_queries[:MAX_EXPLAINED_QUERIES]:
+        plan = None
+        if sql.lstrip()[:6].upper() == 'SELECT':
+            try:
+                plan = explain(alias, sql, params)
+            except DatabaseError as e:
+                plan = f'(EXPLAIN 실패: {e})'
+        logger.warning(json.dumps({
+            'event': 'slow_query', 'database': alias, 'duration_ms': round(elapsed, 1), 'sql': sql, 'plan': plan,
+        }, ensure_ascii=False))
+
+
+def _measured_stream(content, metrics):
+    """스트리밍 응답 본문을 만드는 동안 실행한 쿼리도 metrics 에 기록"""
+    iterator = iter(content)
+    while True:
+        with measure(metrics):
+            chunk = next(iterator, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def _sampled_profile():
+    if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+        return cProfile.Profile()
+    return None
+
+
+def _save_profile(profile, request, total_ms):
+    directory = settings.PROFILING_DIR
+    os.makedirs(directory, exist_ok=True)
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-') or 'root'
+    name = f'{datetime.now():%Y%m%d-%H%M%S-%f}-{request.method}-{slug}-{total_ms:.0f}ms.prof'
+    profile.dump_stats(os.path.join(directory, name))
+
+    # 오래된 파일부터 지워 PROFILING_MAX_FILES 개만 유지
+    files = sorted(entry for entry in os.listdir(directory) if entry.endswith('.prof'))
+    for old in files[:-settings.PROFILING_MAX_FILES]:
+        try:
+            os.remove(os.path.join(directory, old))
+        except OSError:
+            pass
+    return name
+
+
+def request_user(request):
+    """요청의 사용자 (아직 읽지 않은 세션 사용자는 읽지 않고 None, 비동기 미들웨어에서 DB 접근 방지)"""
+    user = getattr(request, 'user', None)
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return None
+    return user
+
+
+class RequestProfilingMiddleware:
+    """요청별 DB/직렬화/렌더링 시간을 Server-Timing 헤더와 로그로 내보내는 미들웨어 (WSGI/ASGI)"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.PROFILING_ENABLED:
+            return self.get_response(request)
+
+        profile = _sampled_profile()
+        started = time.perf_counter()
+        with measure(RequestMetrics()) as metrics:
+            if profile is not None:
+                profile.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                if profile is not None:
+                    profile.disable()
+        self.finish(request, response, metrics, started, profile)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.PROFILING_ENABLED:
+            return await self.get_response(request)
+
+        # 이벤트 루프에서 실행한 코드만 프로파일됨 (스레드 풀에서 실행한 쿼리는 제외)
+        profile = _sampled_profile()
+        started = time.perf_counter()
+        with measure(RequestMetrics()) as metrics:
+            if profile is not None:
+                profile.enable()
+            try:
+                response = await self.get_response(request)
+            finally:
+                if profile is not None:
+                    profile.disable()
+        self.finish(request, response, metrics, started, profile)
+        return response
+
+    def finish(self, request, response, metrics, started, profile):
+        total_ms = (time.perf_counter() - started) * 1000
+        if settings.PROFILING_SERVER_TIMING:
+            response['Server-Timing'] = server_timing(metrics, total_ms)
+        streaming = response.streaming and not getattr(response, 'is_async', False)
+        if streaming:
+            response.streaming_content = _measured_stream(response.streaming_content, metrics)
+        user = request_user(request)
+
+        def closed():
+            # 스트리밍 응답은 본문을 다 보낸 시점까지가 처리 시간
+            elapsed = (time.perf_counter() - started) * 1000 if streaming else total_ms
+            self.log(request, response, metrics, user, elapsed, profile)
+            if metrics.slow_queries:
+                _log_slow_queries(metrics)
+
+        # 로그와 느린 쿼리의 EXPLAIN 은 응답을 보낸 뒤에 (ASGI 에서도 response.close 는 스레드에서 실행됨)
+        response._resource_closers.append(closed)
+
+    def log(self, request, response, metrics, user, total_ms, profile):
+        record = {
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'user_id': getattr(user, 'pk', None),
+            'duration_ms': round(total_ms, 1),
+            'db_queries': metrics.db_count,
+            'db_ms': round(metrics.db_ms, 1),
+            'serialize_ms': round(metrics.serialize_ms, 1),
+            'render_ms': round(metrics.render_ms, 1),
+        }
+        if profile is not None and total_ms >= settings.PROFILING_SLOW_REQUEST_MS:
+            record['profile'] = _save_profile(profile, request, total_ms)
+        logger.info(json.dumps(record, ensure_ascii=False))
+
+    def process_template_response(self, request, response):
+        # 렌더링 직전에 호출되며, 렌더링이 끝나면 post-render 콜백으로 시간을 기록
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.render_started = time.perf_counter()
+
+            def finished(rendered):
+                metrics.render_ms += (time.perf_counter() - metrics.render_started) * 1000
+
+            response.add_post_render_callback(finished)
+        return response
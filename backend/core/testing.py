@@ -0,0 +1,211 @@
+"""API 엔드포인트 쿼리 수 / 응답 시간 회귀 테스트 도구
+
+각 앱의 tests.py 에서 EndpointPerformanceTestCase 를 상속해 URL 마다 check() 로
+최대 쿼리 수를 확인한다. (비동기 뷰는 AsyncEndpointPerformanceTestCase)
+쿼리 수는 장비와 관계없이 같으므로 항상 확인하고, 응답 시간 중앙값을 perf_baseline.json 과
+비교하는 것은 PERF_CHECK_TIMINGS=1 일 때만 한다. (벽시계 시간은 장비와 부하에 따라 달라짐)
+
+환경변수
+- PERF_UPDATE_BASELINE=1: 비교하지 않고 측정한 시간으로 기준 파일을 갱신
+- PERF_CHECK_TIMINGS=1: 응답 시간도 기준과 비교 (기준을 만든 것과 같은 장비에서 실행할 때)
+- PERF_TOLERANCE: 기준 대비 허용 배율 (기본 1.5)
+- PERF_MIN_DELTA_MS: 이보다 작은 차이는 무시 (기본 5ms)
+- PERF_RUNS: 시간 측정 반복 횟수 (기본 5)
+"""
+import json
+import os
+import statistics
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from importlib import import_module
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from budgets.models import Budget
+from transactions.seeding import create_users, seed_ledger
+
+from .authentication import user_cache
+
+PASSWORD = 'perf-test-password'
+LEDGER_TRANSACTIONS = 500
+
+BASELINE_PATH = Path(settings.BASE_DIR) / 'perf_baseline.json'
+
+UPDATE_BASELINE = os.environ.get('PERF_UPDATE_BASELINE', '0') == '1'
+CHECK_TIMINGS = os.environ.get('PERF_CHECK_TIMINGS', '0') == '1'
+TOLERANCE = float(os.environ.get('PERF_TOLERANCE', '1.5'))
+MIN_DELTA_MS = float(os.environ.get('PERF_MIN_DELTA_MS', '5'))
+RUNS = int(os.environ.get('PERF_RUNS', '5'))
+
+# 테스트가 확인한 URL 이름 (covers 데코레이터가 모듈을 불러올 때 채움)
+COVERED_URLS = set()
+
+TEST_SETTINGS = {
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    # 응답 캐시가 아닌 실제 처리 비용을 측정
+    'RESPONSE_CACHE_TIMEOUT': 0,
+    'PASSWORD_HASHERS': ['django.contrib.auth.hashers.MD5PasswordHasher'],
+    'PASSWORD_HASH_WORKERS': 0,
+    'SECURE_SSL_REDIRECT': False,
+    # 요청 로그가 테스트 출력에 섞이지 않도록
+    'PROFILING_ENABLED': False,
+}
+
+
+class QueryCounter:
+    """모든 스레드의 DB 연결에서 실행된 쿼리 수 (비동기 뷰의 스레드 풀 포함)"""
+
+    def __init__(self):
+        self.count = 0
+        self.active = False
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.active:
+            with self._lock:
+                self.count += 1
+        return execute(sql, params, many, context)
+
+    def install(self, connection):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def __enter__(self):
+        for connection in connections.all():
+            self.install(connection)
+        self.count = 0
+        self.active = True
+        return self
+
+    def __exit__(self, *exc_info):
+        self.active = False
+
+
+query_counter = QueryCounter()
+
+
+def _install_counter(sender, connection, **kwargs):
+    query_counter.install(connection)
+
+
+connection_created.connect(_install_counter)
+
+
+def covers(*url_names):
+    """테스트가 확인하는 URL 이름을 등록하는 데코레이터"""
+    COVERED_URLS.update(url_names)
+    return lambda test: test
+
+
+def url_names(module):
+    """urls 모듈의 모든 URL 이름"""
+    return {pattern.name for pattern in import_module(module).urlpatterns}
+
+
+def create_ledger(email, transactions=LEDGER_TRANSACTIONS):
+    """카테고리 9개, 거래 transactions 개, 이번 달 예산 4개(전체 1, 카테고리 3)를 가진 사용자"""
+    user, = create_users([email], make_password(PASSWORD))
+    categories = seed_ledger(user, transactions)
+
+    start = date.today().replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    Budget.objects.create(user=user, name='이번 달 전체', amount=Decimal('3000000'), start_date=start, end_date=end)
+    for category in categories['expense'][:3]:
+        Budget.objects.create(
+            user=user, name=f'{category.name} 예산', amount=Decimal('300000'),
+            category=category, start_date=start, end_date=end,
+        )
+    return user, categories
+
+
+def load_baseline():
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())
+
+
+def save_baseline(measurements):
+    baseline = load_baseline()
+    baseline.update(measurements)
+    BASELINE_PATH.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + '\n')
+
+
+class EndpointPerformanceMixin:
+    """check() 로 엔드포인트의 쿼리 수와 응답 시간을 확인하는 TestCase 믹스인"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.baseline = load_baseline()
+        cls.measurements = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if UPDATE_BASELINE and cls.measurements:
+            save_baseline(cls.measurements)
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        user_cache.clear()
+
+    def authenticate(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def check(self, key, call, max_queries, status=200, setup=None):
+        """call() 의 응답 코드와 쿼리 수를 확인하고 PERF_CHECK_TIMINGS=1 이면 응답 시간 중앙값을 기준과 비교
+
+        setup 이 있으면 매 실행 전에 호출해서 그 반환값을 call 의 인자로 넘긴다.
+        (삭제처럼 같은 요청을 반복할 수 없는 경우)
+        """
+        def request(args):
+            started = time.perf_counter()
+            response = call(*args)
+            if hasattr(response, 'streaming_content'):
+                b''.join(response.streaming_content)
+            return response, (time.perf_counter() - started) * 1000
+
+        args = setup() if setup else ()
+        with query_counter as counter:
+            response, _ = request(args)
+        self.assertEqual(response.status_code, status, getattr(response, 'data', None))
+        self.assertLessEqual(
+            counter.count, max_queries, f'{key}: 쿼리 {counter.count}개 (최대 {max_queries}개)'
+        )
+
+        if not (CHECK_TIMINGS or UPDATE_BASELINE):
+            return response
+
+        median = statistics.median(request(setup() if setup else ())[1] for _ in range(RUNS))
+        self.measurements[key] = {'median_ms': round(median, 2), 'queries': counter.count}
+        expected = self.baseline.get(key)
+        if CHECK_TIMINGS and not UPDATE_BASELINE and expected:
+            limit = max(expected['median_ms'] * TOLERANCE, expected['median_ms'] + MIN_DELTA_MS)
+            self.assertLessEqual(
+                median, limit,
+                f'{key}: {median:.2f}ms (기준 {expected["median_ms"]:.2f}ms, 허용 {limit:.2f}ms)'
+            )
+        return response
+
+
+@override_settings(**TEST_SETTINGS)
+class EndpointPerformanceTestCase(EndpointPerformanceMixin, TestCase):
+    """동기 뷰용 (테스트마다 롤백)"""
+
+
+@override_settings(**TEST_SETTINGS)
+class AsyncEndpointPerformanceTestCase(EndpointPerformanceMixin, TransactionTestCase):
+    """비동기 뷰용 (스레드 풀의 다른 DB 연결에서도 보이도록 테스트 데이터를 커밋)"""
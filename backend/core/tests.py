@@ -0,0 +1,258 @@
+import json
+import re
+import threading
+import time
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from prometheus_client.parser import text_string_to_metric_families
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.testing import TEST_SETTINGS, create_ledger
+from transactions.models import Transaction
+from transactions.seeding import create_users
+
+from .aio import run_in_pool
+from .cache import bump_data_version, get_data_version
+from .authentication import user_cache
+from .db_router import ReplicaRoutingMiddleware, is_pinned, use_read_replica
+from .profiling import RequestMetrics, RequestProfilingMiddleware, current_metrics, measure
+
+
+@override_settings(**TEST_SETTINGS, METRICS_TOKEN='secret')
+class MetricsEndpointTests(TestCase):
+    """/metrics 가 여러 프로세스의 값 파일을 합쳐 Prometheus 형식으로 응답하는지"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, _ = create_ledger('metrics@example.com', transactions=20)
+
+    def setUp(self):
+        user_cache.clear()
+
+    def scrape(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        return {
+            (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+            for family in text_string_to_metric_families(response.content.decode())
+            for sample in family.samples
+        }
+
+    def test_request_metrics(self):
+        requests = ('http_requests_total', (('method', 'GET'), ('status', '200'), ('view', 'dashboard')))
+        queries = ('http_request_db_queries_count', (('method', 'GET'), ('view', 'dashboard')))
+        before = self.scrape()
+
+        authorization = f'Bearer {AccessToken.for_user(self.user)}'
+        for _ in range(3):
+            self.assertEqual(self.client.get('/api/dashboard/', HTTP_AUTHORIZATION=authorization).status_code, 200)
+        after = self.scrape()
+
+        self.assertEqual(after[requests] - before.get(requests, 0), 3)
+        self.assertEqual(after[queries] - before.get(queries, 0), 3)
+        self.assertGreaterEqual(after[('active_users', (('window', '5m'),))], 1)
+        self.assertIn(('cache_hit_ratio', (('cache', 'auth_user'),)), after)
+
+    def test_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+        # 토큰을 설정하지 않았으면 DEBUG 에서만 응답
+        with self.settings(METRICS_TOKEN=''):
+            self.assertEqual(self.client.get('/metrics').status_code, 404)
+            with self.settings(DEBUG=True):
+                self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+
+@api_view(['GET', 'POST'])
+@use_read_replica
+def routing_probe(request):
+    """읽기가 라우팅되는 DB 목록 (write 를 주면 중간에 쓰기를 한 번 함)"""
+    reads = [router.db_for_read(Transaction)]
+    if request.method == 'POST' or 'write' in request.query_params:
+        router.db_for_write(Transaction)
+        reads.append(router.db_for_read(Transaction))
+    return Response(reads)
+
+
+@override_settings(
+    **TEST_SETTINGS, REPLICA_DATABASES=['replica1'], DATABASE_ROUTERS=['core.db_router.ReplicaRouter'],
+)
+class ReplicaRoutingTests(TestCase):
+    """use_read_replica 뷰의 읽기는 복제본으로, 쓴 뒤의 읽기와 최근에 쓴 사용자의 읽기는 주 DB 로"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, = create_users(['replica@example.com'])
+
+    def setUp(self):
+        cache.clear()
+        self.view = ReplicaRoutingMiddleware(routing_probe)
+
+    def request(self, method, data=None):
+        request = getattr(APIRequestFactory(), method)('/', data)
+        force_authenticate(request, self.user)
+        response = self.view(request)
+        response.render()
+        return response.data
+
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.request('get'), ['replica1'])
+        # 라우팅 상태는 요청 안에서만
+        self.assertEqual(router.db_for_read(Transaction), 'default')
+        self.assertFalse(is_pinned(self.user.pk))
+
+    def test_write_sticks_to_primary(self):
+        self.assertEqual(self.request('get', {'write': 1}), ['replica1', 'default'])
+
+    def test_writer_is_pinned(self):
+        # POST 는 복제본을 쓰지 않고, 쓴 사용자는 REPLICA_PIN_SECONDS 동안 주 DB 에서 읽음
+        self.assertEqual(self.request('post'), ['default', 'default'])
+        self.assertTrue(is_pinned(self.user.pk))
+        self.assertEqual(self.request('get'), ['default'])
+
+        cache.clear()
+        self.assertEqual(self.request('get'), ['replica1'])
+
+
+@override_settings(**{**TEST_SETTINGS, 'PROFILING_ENABLED': True, 'PROFILING_SERVER_TIMING': False})
+class RequestProfilingTests(TestCase):
+    """요청 로그/느린 쿼리 로그는 응답을 닫을 때, 스트리밍 본문의 쿼리까지 포함해 남기는지"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, _ = create_ledger('profiling@example.com', transactions=20)
+
+    def setUp(self):
+        user_cache.clear()
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {AccessToken.for_user(self.user)}'
+
+    def records(self, logs):
+        return [json.loads(record.getMessage()) for record in logs.records]
+
+    def test_server_timing_setting(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/dashboard/'))
+        with self.settings(PROFILING_SERVER_TIMING=True):
+            self.assertIn('Server-Timing', self.client.get('/api/dashboard/'))
+
+    def test_streaming_queries_counted(self):
+        with self.assertLogs('core.profiling', 'INFO') as logs, CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/transactions/export/', {'export_format': 'csv'})
+            b''.join(response.streaming_content)
+        record, = self.records(logs)
+        self.assertEqual(record['db_queries'], len(queries))
+
+    @override_settings(PROFILING_SLOW_QUERY_MS=0.0001)
+    def test_slow_query_logged_after_response(self):
+        def view(request):
+            list(get_user_model().objects.all())
+            return HttpResponse()
+
+        with self.assertLogs('core.profiling', 'INFO') as logs:
+            response = RequestProfilingMiddleware(view)(RequestFactory().get('/'))
+            self.assertEqual(logs.records, [])
+            response.close()
+        request, slow = self.records(logs)
+        self.assertEqual((request['event'], slow['event']), ('request', 'slow_query'))
+        self.assertIsNotNone(slow['plan'])
+
+
+class NextMonth(date):
+    @classmethod
+    def today(cls):
+        return date.today() + timedelta(days=31)
+
+
+@override_settings(**{**TEST_SETTINGS, 'RESPONSE_CACHE_TIMEOUT': 60})
+class ResponseCacheTests(TestCase):
+    """데이터가 그대로여도 날짜(이번 달)가 바뀌면 캐시된 대시보드를 쓰지 않는지"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, _ = create_ledger('response-cache@example.com', transactions=20)
+
+    def setUp(self):
+        cache.clear()
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {AccessToken.for_user(self.user)}'
+
+    def test_month_rollover(self):
+        self.assertEqual(self.client.get('/api/dashboard/')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/dashboard/')['X-Cache'], 'HIT')
+        with mock.patch('core.cache.date', NextMonth):
+            self.assertEqual(self.client.get('/api/dashboard/')['X-Cache'], 'MISS')
+
+    def test_version_key_expires(self):
+        version = get_data_version(self.user.pk)
+        bump_data_version(self.user.pk)
+        self.assertGreater(get_data_version(self.user.pk), version)
+
+        # 버전 키도 만료되고, 다시 만들어진 버전은 이전 번호보다 큼
+        latest = get_data_version(self.user.pk)
+        later = time.time() + 121
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            self.assertIsNone(cache.get(f'data-version:{self.user.pk}'))
+            self.assertGreater(get_data_version(self.user.pk), latest)
+
+
+@override_settings(**{
+    **TEST_SETTINGS, 'PROFILING_ENABLED': True, 'PROFILING_SERVER_TIMING': True, 'RESPONSE_CACHE_TIMEOUT': 60,
+})
+class AsyncRequestContextTests(TransactionTestCase):
+    """비동기 뷰가 스레드 풀의 쿼리까지 측정하고 동기 뷰와 같은 캐시/조건부 GET 을 쓰는지"""
+
+    def setUp(self):
+        user_cache.clear()
+        self.user, _ = create_ledger('async-context@example.com', transactions=20)
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    def queries(self, response):
+        return int(re.search(r'desc="(\d+) queries"', response['Server-Timing']).group(1))
+
+    async def test_pool_queries_are_measured(self):
+        def pool_connection():
+            return current_metrics(), id(connections['default']), threading.get_ident()
+
+        with measure(RequestMetrics()) as metrics:
+            pool_metrics, pool_connection_id, pool_thread = await run_in_pool(pool_connection)
+        # 컨텍스트는 복사되지만 DB 연결은 풀 스레드의 것을 씀
+        self.assertIs(pool_metrics, metrics)
+        self.assertNotEqual(pool_thread, threading.get_ident())
+        self.assertNotEqual(pool_connection_id, id(connections['default']))
+
+        response = await self.async_client.get('/api/async/stats/', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertGreater(self.queries(response), 2)
+
+    async def test_cache_and_etag_shared_with_sync_view(self):
+        response = await self.async_client.get('/api/async/dashboard/', headers=self.headers)
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+        synchronous = await self.async_client.get('/api/dashboard/', headers=self.headers)
+        self.assertEqual(synchronous['X-Cache'], 'HIT')
+        self.assertEqual(synchronous['ETag'], response['ETag'])
+
+        not_modified = await self.async_client.get(
+            '/api/async/dashboard/', headers={**self.headers, 'If-None-Match': response['ETag']},
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+        # 예산 요약은 응답 캐시 없이 ETag 만 공유
+        summary = await self.async_client.get('/api/async/budgets/summary/', headers=self.headers)
+        self.assertEqual(summary.status_code, 200)
+        synchronous = await self.async_client.get('/api/budgets/summary/', headers=self.headers)
+        self.assertEqual(synchronous['ETag'], summary['ETag'])
+        for url in ['/api/async/budgets/summary/', '/api/budgets/summary/']:
+            not_modified = await self.async_client.get(
+                url, headers={**self.headers, 'If-None-Match': summary['ETag']},
+            )
+            self.assertEqual(not_modified.status_code, 304, url)
@@ -0,0 +1,59 @@
+"""gunicorn 설정 (Procfile 에서 사용)
+
+WEB_CONCURRENCY: 워커 프로세스 수, GUNICORN_THREADS: 워커당 스레드 수
+지속 연결(DB_CONNECTION_MODE=persistent/pgbouncer)에서는 스레드마다 DB 연결을 하나씩
+유지하므로 DB 연결 수는 최대 워커 수 x 스레드 수가 된다.
+워커들의 지표(core.metrics)는 PROMETHEUS_MULTIPROC_DIR 의 파일로 합산한다.
+"""
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+worker_class = 'gthread' if threads > 1 else 'sync'
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'False').lower() in ('true', '1', 'yes')
+errorlog = '-'
+
+
+def _close_db_connections():
+    from django.conf import settings
+
+    # 앱을 불러오기 전(preload_app=False)에는 연 연결이 없다
+    if not settings.configured:
+        return
+    from django.db import connections
+
+    connections.close_all()
+
+
+def on_starting(server):
+    # 워커들이 같은 지표 디렉터리를 쓰도록 마스터에서 환경 변수로 지정하고 이전 실행의 파일을 지움
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    from django.conf import settings
+
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR') or settings.METRICS_DIR or os.path.join(
+        tempfile.gettempdir(), 'budget-tracker-metrics',
+    )
+    os.makedirs(directory, exist_ok=True)
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = directory
+    for name in os.listdir(directory):
+        if name.endswith(('.db', '.json')):
+            os.remove(os.path.join(directory, name))
+
+
+def pre_fork(server, worker):
+    # 마스터가 앱을 불러오며 연 연결을 워커들이 소켓째 물려받아 함께 쓰지 않도록 fork 전에 닫는다
+    _close_db_connections()
+
+
+def post_fork(server, worker):
+    # 워커는 물려받은 연결 상태 없이 시작해서 처음 쿼리할 때 자신의 연결을 연다
+    _close_db_connections()
+
+
+def child_exit(server, worker):
+    # 종료된 워커의 진행 중 요청 수(livesum) 파일 정리
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,27 @@
+from django.contrib import admin
+from core.db_router import ReplicaChangeListMixin
+from .models import Change, SyncState
+
+
+@admin.register(Change)
+class ChangeAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    """변경 기록 관리자 (조회 전용)"""
+    list_display = ('seq', 'user', 'model', 'object_id', 'deleted', 'changed_at')
+    list_filter = ('model', 'deleted', 'changed_at')
+    search_fields = ('user__email',)
+    list_select_related = ('user',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SyncState)
+class SyncStateAdmin(admin.ModelAdmin):
+    """사용자별 동기화 상태 관리자"""
+    list_display = ('user', 'last_seq', 'compacted_seq')
+    search_fields = ('user__email',)
+    list_select_related = ('user',)
+    readonly_fields = ('last_seq', 'compacted_seq')
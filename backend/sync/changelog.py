@@ -0,0 +1,165 @@
+"""변경 기록(Change) 작성과 조회
+
+변경 번호는 사용자별 SyncState 행을 잠근 채 발급하고 같은 트랜잭션에서 기록을
+쓰므로, 어떤 번호가 보이는 시점에는 그보다 작은 번호도 모두 커밋되어 있다.
+따라서 클라이언트는 마지막으로 받은 번호만 커서로 보관하면 된다.
+"""
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, Max, OuterRef
+from django.utils import timezone
+
+from .models import Change, SyncState
+
+_local = threading.local()
+
+
+def _pending():
+    return getattr(_local, 'pending', None)
+
+
+def _deleting_users():
+    if not hasattr(_local, 'deleting_users'):
+        _local.deleting_users = set()
+    return _local.deleting_users
+
+
+@contextmanager
+def deferred():
+    """블록 안에서 발생한 변경 기록을 모아 두었다가 끝날 때 사용자별로 한 번에 기록
+
+    queryset.delete() 처럼 행마다 post_delete 가 발생하는 작업을 감싸면
+    행마다 번호를 발급하는 대신 bulk_create 한 번으로 끝난다.
+    """
+    if _pending() is not None:
+        yield
+        return
+
+    _local.pending = []
+    try:
+        yield
+        entries = _local.pending
+    finally:
+        _local.pending = None
+    _write(entries)
+
+
+def mark_user_deleting(user_id):
+    """사용자 삭제 중 CASCADE 로 지워지는 객체는 기록하지 않음 (기록도 함께 삭제됨)"""
+    _deleting_users().add(user_id)
+
+
+def unmark_user_deleting(user_id):
+    _deleting_users().discard(user_id)
+
+
+def reset_user_deleting():
+    # 삭제가 예외로 중단되면 post_delete 가 오지 않으므로 요청이 끝날 때 비움
+    _deleting_users().clear()
+
+
+def record(model, instances, deleted=False):
+    """객체들의 변경(또는 삭제)을 기록"""
+    deleting = _deleting_users()
+    entries = [
+        (instance.user_id, model, instance.pk, deleted)
+        for instance in instances
+        if instance.user_id is not None and instance.user_id not in deleting
+    ]
+    if not entries:
+        return
+    pending = _pending()
+    if pending is not None:
+        pending.extend(entries)
+    else:
+        _write(entries)
+
+
+def _allocate(user_id, count):
+    """user_id 의 변경 번호 count 개를 발급하고 첫 번호를 반환 (트랜잭션 안에서 호출)"""
+    states = SyncState.objects.filter(user_id=user_id)
+    if not states.update(last_seq=F('last_seq') + count):
+        try:
+            with transaction.atomic():
+                SyncState.objects.create(user_id=user_id, last_seq=count)
+            return 1
+        except IntegrityError:
+            # 동시에 다른 요청이 상태 행을 만든 경우
+            states.update(last_seq=F('last_seq') + count)
+    return states.values_list('last_seq', flat=True).get() - count + 1
+
+
+def _write(entries):
+    by_user = {}
+    for user_id, model, object_id, deleted in entries:
+        by_user.setdefault(user_id, []).append((model, object_id, deleted))
+
+    for user_id, changes in sorted(by_user.items()):
+        # 번호 발급과 기록을 한 트랜잭션으로 묶어야 커밋 순서가 번호 순서와 같아짐
+        with transaction.atomic():
+            first = _allocate(user_id, len(changes))
+            Change.objects.bulk_create(
+                [
+                    Change(user_id=user_id, seq=first + offset, model=model, object_id=object_id, deleted=deleted)
+                    for offset, (model, object_id, deleted) in enumerate(changes)
+                ],
+                batch_size=500,
+            )
+
+
+def changes_since(user, since, limit):
+    """since 이후의 변경을 번호 순으로 최대 limit 개 조회
+
+    (객체별 마지막 변경 dict, 다음 커서, 더 있는지 여부) 를 반환한다.
+    """
+    rows = list(
+        Change.objects.filter(user=user, seq__gt=since).order_by('seq').values_list(
+            'seq', 'model', 'object_id', 'deleted'
+        )[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    latest = {}
+    for seq, model, object_id, deleted in rows:
+        latest[(model, object_id)] = deleted
+    cursor = rows[-1][0] if rows else since
+    return latest, cursor, has_more
+
+
+def compaction_watermark(user):
+    """이 번호보다 오래된 커서는 삭제 기록이 압축되어 전체 재동기화가 필요"""
+    return SyncState.objects.filter(user=user).values_list('compacted_seq', flat=True).first() or 0
+
+
+def compact(retention_days, dry_run=False):
+    """같은 객체의 이전 기록과 보관 기간이 지난 삭제 기록을 정리
+
+    이전 기록은 더 최근 기록이 있으므로 언제 지워도 클라이언트에 영향이 없다.
+    삭제 기록을 지우면 사용자의 compacted_seq 를 올려 그보다 오래된 커서를
+    가진 클라이언트가 전체 재동기화하도록 한다.
+    (정리한 이전 기록 수, 정리한 삭제 기록 수) 를 반환한다.
+    """
+    newer = Change.objects.filter(
+        user=OuterRef('user'), model=OuterRef('model'), object_id=OuterRef('object_id'), seq__gt=OuterRef('seq')
+    )
+    superseded = Change.objects.filter(Exists(newer))
+    expired = Change.objects.filter(
+        deleted=True, changed_at__lt=timezone.now() - timedelta(days=retention_days)
+    ).exclude(Exists(newer))
+
+    if dry_run:
+        return superseded.count(), expired.count()
+
+    with transaction.atomic():
+        superseded_count, _ = superseded.delete()
+        watermarks = expired.order_by().values('user').annotate(seq=Max('seq'))
+        for row in watermarks:
+            SyncState.objects.filter(user_id=row['user'], compacted_seq__lt=row['seq']).update(
+                compacted_seq=row['seq']
+            )
+        expired_count, _ = expired.delete()
+    return superseded_count, expired_count
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from sync import changelog
+
+
+class Command(BaseCommand):
+    help = '동기화 변경 기록에서 같은 객체의 이전 기록과 보관 기간이 지난 삭제 기록을 정리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.SYNC_TOMBSTONE_RETENTION_DAYS,
+                            help='삭제 기록 보관 기간(일)')
+        parser.add_argument('--dry-run', action='store_true', help='지우지 않고 대상 수만 출력')
+
+    def handle(self, *args, **options):
+        superseded, expired = changelog.compact(options['days'], dry_run=options['dry_run'])
+        action = '정리 대상' if options['dry_run'] else '정리'
+        self.stdout.write(self.style.SUCCESS(
+            f'이전 변경 기록 {superseded}개, {options["days"]}일이 지난 삭제 기록 {expired}개 {action}'
+        ))
@@ -0,0 +1,135 @@
+# Generated by Django 4.2 on 2026-10-17 04:06
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def record_existing_objects(apps, schema_editor):
+    # 기존 거래/카테고리/예산을 사용자별 변경 기록으로 남겨 since=0 동기화에 포함
+    Change = apps.get_model("sync", "Change")
+    SyncState = apps.get_model("sync", "SyncState")
+    sources = [
+        ("category", apps.get_model("transactions", "Category")),
+        ("transaction", apps.get_model("transactions", "Transaction")),
+        ("budget", apps.get_model("budgets", "Budget")),
+    ]
+
+    last_seq = {}
+    batch = []
+    for name, model in sources:
+        rows = model.objects.order_by("user_id", "pk").values_list("user_id", "pk")
+        for user_id, object_id in rows.iterator(chunk_size=2000):
+            seq = last_seq[user_id] = last_seq.get(user_id, 0) + 1
+            batch.append(
+                Change(user_id=user_id, seq=seq, model=name, object_id=object_id)
+            )
+            if len(batch) >= 2000:
+                Change.objects.bulk_create(batch)
+                batch = []
+    Change.objects.bulk_create(batch)
+    SyncState.objects.bulk_create(
+        [SyncState(user_id=user_id, last_seq=seq) for user_id, seq in last_seq.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("transactions", "0005_category_updated_at"),
+        ("budgets", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncState",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="sync_state",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("last_seq", models.BigIntegerField(default=0)),
+                ("compacted_seq", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "동기화 상태",
+                "verbose_name_plural": "동기화 상태",
+            },
+        ),
+        migrations.CreateModel(
+            name="Change",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("seq", models.BigIntegerField(verbose_name="변경 번호")),
+                (
+                    "model",
+                    models.CharField(
+                        choices=[
+                            ("transaction", "거래 내역"),
+                            ("category", "카테고리"),
+                            ("budget", "예산"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                (
+                    "deleted",
+                    models.BooleanField(default=False, verbose_name="삭제 여부"),
+                ),
+                ("changed_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="changes",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "변경 기록",
+                "verbose_name_plural": "변경 기록",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="change",
+            index=models.Index(
+                fields=["user", "model", "object_id", "seq"],
+                name="sync_change_object_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="change",
+            index=models.Index(
+                fields=["deleted", "changed_at"], name="sync_change_deleted_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="change",
+            constraint=models.UniqueConstraint(
+                fields=("user", "seq"), name="sync_change_user_seq_uniq"
+            ),
+        ),
+        migrations.RunPython(record_existing_objects, migrations.RunPython.noop),
+    ]
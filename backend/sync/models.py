@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.db import models
+
+
+class SyncState(models.Model):
+    """사용자별 변경 번호 카운터와 압축 기준점"""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='sync_state'
+    )
+    # 마지막으로 발급한 변경 번호 (이 행을 잠그고 증가시키므로 사용자별로 커밋 순서와 일치)
+    last_seq = models.BigIntegerField(default=0)
+    # 이 번호 이하의 삭제 기록은 압축으로 지워졌음 (이보다 오래된 커서는 전체 재동기화 필요)
+    compacted_seq = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "동기화 상태"
+        verbose_name_plural = "동기화 상태"
+
+
+class Change(models.Model):
+    """거래/카테고리/예산의 생성·수정·삭제 기록"""
+    MODEL_CHOICES = [
+        ('transaction', '거래 내역'),
+        ('category', '카테고리'),
+        ('budget', '예산'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='changes', db_index=False
+    )
+    seq = models.BigIntegerField(verbose_name="변경 번호")
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False, verbose_name="삭제 여부")
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "변경 기록"
+        verbose_name_plural = "변경 기록"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'seq'], name='sync_change_user_seq_uniq'),
+        ]
+        indexes = [
+            # 압축 시 같은 객체의 이전 기록 찾기
+            models.Index(fields=['user', 'model', 'object_id', 'seq'], name='sync_change_object_idx'),
+            # 오래된 삭제 기록 정리
+            models.Index(fields=['deleted', 'changed_at'], name='sync_change_deleted_idx'),
+        ]
+
+    def __str__(self):
+        action = '삭제' if self.deleted else '변경'
+        return f"#{self.seq} {self.model} {self.object_id} {action}"
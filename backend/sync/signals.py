@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from budgets.models import Budget
+from transactions.models import Category, Transaction
+from transactions.signals import transactions_bulk_created, transactions_bulk_updated
+
+from . import changelog
+
+MODEL_NAMES = {Transaction: 'transaction', Category: 'category', Budget: 'budget'}
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Budget)
+def record_change_on_save(sender, instance, raw, **kwargs):
+    """생성/수정 기록"""
+    if raw:
+        return
+    changelog.record(MODEL_NAMES[sender], [instance])
+
+
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Budget)
+def record_change_on_delete(sender, instance, **kwargs):
+    """삭제 기록 (카테고리 삭제로 CASCADE 되는 거래/예산 포함)"""
+    changelog.record(MODEL_NAMES[sender], [instance], deleted=True)
+
+
+@receiver(transactions_bulk_created, sender=Transaction)
+@receiver(transactions_bulk_updated, sender=Transaction)
+def record_changes_on_bulk(sender, created=(), updated=(), **kwargs):
+    instances = list(created) + [instance for _, instance in updated]
+    changelog.record('transaction', instances)
+
+
+@receiver(pre_delete, sender=get_user_model())
+def skip_changes_of_deleted_user(sender, instance, **kwargs):
+    changelog.mark_user_deleting(instance.pk)
+
+
+@receiver(post_delete, sender=get_user_model())
+def resume_changes_of_deleted_user(sender, instance, **kwargs):
+    changelog.unmark_user_deleting(instance.pk)
+
+
+@receiver(request_finished)
+def reset_deleted_users(sender, **kwargs):
+    changelog.reset_user_deleting()
@@ -0,0 +1,166 @@
+import io
+from datetime import date, timedelta
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from core.testing import COVERED_URLS, EndpointPerformanceTestCase, covers, create_ledger, url_names
+from transactions.models import Category, Transaction
+
+from . import changelog
+from .models import Change, SyncState
+
+
+class SyncEndpointTests(EndpointPerformanceTestCase):
+    """sync.urls 엔드포인트의 쿼리 수 / 응답 시간과 커서, 삭제 기록, 재동기화 동작"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.categories = create_ledger('sync-perf@example.com', transactions=50)
+        cls.other, _ = create_ledger('sync-other@example.com', transactions=5)
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.authenticate(self.user)
+
+    def changes(self, since=0, **params):
+        response = self.client.get('/api/sync/changes/', {'since': since, **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.json()
+
+    def sync_all(self, since=0, limit=None):
+        """has_more 가 false 가 될 때까지 받은 페이지 목록"""
+        pages = []
+        while True:
+            data = self.changes(since, **({'limit': limit} if limit else {}))
+            pages.append(data)
+            since = data['cursor']
+            if not data['has_more']:
+                return pages
+
+    def new_transaction(self, **fields):
+        return Transaction.objects.create(**{
+            'user': self.user, 'category': self.categories['expense'][0], 'type': 'expense',
+            'title': '점심', 'amount': 9000, 'date': date.today(), **fields,
+        })
+
+    @covers('sync-changes')
+    def test_sync_changes(self):
+        # 변경 수와 관계없이 모델별 조회 한 번씩
+        self.check('sync:sync-changes GET', lambda: self.client.get('/api/sync/changes/'), max_queries=6)
+        cursor = self.changes()['cursor']
+        self.check(
+            'sync:sync-changes GET since', lambda: self.client.get('/api/sync/changes/', {'since': cursor}),
+            max_queries=3,
+        )
+
+    def test_invalid_params(self):
+        for params in [{'since': 'abc'}, {'limit': 'x'}, {'since': -1}, {'limit': 0}]:
+            response = self.client.get('/api/sync/changes/', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('error', response.json())
+
+    def test_cursor_monotonic(self):
+        first = self.changes()
+        self.assertGreater(first['cursor'], 0)
+        self.assertEqual(
+            {row['id'] for row in first['transactions']},
+            set(Transaction.objects.filter(user=self.user).values_list('id', flat=True)),
+        )
+        # 다른 사용자의 변경은 보이지 않음
+        self.assertFalse(Category.objects.filter(user=self.other, id__in=[
+            row['id'] for row in first['categories']
+        ]).exists())
+
+        # 변경이 없으면 커서가 그대로
+        self.assertEqual(self.changes(first['cursor'])['cursor'], first['cursor'])
+
+        created = self.new_transaction()
+        second = self.changes(first['cursor'])
+        self.assertGreater(second['cursor'], first['cursor'])
+        self.assertEqual([row['id'] for row in second['transactions']], [created.id])
+
+        created.amount = 12000
+        created.save()
+        third = self.changes(second['cursor'])
+        self.assertGreater(third['cursor'], second['cursor'])
+        self.assertEqual(third['transactions'][0]['amount'], '12000.00')
+
+        seqs = list(Change.objects.filter(user=self.user).order_by('seq').values_list('seq', flat=True))
+        self.assertEqual(seqs, list(range(1, len(seqs) + 1)))
+        self.assertEqual(SyncState.objects.get(user=self.user).last_seq, seqs[-1])
+
+    def test_deleted_tombstones(self):
+        cursor = self.changes()['cursor']
+
+        deleted = self.new_transaction()
+        response = self.client.delete(f'/api/transactions/{deleted.id}/')
+        self.assertEqual(response.status_code, 204)
+        data = self.changes(cursor)
+        # 생성 후 삭제되었으므로 삭제 기록만 내려감
+        self.assertEqual(data['deleted']['transactions'], [deleted.id])
+        self.assertEqual(data['transactions'], [])
+        cursor = data['cursor']
+
+        # 카테고리 삭제로 CASCADE 되는 거래/예산도 삭제 기록이 남음
+        category = self.categories['expense'][0]
+        transaction_ids = sorted(category.transactions.values_list('id', flat=True))
+        budget_ids = sorted(category.budgets.values_list('id', flat=True))
+        self.assertTrue(transaction_ids)
+        self.assertTrue(budget_ids)
+        response = self.client.delete(f'/api/categories/{category.id}/')
+        self.assertEqual(response.status_code, 204)
+        data = self.changes(cursor)
+        self.assertEqual(data['deleted']['categories'], [category.id])
+        self.assertEqual(data['deleted']['transactions'], transaction_ids)
+        self.assertEqual(data['deleted']['budgets'], budget_ids)
+
+    def test_has_more_paging(self):
+        pages = self.sync_all(limit=7)
+        self.assertGreater(len(pages), 1)
+        self.assertTrue(all(page['has_more'] for page in pages[:-1]))
+        cursors = [page['cursor'] for page in pages]
+        self.assertEqual(cursors, sorted(set(cursors)))
+
+        received = set()
+        for page in pages:
+            received.update(row['id'] for row in page['transactions'])
+        self.assertEqual(received, set(Transaction.objects.filter(user=self.user).values_list('id', flat=True)))
+
+        # 페이지 사이의 변경은 다음 페이지로 이어짐
+        first = self.changes(limit=7)
+        created = self.new_transaction()
+        rest = self.sync_all(first['cursor'], limit=1000)
+        self.assertIn(created.id, {row['id'] for page in rest for row in page['transactions']})
+
+    @override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=30)
+    def test_reset_required_after_compaction(self):
+        cursor = self.changes()['cursor']
+        deleted = self.new_transaction()
+        deleted.delete()
+        after_delete = self.changes(cursor)['cursor']
+        Change.objects.filter(user=self.user, deleted=True).update(
+            changed_at=timezone.now() - timedelta(days=31)
+        )
+
+        call_command('compact_changes', stdout=io.StringIO())
+        self.assertFalse(Change.objects.filter(user=self.user, deleted=True).exists())
+        self.assertEqual(changelog.compaction_watermark(self.user), after_delete)
+
+        # 압축된 삭제 기록보다 오래된 커서는 처음부터 다시 받아야 함
+        data = self.changes(cursor)
+        self.assertTrue(data['reset_required'])
+        self.assertEqual(data['cursor'], 0)
+        self.assertEqual(data['transactions'], [])
+
+        # 압축 이후의 커서와 처음부터 받는 경우는 그대로 동작
+        self.assertFalse(self.changes(after_delete)['reset_required'])
+        full = self.changes()
+        self.assertFalse(full['reset_required'])
+        self.assertNotIn(deleted.id, {row['id'] for row in full['transactions']})
+        # 다른 사용자는 영향 없음
+        self.assertEqual(changelog.compaction_watermark(self.other), 0)
+
+    def test_all_urls_covered(self):
+        self.assertEqual(url_names('sync.urls') - COVERED_URLS, set())
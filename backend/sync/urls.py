@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('sync/changes/', views.changes, name='sync-changes'),
+]
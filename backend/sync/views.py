@@ -0,0 +1,76 @@
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from budgets.models import Budget
+from budgets.serializers import BudgetSerializer
+from transactions.models import Category, Transaction
+from transactions.serializers import CategorySerializer, TransactionSerializer
+
+from . import changelog
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+# 변경 기록의 model 값 -> (응답 키, 조회 queryset, 시리얼라이저)
+SYNC_MODELS = {
+    'transaction': (
+        'transactions',
+        lambda user: Transaction.objects.filter(user=user).select_related('category'),
+        TransactionSerializer,
+    ),
+    'category': ('categories', lambda user: Category.objects.filter(user=user).with_stats(), CategorySerializer),
+    'budget': (
+        'budgets',
+        lambda user: Budget.objects.filter(user=user).select_related('category').with_snapshot(),
+        BudgetSerializer,
+    ),
+}
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def changes(request):
+    """since 커서 이후 생성/수정된 거래/카테고리/예산과 삭제된 id 목록 조회
+
+    응답의 cursor 를 다음 요청의 since 로 넘긴다. has_more 가 true 면 바로 다시 요청하고,
+    reset_required 가 true 면 로컬 데이터를 비우고 since=0 부터 다시 동기화한다.
+    예산 사용 금액, 카테고리 거래 수처럼 다른 객체로부터 계산되는 값은 해당 객체가
+    변경될 때만 함께 내려가므로 필요하면 목록 API 로 새로 조회한다.
+    """
+    try:
+        since = int(request.query_params.get('since') or 0)
+        limit = min(int(request.query_params.get('limit') or DEFAULT_LIMIT), MAX_LIMIT)
+    except ValueError:
+        return Response({
+            'error': 'since 와 limit 는 정수여야 합니다.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if since < 0 or limit < 1:
+        return Response({
+            'error': 'since 는 0 이상, limit 는 1 이상이어야 합니다.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    user = request.user
+    data = {'cursor': since, 'has_more': False, 'reset_required': False, 'deleted': {}}
+    for key, _, _ in SYNC_MODELS.values():
+        data[key] = []
+        data['deleted'][key] = []
+
+    # 삭제 기록이 압축된 구간을 건너뛰면 삭제를 놓치므로 처음부터 다시 받아야 함
+    if 0 < since < changelog.compaction_watermark(user):
+        data.update(cursor=0, reset_required=True)
+        return Response(data)
+
+    latest, data['cursor'], data['has_more'] = changelog.changes_since(user, since, limit)
+
+    for model, (key, queryset, serializer_class) in SYNC_MODELS.items():
+        changed_ids = [object_id for (name, object_id), deleted in latest.items() if name == model and not deleted]
+        data['deleted'][key] = sorted(
+            object_id for (name, object_id), deleted in latest.items() if name == model and deleted
+        )
+        if changed_ids:
+            # 이후에 삭제된 객체는 다음 페이지의 삭제 기록으로 전달됨
+            objects = queryset(user).filter(id__in=changed_ids).order_by('id')
+            data[key] = serializer_class(objects, many=True, context={'request': request}).data
+
+    return Response(data)
@@ -1,23 +1,29 @@
 from django.contrib import admin
-from .models import Category, Transaction
+from core.db_router import ReplicaChangeListMixin
+from .models import Category, RecurringRule, Transaction
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     """카테고리 관리자"""
     list_display = ('name', 'type', 'user', 'color', 'transaction_count', 'created_at')
     list_filter = ('type', 'created_at')
     search_fields = ('name', 'user__email')
     readonly_fields = ('created_at',)
     
+    def get_queryset(self, request):
+        # 거래 개수를 목록 쿼리 한 번으로 함께 조회
+        return super().get_queryset(request).select_related('user').with_stats()
+
     def transaction_count(self, obj):
         """해당 카테고리의 거래 개수"""
-        return obj.transactions.count()
+        return obj.transaction_count
     transaction_count.short_description = '거래 개수'
+    transaction_count.admin_order_field = 'transaction_count'
 
 
 @admin.register(Transaction)
-class TransactionAdmin(admin.ModelAdmin):
+class TransactionAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     """거래 내역 관리자"""
     list_display = ('title', 'amount', 'type', 'category', 'user', 'date', 'created_at')
     list_filter = ('type', 'category', 'date', 'created_at')
@@ -36,4 +42,14 @@ class TransactionAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    ) 
\ No newline at end of file
+    ) 
+
+
+@admin.register(RecurringRule)
+class RecurringRuleAdmin(admin.ModelAdmin):
+    """반복 거래 규칙 관리자"""
+    list_display = ('title', 'amount', 'type', 'category', 'user', 'frequency', 'interval', 'next_run', 'is_active')
+    list_filter = ('frequency', 'type', 'is_active')
+    search_fields = ('title', 'user__email', 'category__name')
+    list_select_related = ('category', 'user')
+    readonly_fields = ('next_run', 'created_at', 'updated_at')
@@ -0,0 +1,40 @@
+"""ASGI 에서 통계 쿼리를 동시에 실행하는 비동기 뷰
+
+uvicorn 등 ASGI 서버로 실행하면 요청 하나의 독립적인 쿼리들이 DB 스레드 풀에서
+병렬로 실행된다. (WSGI 에서도 동작하지만 이점은 없음)
+"""
+from budgets.models import Budget
+from core.aio import async_api_view, gather_in_pool, json_response
+from core.cache import async_cache_per_user
+from core.conditional import async_conditional_per_user
+from core.db_router import async_use_read_replica
+
+from . import stats
+from .dashboard import assemble_dashboard, dashboard_parts
+from .models import Category, Transaction
+
+
+# 동기 뷰(/api/stats/, /api/dashboard/)와 같은 이름을 써서 ETag 와 응답 캐시를 공유함
+@async_api_view
+@async_use_read_replica
+@async_conditional_per_user('stats', Transaction, Category)
+@async_cache_per_user('stats')
+async def async_transaction_stats(request):
+    """거래 통계 조회 (/api/stats/ 와 같은 응답)"""
+    try:
+        start_date, end_date = stats.parse_period(request.GET)
+    except ValueError as e:
+        return json_response({'error': str(e)}, status=400)
+
+    parts = await gather_in_pool(*((part, request.user.pk, start_date, end_date) for part in stats.STATS_PARTS))
+    return json_response(stats.assemble_stats(*parts))
+
+
+@async_api_view
+@async_use_read_replica
+@async_conditional_per_user('dashboard', Transaction, Category, Budget)
+@async_cache_per_user('dashboard')
+async def async_dashboard(request):
+    """대시보드 조회 (이번 달 통계, 최근 거래, 활성 예산 사용 현황)"""
+    parts = await gather_in_pool(*dashboard_parts(request.user.pk))
+    return json_response(assemble_dashboard(*parts))
@@ -0,0 +1,229 @@
+"""여러 거래를 한 번에 검증/저장하기 위한 도구"""
+from django.core.exceptions import ValidationError
+from django.db import router
+from django.utils import timezone
+
+from budgets import snapshots
+from sync import changelog
+
+from . import rollups
+from .models import Category, Transaction
+from .signals import transactions_bulk_created, transactions_bulk_updated
+
+TYPE_ALIASES = {
+    'income': 'income', '수입': 'income', '입금': 'income',
+    'expense': 'expense', '지출': 'expense', '출금': 'expense',
+}
+
+
+class CategoryCache:
+    """요청 하나 동안 사용자의 카테고리를 한 번만 조회해 재사용"""
+
+    def __init__(self, user):
+        self.by_id = {}
+        self.by_name = {}
+        for category in Category.objects.filter(user=user):
+            self.by_id[category.pk] = category
+            self.by_name[(category.name, category.type)] = category
+
+    def get(self, value, type_=None):
+        """id 또는 (이름, 타입)으로 카테고리를 찾음, 없으면 None"""
+        if value in (None, ''):
+            return None
+        if isinstance(value, Category):
+            return self.by_id.get(value.pk)
+        try:
+            return self.by_id.get(int(value))
+        except (TypeError, ValueError):
+            pass
+        if type_ is None:
+            return None
+        return self.by_name.get((str(value).strip(), type_))
+
+
+def clean_fields(values, categories):
+    """거래 필드 값을 검증/변환해 (정리된 값, 오류) 를 반환
+
+    TransactionSerializer 와 같은 규칙을 적용하되 카테고리는 CategoryCache 에서
+    찾으므로 행마다 쿼리가 발생하지 않는다.
+    """
+    cleaned, errors = {}, {}
+
+    for name in ('title', 'amount', 'date', 'description'):
+        if name not in values:
+            continue
+        field = Transaction._meta.get_field(name)
+        value = values[name]
+        if value is None and name == 'description':
+            value = ''
+        try:
+            cleaned[name] = field.clean(value, None)
+        except ValidationError as e:
+            errors[name] = e.messages
+
+    if 'amount' in cleaned and cleaned['amount'] <= 0:
+        errors['amount'] = ['금액은 0보다 커야 합니다.']
+
+    if 'type' in values:
+        type_ = TYPE_ALIASES.get(str(values['type']).strip().lower())
+        if type_ is None:
+            errors['type'] = ['올바른 거래 타입이 아닙니다.']
+        else:
+            cleaned['type'] = type_
+
+    if 'category' in values:
+        category = categories.get(values['category'], cleaned.get('type'))
+        if category is None:
+            errors['category'] = ['본인의 카테고리만 사용할 수 있습니다.']
+        else:
+            cleaned['category'] = category
+
+    return cleaned, errors
+
+
+def check_category_type(category, type_):
+    """카테고리 타입과 거래 타입이 일치하지 않으면 오류 dict 반환"""
+    if category is not None and type_ and category.type != type_:
+        return {'category': ['카테고리 타입과 거래 타입이 일치하지 않습니다.']}
+    return {}
+
+
+def bulk_create_transactions(transactions, batch_size=500):
+    """거래들을 나눠서 bulk_create 하고 집계/검색 인덱스에 반영
+
+    호출하는 쪽에서 transaction.atomic() 으로 감싸야 부분 저장을 막을 수 있다.
+    """
+    using = router.db_for_write(Transaction)
+    created = Transaction.objects.using(using).bulk_create(transactions, batch_size=batch_size)
+    if created:
+        transactions_bulk_created.send(sender=Transaction, created=created, using=using)
+    return created
+
+
+def bulk_update_transactions(updated, fields, batch_size=500):
+    """(수정 전 값, 수정된 거래) 목록을 bulk_update 하고 집계/검색 인덱스에 반영
+
+    bulk_update 는 auto_now 를 적용하지 않으므로 updated_at 을 직접 채운다.
+    """
+    if not updated:
+        return []
+    using = router.db_for_write(Transaction)
+    now = timezone.now()
+    instances = [instance for _, instance in updated]
+    for instance in instances:
+        instance.updated_at = now
+    Transaction.objects.using(using).bulk_update(
+        instances, sorted(set(fields) | {'updated_at'}), batch_size=batch_size
+    )
+    transactions_bulk_updated.send(sender=Transaction, updated=updated, using=using)
+    return instances
+
+
+def bulk_delete_transactions(queryset):
+    """queryset 의 거래를 한 번의 DELETE 로 지우고 집계/변경 기록은 한 번에 반영"""
+    with rollups.deferred(), changelog.deferred(), snapshots.deferred():
+        deleted, _ = queryset.delete()
+    return deleted
+
+
+REQUIRED_FIELDS = ('title', 'amount', 'type', 'category', 'date')
+EDITABLE_FIELDS = ('title', 'amount', 'type', 'category', 'description', 'date')
+
+
+def validate_batch(user, operations):
+    """생성/수정/삭제 작업 목록을 한 번의 카테고리 조회와 한 번의 거래 조회로 검증
+
+    (작업별 결과 목록, 오류 존재 여부) 를 반환한다. 결과 항목의 instance 에는
+    저장할 거래 객체가, previous 에는 수정 전 집계용 값이 담긴다.
+    """
+    categories = CategoryCache(user)
+    target_ids = set()
+    for operation in operations:
+        if isinstance(operation, dict) and operation.get('op') in ('update', 'delete'):
+            try:
+                target_ids.add(int(operation.get('id')))
+            except (TypeError, ValueError):
+                pass
+    targets = Transaction.objects.filter(user=user, id__in=target_ids).in_bulk()
+
+    results, seen_ids, has_errors = [], set(), False
+    for index, operation in enumerate(operations):
+        result = {'index': index, 'op': None}
+        errors = {}
+        if not isinstance(operation, dict) or operation.get('op') not in ('create', 'update', 'delete'):
+            errors['op'] = ['op 는 create, update, delete 중 하나여야 합니다.']
+        else:
+            result['op'] = operation['op']
+            errors = _validate_operation(user, operation, result, categories, targets, seen_ids)
+
+        if errors:
+            has_errors = True
+            result['errors'] = errors
+        results.append(result)
+    return results, has_errors
+
+
+def _validate_operation(user, operation, result, categories, targets, seen_ids):
+    op = operation['op']
+    data = operation.get('data') or {}
+    if op != 'delete' and not isinstance(data, dict):
+        return {'data': ['data 는 객체여야 합니다.']}
+
+    values = {name: data[name] for name in EDITABLE_FIELDS if name in data}
+    if op == 'create':
+        missing = [name for name in REQUIRED_FIELDS if name not in values]
+        cleaned, errors = clean_fields(values, categories)
+        for name in missing:
+            errors.setdefault(name, ['이 필드는 필수 항목입니다.'])
+        if not errors:
+            errors = check_category_type(cleaned['category'], cleaned['type'])
+        if not errors:
+            result['instance'] = Transaction(user=user, **cleaned)
+        return errors
+
+    try:
+        pk = int(operation.get('id'))
+    except (TypeError, ValueError):
+        return {'id': ['수정/삭제할 거래 id 가 필요합니다.']}
+    target = targets.get(pk)
+    if target is None:
+        return {'id': ['거래 내역을 찾을 수 없습니다.']}
+    if pk in seen_ids:
+        return {'id': ['같은 거래를 한 번에 여러 번 변경할 수 없습니다.']}
+    seen_ids.add(pk)
+    result['id'] = pk
+
+    if op == 'delete':
+        return {}
+
+    cleaned, errors = clean_fields(values, categories)
+    if not errors:
+        category = cleaned.get('category') or categories.by_id.get(target.category_id)
+        errors = check_category_type(category, cleaned.get('type', target.type))
+    if not errors:
+        result['previous'] = rollups.row_for(target)
+        result['fields'] = list(cleaned)
+        for name, value in cleaned.items():
+            setattr(target, name, value)
+        # 응답 직렬화 시 카테고리를 다시 조회하지 않도록 캐시의 객체를 연결
+        target.category = cleaned.get('category') or categories.by_id[target.category_id]
+        result['instance'] = target
+    return errors
+
+
+def apply_batch(results):
+    """검증된 작업들을 bulk_create / bulk_update / 한 번의 DELETE 로 반영
+
+    호출하는 쪽에서 transaction.atomic() 으로 감싸야 한다.
+    """
+    creates = [result['instance'] for result in results if result['op'] == 'create']
+    updates = [(result['previous'], result['instance']) for result in results if result['op'] == 'update']
+    fields = {name for result in results if result['op'] == 'update' for name in result['fields']}
+    delete_ids = [result['id'] for result in results if result['op'] == 'delete']
+
+    # 생성/수정/삭제로 바뀐 예산 스냅샷은 마지막에 한 번에 갱신
+    with snapshots.deferred():
+        bulk_create_transactions(creates)
+        bulk_update_transactions(updates, fields)
+        if delete_ids:
+            bulk_delete_transactions(Transaction.objects.filter(id__in=delete_ids))
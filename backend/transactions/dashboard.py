@@ -0,0 +1,40 @@
+"""대시보드 데이터 (이번 달 통계, 최근 거래, 활성 예산 사용 현황)"""
+from datetime import date
+
+from budgets.summary import budget_summary
+
+from . import stats
+from .models import Transaction
+from .serializers import TransactionSerializer
+
+RECENT_TRANSACTIONS = 5
+
+
+def recent_transactions(user_id, limit=RECENT_TRANSACTIONS):
+    """최근 거래 limit 개 (카테고리 포함 쿼리 한 번)"""
+    transactions = Transaction.objects.filter(user_id=user_id).select_related('category')[:limit]
+    return TransactionSerializer(transactions, many=True).data
+
+
+def dashboard_parts(user_id):
+    """대시보드를 이루는 서로 독립적인 계산들 (함수, 인자, ...)"""
+    today = date.today()
+    period = (user_id, today.replace(day=1), today)
+    return [
+        *((part, *period) for part in stats.STATS_PARTS),
+        (recent_transactions, user_id),
+        (budget_summary, user_id),
+    ]
+
+
+def assemble_dashboard(totals, category_stats, monthly_stats, recent, budgets):
+    return {
+        'stats': stats.assemble_stats(totals, category_stats, monthly_stats),
+        'recent_transactions': recent,
+        'budgets': budgets,
+    }
+
+
+def build_dashboard(user_id):
+    """대시보드 응답 데이터 (순차 실행, 요청당 쿼리 수는 데이터 양과 무관하게 5개)"""
+    return assemble_dashboard(*(call[0](*call[1:]) for call in dashboard_parts(user_id)))
@@ -0,0 +1,79 @@
+"""거래 내역 스트리밍 내보내기 (CSV / NDJSON)"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FIELDS = (
+    ('id', 'id'),
+    ('date', 'date'),
+    ('type', 'type'),
+    ('title', 'title'),
+    ('amount', 'amount'),
+    ('category', 'category_id'),
+    ('category_name', 'category__name'),
+    ('description', 'description'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+)
+
+# 서버 측 커서에서 한 번에 가져올 행 수 / 한 번에 내보낼 행 수
+CHUNK_SIZE = 2000
+FLUSH_ROWS = 500
+
+# 스프레드시트가 수식으로 해석하는 시작 문자 (CSV 인젝션 방지)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class _Echo:
+    """csv.writer 가 쓴 줄을 그대로 돌려주는 파일 흉내"""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset):
+    """queryset 을 서버 측 커서로 CHUNK_SIZE 행씩 읽는 반복자"""
+    lookups = [lookup for _, lookup in EXPORT_FIELDS]
+    return queryset.values_list(*lookups).iterator(chunk_size=CHUNK_SIZE)
+
+
+def escape_cell(value):
+    """수식 시작 문자로 시작하는 문자열 앞에 ' 를 붙여 텍스트로 표시되게 함"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _buffered(lines):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= FLUSH_ROWS:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_csv(queryset):
+    """헤더를 먼저 보낸 뒤 행을 FLUSH_ROWS 개씩 묶어 CSV 로 생성"""
+    writer = csv.writer(_Echo())
+    # 엑셀에서 한글이 깨지지 않도록 BOM 을 붙임
+    yield '\ufeff' + writer.writerow([name for name, _ in EXPORT_FIELDS])
+    yield from _buffered(writer.writerow([escape_cell(value) for value in row]) for row in export_rows(queryset))
+
+
+def stream_ndjson(queryset):
+    """한 줄에 거래 하나씩 JSON 객체로 생성"""
+    names = [name for name, _ in EXPORT_FIELDS]
+    yield from _buffered(
+        json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+        for row in export_rows(queryset)
+    )
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson; charset=utf-8'),
+}
@@ -0,0 +1,211 @@
+"""은행 거래내역 파일(CSV/OFX) 가져오기
+
+파일을 한 번에 메모리에 올리지 않고 한 줄(한 거래)씩 읽어 검증한 뒤
+batch_size 개씩 bulk_create 한다.
+"""
+import csv
+import io
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from .bulk import CategoryCache, bulk_create_transactions, check_category_type, clean_fields
+from .exporters import FORMULA_PREFIXES
+from .models import Transaction
+
+# 결과에 담을 최대 오류 행 수 (전체 오류 수는 따로 알려줌)
+MAX_REPORTED_ERRORS = 1000
+
+DATE_FORMATS = ('%Y-%m-%d', '%Y.%m.%d', '%Y/%m/%d', '%Y%m%d')
+
+DEFAULT_MAPPING = {
+    'date': 'date',
+    'title': 'title',
+    'amount': 'amount',
+    'type': 'type',
+    'category': 'category',
+    'description': 'description',
+    # 입금/출금 금액이 다른 열에 있는 은행 양식용
+    'deposit': 'deposit',
+    'withdrawal': 'withdrawal',
+}
+
+
+class ImportFormatError(Exception):
+    pass
+
+
+def parse_date(value):
+    value = value.strip()
+    # '2024-01-31 12:30:00' 처럼 시간까지 있는 경우 날짜 부분만 사용
+    candidates = (value, value.split(' ')[0], value[:8])
+    for candidate in candidates:
+        for date_format in DATE_FORMATS:
+            try:
+                return datetime.strptime(candidate, date_format).date()
+            except ValueError:
+                continue
+    return None
+
+
+def parse_amount(value):
+    value = re.sub(r'[,\s원₩]', '', str(value or ''))
+    if not value:
+        return None
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        return None
+
+
+def unescape_cell(value):
+    """내보내기에서 수식 방지용으로 붙인 ' 를 제거"""
+    if value.startswith("'") and value[1:].startswith(FORMULA_PREFIXES):
+        return value[1:]
+    return value
+
+
+def read_csv(file, mapping, encoding='utf-8-sig', delimiter=','):
+    """CSV 파일을 한 행씩 읽어 (행 번호, 거래 필드 dict) 를 생성"""
+    columns = {**DEFAULT_MAPPING, **mapping}
+    text = io.TextIOWrapper(file, encoding=encoding, newline='')
+    try:
+        reader = csv.DictReader(text, delimiter=delimiter)
+        if not reader.fieldnames:
+            raise ImportFormatError('CSV 헤더 행이 없습니다.')
+        for row in reader:
+            values = {
+                field: unescape_cell(row[column])
+                for field, column in columns.items()
+                if column in row and row[column] not in (None, '')
+            }
+            # 헤더 행이 1행이므로 데이터는 2행부터
+            yield reader.line_num, values
+    except UnicodeDecodeError:
+        raise ImportFormatError(f'파일을 {encoding} 인코딩으로 읽을 수 없습니다.')
+    finally:
+        # TextIOWrapper 가 닫히면서 업로드 파일까지 닫지 않도록 분리
+        text.detach()
+
+
+OFX_TAG = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<]*)')
+OFX_FIELDS = {'DTPOSTED': 'date', 'TRNAMT': 'amount', 'NAME': 'title', 'MEMO': 'description'}
+
+
+def read_ofx(file, encoding='utf-8', chunk_size=64 * 1024):
+    """OFX(SGML/XML) 파일에서 STMTTRN 블록을 하나씩 읽어 (순번, 거래 필드 dict) 를 생성"""
+    decoder = io.TextIOWrapper(file, encoding=encoding, errors='replace', newline='')
+    try:
+        buffer, current, number = '', None, 0
+        while True:
+            chunk = decoder.read(chunk_size)
+            buffer += chunk
+            # 마지막 태그는 다음 청크에서 값이 이어질 수 있으므로 남겨둠
+            cut = len(buffer) if not chunk else buffer.rfind('<')
+            if cut <= 0 and chunk:
+                continue
+            for closing, tag, value in OFX_TAG.findall(buffer[:cut]):
+                tag = tag.upper()
+                if tag == 'STMTTRN':
+                    if closing and current is not None:
+                        number += 1
+                        yield number, current
+                        current = None
+                    elif not closing:
+                        current = {}
+                elif current is not None and not closing and tag in OFX_FIELDS:
+                    current[OFX_FIELDS[tag]] = value.strip()
+            buffer = buffer[cut:]
+            if not chunk:
+                break
+    finally:
+        decoder.detach()
+
+
+def normalize_row(values):
+    """파일에서 읽은 문자열 값을 clean_fields 가 받는 형태로 변환"""
+    errors = {}
+    row = {
+        'title': values.get('title', '').strip(),
+        'description': values.get('description', '').strip(),
+    }
+    if not row['title']:
+        row['title'] = row['description'][:200]
+
+    day = parse_date(values.get('date', ''))
+    if day is None:
+        errors['date'] = ['날짜 형식이 올바르지 않습니다.']
+    else:
+        row['date'] = day
+
+    deposit, withdrawal = parse_amount(values.get('deposit')), parse_amount(values.get('withdrawal'))
+    amount = parse_amount(values.get('amount'))
+    if deposit:
+        amount, row['type'] = deposit, 'income'
+    elif withdrawal:
+        amount, row['type'] = withdrawal, 'expense'
+    elif amount is None:
+        errors['amount'] = ['금액이 올바르지 않습니다.']
+    elif 'type' not in values:
+        # 타입 열이 없으면 부호로 판단 (음수 = 지출)
+        row['type'] = 'expense' if amount < 0 else 'income'
+
+    if amount is not None:
+        row['amount'] = abs(amount)
+    if 'type' in values and 'type' not in row:
+        row['type'] = values['type']
+    if 'category' in values:
+        row['category'] = values['category']
+    return row, errors
+
+
+def import_transactions(user, rows, default_categories=None, batch_size=500, dry_run=False):
+    """파일에서 읽은 행들을 검증해 batch_size 개씩 저장하고 결과 보고서를 반환
+
+    오류가 있는 행은 건너뛰고 나머지를 하나의 DB 트랜잭션 안에서 저장한다.
+    """
+    categories = CategoryCache(user)
+    defaults = {
+        type_: categories.get(value)
+        for type_, value in (default_categories or {}).items()
+        if value not in (None, '')
+    }
+
+    report = {'total_rows': 0, 'created': 0, 'failed': 0, 'errors': [], 'dry_run': dry_run}
+    batch = []
+
+    def flush():
+        if batch and not dry_run:
+            report['created'] += len(bulk_create_transactions(batch, batch_size=batch_size))
+        elif batch:
+            report['created'] += len(batch)
+        batch.clear()
+
+    with transaction.atomic():
+        for number, values in rows:
+            report['total_rows'] += 1
+            row, errors = normalize_row(values)
+            if 'category' not in row and defaults.get(row.get('type')):
+                row['category'] = defaults[row['type']]
+
+            cleaned, field_errors = clean_fields(row, categories)
+            errors = {**field_errors, **errors}
+            if 'category' not in row:
+                errors.setdefault('category', ['카테고리를 지정해주세요.'])
+            if not errors:
+                errors = check_category_type(cleaned['category'], cleaned['type'])
+
+            if errors:
+                report['failed'] += 1
+                if len(report['errors']) < MAX_REPORTED_ERRORS:
+                    report['errors'].append({'row': number, 'errors': errors})
+                continue
+
+            batch.append(Transaction(user=user, **cleaned))
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+
+    return report
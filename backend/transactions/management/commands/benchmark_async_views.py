@@ -0,0 +1,115 @@
+import asyncio
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from transactions.seeding import create_users, seed_ledger
+
+# (동기 WSGI 경로, 비동기 ASGI 경로)
+ENDPOINTS = [
+    ('/api/stats/', '/api/async/stats/'),
+    ('/api/dashboard/', '/api/async/dashboard/'),
+    ('/api/budgets/summary/', '/api/async/budgets/summary/'),
+]
+
+
+class Command(BaseCommand):
+    help = '동기(WSGI) 뷰와 비동기(ASGI) 뷰의 동시 요청 지연 시간/처리량을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--transactions', type=int, default=20000, help='생성할 거래 수')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--requests', type=int, default=200, help='엔드포인트별 요청 수')
+        parser.add_argument('--concurrency', type=int, default=16, help='동시 요청 수')
+        parser.add_argument('--wsgi-url', help='실행 중인 WSGI 서버 주소 (예: http://127.0.0.1:8000, 기본값: 프로세스 내 핸들러)')
+        parser.add_argument('--asgi-url', help='실행 중인 ASGI 서버 주소 (예: http://127.0.0.1:8001)')
+
+    def handle(self, *args, **options):
+        # 외부 서버가 같은 데이터를 읽어야 하므로 롤백하지 않고 커밋한 뒤 마지막에 삭제
+        user, = create_users([f'async-bench-{options["seed"]}@example.com'])
+        try:
+            self.stdout.write(f'거래 {options["transactions"]}개 생성 중...')
+            seed_ledger(user, options['transactions'], seed=options['seed'])
+            token = str(RefreshToken.for_user(user).access_token)
+            self.run(token, options)
+        finally:
+            user.delete()
+            self.stdout.write('생성한 벤치마크 데이터를 삭제했습니다.')
+
+    def run(self, token, options):
+        self.stdout.write(
+            f'\n요청 {options["requests"]}개, 동시 {options["concurrency"]}개\n'
+            f'{"경로":<30}{"p50":>10}{"p95":>10}{"평균":>10}{"처리량":>12}{"오류":>6}'
+        )
+        for sync_path, async_path in ENDPOINTS:
+            for path, base_url, runner in (
+                (sync_path, options['wsgi_url'], self.run_wsgi),
+                (async_path, options['asgi_url'], self.run_asgi),
+            ):
+                if base_url:
+                    result = self.run_http(base_url + path, token, options)
+                else:
+                    result = runner(path, token, options)
+                self.report(path, *result)
+
+    def run_wsgi(self, path, token, options):
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_HOST='localhost')
+
+        def request():
+            started = time.perf_counter()
+            status = client.get(path).status_code
+            return time.perf_counter() - started, status
+
+        return self.run_threads(request, options)
+
+    def run_http(self, url, token, options):
+        def request():
+            started = time.perf_counter()
+            req = urllib.request.Request(url, headers={'Authorization': f'Bearer {token}'})
+            try:
+                with urllib.request.urlopen(req) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                status = e.code
+            return time.perf_counter() - started, status
+
+        return self.run_threads(request, options)
+
+    def run_threads(self, request, options):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            results = list(executor.map(lambda _: request(), range(options['requests'])))
+        return results, time.perf_counter() - started
+
+    def run_asgi(self, path, token, options):
+        async def main():
+            client = AsyncClient()
+            headers = {'Authorization': f'Bearer {token}'}
+            semaphore = asyncio.Semaphore(options['concurrency'])
+
+            async def request():
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.get(path, headers=headers)
+                    return time.perf_counter() - started, response.status_code
+
+            started = time.perf_counter()
+            results = await asyncio.gather(*(request() for _ in range(options['requests'])))
+            return results, time.perf_counter() - started
+
+        return asyncio.run(main())
+
+    def report(self, path, results, elapsed):
+        timings = sorted(duration * 1000 for duration, _ in results)
+        errors = sum(1 for _, status in results if status != 200)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f'{path:<30}{statistics.median(timings):>8.1f}ms{p95:>8.1f}ms'
+            f'{statistics.mean(timings):>8.1f}ms{len(results) / elapsed:>8.1f}req/s{errors:>6}'
+        )
@@ -0,0 +1,137 @@
+import re
+import statistics
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+PLAIN = 'bench_txn_plain'
+PARTITIONED = 'bench_txn_partitioned'
+
+COLUMNS = (
+    'id bigint NOT NULL, user_id integer NOT NULL, category_id integer, type varchar(10) NOT NULL, '
+    'amount numeric(10, 2) NOT NULL, title varchar(200) NOT NULL, date date NOT NULL'
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        '같은 데이터를 가진 일반 테이블과 연도별 파티션 테이블을 크기별로 만들어 '
+        '주요 거래 조회 쿼리의 실행 시간과 읽은 파티션 수를 비교합니다. (PostgreSQL)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100000,1000000,5000000',
+                            help='비교할 테이블 크기(거래 수), 쉼표로 구분')
+        parser.add_argument('--users', type=int, default=1000, help='거래를 나눠 가질 사용자 수')
+        parser.add_argument('--years', type=int, default=5, help='거래 날짜가 퍼질 연도 수 (올해까지)')
+        parser.add_argument('--repeat', type=int, default=5, help='쿼리별 반복 실행 횟수')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('파티셔닝 벤치마크는 PostgreSQL 에서만 실행할 수 있습니다.')
+
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        results = []
+        try:
+            # 벤치마크용 테이블은 트랜잭션과 함께 롤백됨
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for size in sizes:
+                        self.stdout.write(f'거래 {size}개 생성 중...')
+                        self.create_tables(cursor, size, options)
+                        for label, sql, params in self.query_shapes(options):
+                            plain = self.measure(cursor, sql.format(table=PLAIN), params, options)
+                            partitioned = self.measure(cursor, sql.format(table=PARTITIONED), params, options)
+                            results.append((size, label, plain, partitioned))
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'\n{"거래 수":>10}  {"쿼리":<24} {"일반(ms)":>10} {"파티션(ms)":>10} {"읽은 파티션":>10}'
+        ))
+        for size, label, (plain_ms, _), (partitioned_ms, scanned) in results:
+            self.stdout.write(
+                f'{size:>10}  {label:<24} {plain_ms:>10.2f} {partitioned_ms:>10.2f} '
+                f'{scanned:>5}/{options["years"] + 1}'
+            )
+
+    def create_tables(self, cursor, size, options):
+        this_year = date.today().year
+        first_year = this_year - options['years'] + 1
+
+        cursor.execute(f'DROP TABLE IF EXISTS {PLAIN}, {PARTITIONED}')
+        cursor.execute(f'CREATE TABLE {PLAIN} ({COLUMNS}, PRIMARY KEY (id))')
+        cursor.execute(f'CREATE TABLE {PARTITIONED} ({COLUMNS}, PRIMARY KEY (id, date)) PARTITION BY RANGE (date)')
+        cursor.execute(f'CREATE TABLE {PARTITIONED}_default PARTITION OF {PARTITIONED} DEFAULT')
+        for year in range(first_year, this_year + 1):
+            cursor.execute(
+                f"CREATE TABLE {PARTITIONED}_y{year} PARTITION OF {PARTITIONED} "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            )
+
+        cursor.execute(
+            f"INSERT INTO {PLAIN} SELECT n, 1 + (n %% %s), 1 + (n %% 20), "
+            f"CASE WHEN n %% 5 = 0 THEN 'income' ELSE 'expense' END, "
+            f"(random() * 100000)::numeric(10, 2), 'transaction ' || n, "
+            f"%s::date + (random() * (CURRENT_DATE - %s::date))::int "
+            f"FROM generate_series(1, %s) AS n",
+            [options['users'], date(first_year, 1, 1), date(first_year, 1, 1), size],
+        )
+        cursor.execute(f'INSERT INTO {PARTITIONED} SELECT * FROM {PLAIN}')
+        # transactions_transaction 의 txn_user_date_idx, txn_user_type_date_idx 에 해당하는 인덱스
+        for table in (PLAIN, PARTITIONED):
+            cursor.execute(f'CREATE INDEX ON {table} (user_id, date DESC)')
+            cursor.execute(f'CREATE INDEX ON {table} (user_id, type, date)')
+            cursor.execute(f'ANALYZE {table}')
+
+    def query_shapes(self, options):
+        today = date.today()
+        month_start = today.replace(day=1)
+        year_start = today.replace(month=1, day=1)
+        user_id = 1 + options['users'] // 2
+
+        # Budget.spent_amount / with_spent
+        yield '예산 사용 금액 (이번 달)', (
+            "SELECT SUM(amount) FROM {table} "
+            "WHERE user_id = %s AND type = 'expense' AND date >= %s AND date <= %s"
+        ), [user_id, month_start, today]
+        # rollups.rebuild / 기간 통계
+        yield '월별 합계 (올해)', (
+            "SELECT date_trunc('month', date), type, SUM(amount) FROM {table} "
+            "WHERE user_id = %s AND date >= %s AND date <= %s GROUP BY 1, 2"
+        ), [user_id, year_start, today]
+        # TransactionListCreateView (기간 필터)
+        yield '거래 목록 (기간)', (
+            "SELECT * FROM {table} WHERE user_id = %s AND date >= %s AND date <= %s "
+            "ORDER BY date DESC, id DESC LIMIT 20"
+        ), [user_id, year_start, today]
+        # TransactionListCreateView (필터 없음, 최신순)
+        yield '거래 목록 (전체 기간)', (
+            "SELECT * FROM {table} WHERE user_id = %s ORDER BY date DESC, id DESC LIMIT 20"
+        ), [user_id]
+        # 전체 사용자 대상 작업 (refresh_budget_snapshots 등)
+        yield '전체 지출 합계 (이번 달)', (
+            "SELECT user_id, SUM(amount) FROM {table} "
+            "WHERE type = 'expense' AND date >= %s AND date <= %s GROUP BY user_id"
+        ), [month_start, today]
+
+    def measure(self, cursor, sql, params, options):
+        """(중앙값 ms, 실행 계획에서 읽은 파티션 수)"""
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            cursor.execute(sql, params)
+            cursor.fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        cursor.execute(f'EXPLAIN {sql}', params)
+        plan = '\n'.join(row[0] for row in cursor.fetchall())
+        scanned = len(set(re.findall(rf'on {PARTITIONED}_(\w+)', plan)))
+        return statistics.median(timings), scanned
@@ -0,0 +1,72 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from transactions.models import Transaction
+from transactions.search import icontains_search, search_transactions
+from transactions.seeding import create_users, seed_ledger
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = '거래 검색을 기존 icontains 방식과 인덱스 검색(FTS5 / pg_trgm)으로 각각 실행해 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--transactions', type=int, default=50000, help='생성할 거래 수')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=5, help='검색어별 반복 실행 횟수')
+        parser.add_argument('--query', action='append', dest='queries', default=[],
+                            help='검색어 (여러 번 지정 가능)')
+        parser.add_argument('--explain', action='store_true',
+                            help='icontains 의 실행 계획도 출력 (인덱스 검색의 계획은 PostgreSQL 에서 항상 출력)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write('생성한 벤치마크 데이터를 롤백했습니다.')
+
+    def run(self, options):
+        user, = create_users([f'search-bench-{options["seed"]}@example.com'])
+        self.stdout.write(f'거래 {options["transactions"]}개 생성 중...')
+        seed_ledger(user, options['transactions'], seed=options['seed'])
+
+        queries = options['queries'] or ['마트 장보기', '프리랜서', '메모 123', '택시']
+        transactions = Transaction.objects.filter(user=user)
+
+        self.stdout.write(f'\n데이터베이스: {connection.vendor}\n')
+        self.stdout.write(f'{"검색어":<14}{"icontains":>14}{"인덱스 검색":>14}{"결과 수":>12}')
+        for query in queries:
+            baseline = icontains_search(transactions, query)
+            indexed = search_transactions(transactions, query)
+            baseline_ms = self.measure(baseline, options['repeat'])
+            indexed_ms = self.measure(indexed, options['repeat'])
+            self.stdout.write(
+                f'{query:<14}{baseline_ms:>12.2f}ms{indexed_ms:>12.2f}ms'
+                f'{indexed.count():>6} / {baseline.count()}'
+            )
+            if options['explain']:
+                self.stdout.write(self.style.MIGRATE_HEADING('  icontains:'))
+                self.stdout.write(baseline.explain())
+            if options['explain'] or connection.vendor == 'postgresql':
+                # PostgreSQL 에서는 trigram 인덱스(txn_*_trgm_idx)를 실제로 쓰는지 항상 확인
+                plan = indexed.explain()
+                self.stdout.write(self.style.MIGRATE_HEADING('  인덱스 검색:'))
+                self.stdout.write(plan)
+                if connection.vendor == 'postgresql' and '_trgm_idx' not in plan:
+                    self.stdout.write(self.style.WARNING('  trigram 인덱스를 사용하지 않았습니다.'))
+
+    def measure(self, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset[:20])
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,120 @@
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+
+from budgets.models import Budget
+from transactions.models import Transaction, TransactionRollup
+from transactions.rollups import range_filter
+from transactions.seeding import create_users, seed_ledger
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        '대용량 거래 데이터를 만든 뒤 주요 거래 조회 쿼리의 실행 계획(EXPLAIN)과 '
+        '실행 시간을 출력해 복합 인덱스 사용 여부를 확인합니다. (SQLite, PostgreSQL)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--transactions', type=int, default=50000, help='생성할 거래 수')
+        parser.add_argument('--noise-users', type=int, default=3,
+                            help='같은 수의 거래를 가진 다른 사용자 수 (인덱스 선택도 확인용)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=5, help='쿼리별 반복 실행 횟수')
+        parser.add_argument('--analyze', action='store_true',
+                            help='PostgreSQL 에서 EXPLAIN ANALYZE 사용')
+        parser.add_argument('--keep', action='store_true', help='생성한 데이터를 지우지 않음')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                if not options['keep']:
+                    raise _Rollback
+        except _Rollback:
+            self.stdout.write('생성한 벤치마크 데이터를 롤백했습니다.')
+
+    def run(self, options):
+        users = []
+        emails = [f'bench-{options["seed"]}-{index}@example.com' for index in range(options['noise_users'] + 1)]
+        for index, user in enumerate(create_users(emails)):
+            self.stdout.write(f'{user.email}: 거래 {options["transactions"]}개 생성 중...')
+            categories = seed_ledger(user, options['transactions'], seed=options['seed'] + index)
+            users.append((user, categories))
+
+        user, categories = users[0]
+        Budget.objects.bulk_create([
+            Budget(user=user, name='전체 예산', amount=1_000_000,
+                   start_date=date.today().replace(day=1), end_date=date.today()),
+            Budget(user=user, name='식비 예산', amount=300_000, category=categories['expense'][0],
+                   start_date=date.today().replace(day=1), end_date=date.today()),
+        ])
+
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('ANALYZE transactions_transaction')
+                cursor.execute('ANALYZE transactions_transactionrollup')
+            else:
+                cursor.execute('ANALYZE')
+
+        self.stdout.write(f'\n데이터베이스: {connection.vendor}\n')
+        for label, queryset in self.query_shapes(user, categories):
+            self.explain(label, queryset, options)
+
+    def query_shapes(self, user, categories):
+        end = date.today()
+        start = end - timedelta(days=90)
+        month_start = end.replace(day=1)
+        expense_category = categories['expense'][0]
+        transactions = Transaction.objects.filter(user=user)
+
+        # TransactionListCreateView.get_queryset
+        yield '거래 목록 (기간)', transactions.filter(
+            date__gte=start, date__lte=end
+        ).select_related('category')[:20]
+        yield '거래 목록 (타입 + 기간)', transactions.filter(
+            type='expense', date__gte=start, date__lte=end
+        ).select_related('category')[:20]
+        yield '거래 목록 (카테고리 + 기간)', transactions.filter(
+            category=expense_category, date__gte=start, date__lte=end
+        ).select_related('category')[:20]
+
+        # transaction_stats
+        yield '통계 (카테고리별 집계)', TransactionRollup.objects.filter(user=user).filter(
+            range_filter(start, end)
+        ).values('category__name', 'category__color', 'category__type').annotate(
+            total=Sum('total'), count=Sum('count')
+        ).order_by('-total')
+
+        # Budget.spent_amount
+        yield '예산 사용 금액 (전체)', transactions.filter(
+            type='expense', date__gte=month_start, date__lte=end
+        ).order_by().values('user').annotate(total=Sum('amount'), count=Count('id'))
+        yield '예산 사용 금액 (카테고리)', transactions.filter(
+            type='expense', category=expense_category, date__gte=month_start, date__lte=end
+        ).order_by().values('category').annotate(total=Sum('amount'), count=Count('id'))
+        yield '예산 목록 (with_spent)', Budget.objects.filter(user=user).with_spent()
+
+    def explain(self, label, queryset, options):
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - started) * 1000)
+
+        explain_options = {}
+        if options['analyze'] and connection.vendor == 'postgresql':
+            explain_options = {'analyze': True, 'buffers': True}
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'== {label}: 중앙값 {statistics.median(timings):.2f}ms (최소 {min(timings):.2f}ms)'
+        ))
+        self.stdout.write(queryset.explain(**explain_options))
+        self.stdout.write('')
@@ -0,0 +1,34 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from transactions.recurring import due_rules, materialize
+
+
+class Command(BaseCommand):
+    help = (
+        '모든 사용자의 반복 거래 규칙 중 발생일이 지난 것의 거래를 한 번에 만듭니다. '
+        '(매일 실행, 다시 실행해도 같은 발생일의 거래는 중복되지 않음)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, help='이 날짜까지 생성 (기본값: 오늘)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='한 번에 처리할 규칙 수')
+        parser.add_argument('--batch-size', type=int, default=500, help='bulk_create 한 번에 저장할 거래 수')
+        parser.add_argument('--dry-run', action='store_true', help='만들지 않고 대상 규칙 수만 출력')
+
+    def handle(self, *args, **options):
+        today = options['date'] or date.today()
+        if options['dry_run']:
+            self.stdout.write(f'{today} 까지 처리할 규칙 {due_rules(today).count()}개')
+            return
+
+        started = time.perf_counter()
+        processed, created = materialize(
+            today, chunk_size=options['chunk_size'], batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'규칙 {processed}개에서 거래 {created}개를 {time.perf_counter() - started:.1f}초 만에 만들었습니다. '
+            f'({today} 까지)'
+        ))
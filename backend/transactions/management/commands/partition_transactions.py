@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from transactions import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        '거래 테이블의 연도별 파티션을 올해부터 --years-ahead 년 뒤까지 미리 만들고 (default 파티션에 '
+        '들어간 거래의 연도 포함) 파티션별 예상 행 수를 출력합니다. (PostgreSQL, 매월 실행)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years-ahead', type=int, default=settings.TRANSACTION_PARTITION_YEARS_AHEAD,
+                            help='올해 이후로 미리 만들 파티션 연도 수')
+        parser.add_argument('--convert', action='store_true',
+                            help='파티션 테이블이 아니면 먼저 변환 (테이블 전체를 복사하는 동안 쓰기가 막힘)')
+        parser.add_argument('--status', action='store_true', help='파티션을 만들지 않고 현황만 출력')
+
+    def handle(self, *args, **options):
+        if not partitioning.is_supported(connection):
+            self.stdout.write(f'{connection.vendor} 에서는 거래 테이블을 파티션으로 나누지 않습니다.')
+            return
+
+        if not partitioning.is_partitioned(connection):
+            if not options['convert']:
+                raise CommandError(
+                    '거래 테이블이 파티션 테이블이 아닙니다. '
+                    'TRANSACTION_PARTITIONING=True 로 migrate 하거나 --convert 로 변환하세요.'
+                )
+            with transaction.atomic():
+                partitioning.convert(connection, years_ahead=options['years_ahead'])
+            self.stdout.write(self.style.SUCCESS('거래 테이블을 연도별 파티션 테이블로 변환했습니다.'))
+
+        if not options['status']:
+            with transaction.atomic():
+                created = partitioning.ensure_partitions(connection, years_ahead=options['years_ahead'])
+            for year in created:
+                self.stdout.write(self.style.SUCCESS(f'{partitioning.partition_name(year)} 파티션을 만들었습니다.'))
+
+        for name, rows in partitioning.partitions(connection):
+            self.stdout.write(f'  {name}: 약 {rows}행')
+            if name == partitioning.DEFAULT_PARTITION and rows:
+                self.stdout.write(self.style.WARNING(
+                    '  default 파티션에 거래가 있습니다. --status 없이 실행하면 연도 파티션으로 옮겨집니다.'
+                ))
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from transactions import rollups
+
+
+class Command(BaseCommand):
+    help = '원본 거래로부터 일별/월별 거래 집계를 다시 계산하고 어긋난 항목을 보고합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='users', default=[],
+                            help='대상 사용자 이메일 (여러 번 지정 가능, 기본값: 전체)')
+        parser.add_argument('--check', action='store_true',
+                            help='다시 계산하지 않고 어긋난 항목만 확인 (있으면 오류 종료)')
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='한 번에 처리할 사용자 수')
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by('pk')
+        if options['users']:
+            users = users.filter(email__in=options['users'])
+        user_ids = list(users.values_list('pk', flat=True))
+
+        chunk_size = options['chunk_size']
+        drift_count = 0
+        for offset in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[offset:offset + chunk_size]
+            drift = rollups.rebuild(chunk, check_only=options['check'])
+            drift_count += len(drift)
+            for key, expected, actual in drift:
+                self.stdout.write(f'  {key}: 기대값={expected} 저장값={actual}')
+
+        if options['check'] and drift_count:
+            raise CommandError(f'{drift_count}개의 집계 항목이 원본 거래와 다릅니다.')
+
+        action = '확인' if options['check'] else '재계산'
+        self.stdout.write(self.style.SUCCESS(
+            f'사용자 {len(user_ids)}명의 집계를 {action}했습니다. (어긋난 항목 {drift_count}개)'
+        ))
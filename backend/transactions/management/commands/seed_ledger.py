@@ -0,0 +1,77 @@
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from budgets import snapshots
+from sync import changelog
+from transactions import rollups
+from transactions.seeding import EXPENSE_CATEGORIES, seed_users
+
+
+class Command(BaseCommand):
+    help = '부하 테스트용 합성 사용자와 거래/카테고리/예산을 생성합니다. (seed 가 같으면 같은 데이터)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='생성할 사용자 수')
+        parser.add_argument('--prefix', default='load', help='사용자 이메일 접두어 (<prefix>-000001@example.com)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--per-month', type=float, default=30, help='사용자당 월평균 거래 수')
+        parser.add_argument('--spread', type=float, default=0.5,
+                            help='사용자별 거래 수 편차 비율 (0.5 이면 평균의 50%%~150%%)')
+        parser.add_argument('--months', type=int, default=12, help='거래 기간(개월)')
+        parser.add_argument('--income-ratio', type=float, default=0.1, help='수입 거래 비율')
+        parser.add_argument('--expense-categories', type=int, default=len(EXPENSE_CATEGORIES),
+                            help=f'사용할 지출 카테고리 수 (1~{len(EXPENSE_CATEGORIES)})')
+        parser.add_argument('--budgets', type=int, default=3, help='사용자당 이번 달 예산 수 (전체 예산 1개 포함)')
+        parser.add_argument('--end-date', type=date.fromisoformat, help='마지막 거래 날짜 (기본값: 오늘)')
+        parser.add_argument('--password', default='load-test-password', help='모든 사용자의 비밀번호')
+        parser.add_argument('--chunk-size', type=int, default=200, help='한 번에 생성할 사용자 수')
+        parser.add_argument('--clear', action='store_true', help='같은 접두어의 기존 사용자를 먼저 삭제')
+
+    def handle(self, *args, **options):
+        if not 1 <= options['expense_categories'] <= len(EXPENSE_CATEGORIES):
+            raise CommandError(f'--expense-categories 는 1~{len(EXPENSE_CATEGORIES)} 사이여야 합니다.')
+        if not 0 <= options['spread'] < 1:
+            raise CommandError('--spread 는 0 이상 1 미만이어야 합니다.')
+
+        existing = get_user_model().objects.filter(email__startswith=f'{options["prefix"]}-')
+        if existing.exists():
+            if not options['clear']:
+                raise CommandError(f'"{options["prefix"]}-" 사용자가 이미 있습니다. --clear 로 먼저 삭제하세요.')
+            # CASCADE 로 지워지는 거래마다 집계/변경 기록/예산 스냅샷을 갱신하지 않고 한 번에
+            with transaction.atomic(), rollups.deferred(), changelog.deferred(), snapshots.deferred():
+                deleted, _ = existing.delete()
+            self.stdout.write(f'기존 데이터 {deleted}행을 삭제했습니다.')
+
+        started = time.perf_counter()
+        totals = {'transactions': 0}
+
+        def progress(users, transactions):
+            totals['transactions'] += transactions
+            self.stdout.write(
+                f'  사용자 {users}/{options["users"]}명, 거래 {totals["transactions"]}개 '
+                f'({time.perf_counter() - started:.1f}초)'
+            )
+
+        seed_users(
+            options['users'],
+            prefix=options['prefix'],
+            seed=options['seed'],
+            per_month=options['per_month'],
+            spread=options['spread'],
+            months=options['months'],
+            income_ratio=options['income_ratio'],
+            expense_categories=options['expense_categories'],
+            budgets=options['budgets'],
+            password=options['password'],
+            end=options['end_date'],
+            users_per_chunk=options['chunk_size'],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'사용자 {options["users"]}명, 거래 {totals["transactions"]}개를 '
+            f'{time.perf_counter() - started:.1f}초 만에 생성했습니다.'
+        ))
@@ -0,0 +1,130 @@
+# Generated by Django 4.2 on 2026-10-17 03:52
+
+from datetime import date
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+import django.db.models.deletion
+
+
+def populate_rollups(apps, schema_editor):
+    # 이 시점의 transactions.rollups.compute_rows 와 같은 집계 (모듈이 바뀌어도 결과가 같도록 복사해 둠)
+    Transaction = apps.get_model("transactions", "Transaction")
+    TransactionRollup = apps.get_model("transactions", "TransactionRollup")
+
+    rows = {}
+    daily = (
+        Transaction.objects.values("user_id", "category_id", "type", "date")
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+    for row in daily:
+        key = (row["user_id"], "day", row["date"], row["category_id"], row["type"])
+        rows[key] = (row["total"], row["count"])
+
+    monthly = (
+        Transaction.objects.annotate(month=TruncMonth("date"))
+        .values("user_id", "category_id", "type", "month")
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+    for row in monthly:
+        month = row["month"]
+        if not isinstance(month, date):
+            month = month.date()
+        key = (row["user_id"], "month", month, row["category_id"], row["type"])
+        rows[key] = (row["total"], row["count"])
+
+    TransactionRollup.objects.bulk_create(
+        [
+            TransactionRollup(
+                user_id=user_id,
+                period=period,
+                period_start=start,
+                category_id=category_id,
+                type=type_,
+                total=total,
+                count=count,
+            )
+            for (user_id, period, start, category_id, type_), (
+                total,
+                count,
+            ) in rows.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("transactions", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TransactionRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[("income", "수입"), ("expense", "지출")],
+                        max_length=10,
+                        verbose_name="타입",
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("day", "일별"), ("month", "월별")],
+                        max_length=5,
+                        verbose_name="집계 단위",
+                    ),
+                ),
+                ("period_start", models.DateField(verbose_name="기간 시작일")),
+                (
+                    "total",
+                    models.DecimalField(
+                        decimal_places=2, default=0, max_digits=15, verbose_name="합계"
+                    ),
+                ),
+                ("count", models.IntegerField(default=0, verbose_name="거래 수")),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rollups",
+                        to="transactions.category",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transaction_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "거래 집계",
+                "verbose_name_plural": "거래 집계",
+                "unique_together": {
+                    ("user", "period", "period_start", "category", "type")
+                },
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,134 @@
+# Generated by Django 4.2 on 2026-10-17 04:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("transactions", "0005_category_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecurringRule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=200, verbose_name="제목")),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="금액"
+                    ),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[("income", "수입"), ("expense", "지출")],
+                        max_length=10,
+                        verbose_name="타입",
+                    ),
+                ),
+                ("description", models.TextField(blank=True, verbose_name="설명")),
+                (
+                    "frequency",
+                    models.CharField(
+                        choices=[
+                            ("weekly", "매주"),
+                            ("monthly", "매월"),
+                            ("yearly", "매년"),
+                        ],
+                        default="monthly",
+                        max_length=10,
+                        verbose_name="주기",
+                    ),
+                ),
+                (
+                    "interval",
+                    models.PositiveSmallIntegerField(default=1, verbose_name="간격"),
+                ),
+                (
+                    "day_of_month",
+                    models.PositiveSmallIntegerField(
+                        blank=True, null=True, verbose_name="날짜"
+                    ),
+                ),
+                ("start_date", models.DateField(verbose_name="시작일")),
+                (
+                    "end_date",
+                    models.DateField(blank=True, null=True, verbose_name="종료일"),
+                ),
+                (
+                    "next_run",
+                    models.DateField(blank=True, null=True, verbose_name="다음 발생일"),
+                ),
+                ("is_active", models.BooleanField(default=True, verbose_name="활성화")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "반복 거래",
+                "verbose_name_plural": "반복 거래",
+                "ordering": ["next_run", "id"],
+            },
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="occurrence_date",
+            field=models.DateField(blank=True, null=True, verbose_name="반복 발생일"),
+        ),
+        migrations.AddField(
+            model_name="recurringrule",
+            name="category",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="recurring_rules",
+                to="transactions.category",
+            ),
+        ),
+        migrations.AddField(
+            model_name="recurringrule",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="recurring_rules",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="recurring_rule",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="transactions",
+                to="transactions.recurringrule",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recurringrule",
+            index=models.Index(
+                fields=["is_active", "next_run"], name="recurring_due_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="transaction",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("recurring_rule__isnull", False)),
+                fields=("recurring_rule", "occurrence_date"),
+                name="txn_recurring_occurrence_uniq",
+            ),
+        ),
+    ]
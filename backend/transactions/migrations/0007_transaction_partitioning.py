@@ -0,0 +1,164 @@
+# Generated by Django 4.2 on 2026-10-17 09:10
+
+from datetime import date
+
+from django.conf import settings
+from django.db import migrations
+
+# 이 마이그레이션 시점의 transactions.partitioning.convert / unpartition 을 그대로 옮겨 둠
+# (이후 모듈이 바뀌어도 마이그레이션 결과가 달라지지 않도록)
+TABLE = "transactions_transaction"
+STAGING = f"{TABLE}_staging"
+DEFAULT_PARTITION = f"{TABLE}_default"
+PRIMARY_KEY = f"{TABLE}_pkey"
+RECURRING_UNIQUE = "txn_recurring_occurrence_uniq"
+
+
+def is_partitioned(cursor):
+    cursor.execute(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.oid = to_regclass(%s)",
+        [TABLE],
+    )
+    return cursor.fetchone() is not None
+
+
+def table_definition(cursor):
+    """테이블의 인덱스(기본 키 제외)와 외래 키 정의"""
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = %s",
+        [TABLE],
+    )
+    # 파티션 테이블의 인덱스 정의는 'ON ONLY' 로 나오므로 일반 CREATE INDEX 로 바꿈
+    indexes = [
+        (name, sql.replace(" ON ONLY ", " ON ", 1))
+        for name, sql in cursor.fetchall()
+        if name != PRIMARY_KEY
+    ]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+        [TABLE],
+    )
+    return indexes, cursor.fetchall()
+
+
+def like(name):
+    return (
+        f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS "
+        "INCLUDING STORAGE INCLUDING IDENTITY)"
+    )
+
+
+def recurring_unique_sql(table):
+    return (
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {table}_recurring_uniq ON {table} "
+        "(recurring_rule_id, occurrence_date) WHERE recurring_rule_id IS NOT NULL"
+    )
+
+
+def swap(cursor, statements, primary_key):
+    """statements 로 같은 컬럼의 새 테이블(STAGING)을 만들어 데이터를 옮기고 기존 테이블과 바꿈
+
+    일반 인덱스와 외래 키는 같은 이름으로 다시 만든다. 유일 인덱스(기본 키 제외)는
+    호출하는 쪽에서 다시 만든다.
+    """
+    cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+    indexes, foreign_keys = table_definition(cursor)
+
+    for sql in statements:
+        cursor.execute(sql)
+    cursor.execute(
+        f"INSERT INTO {STAGING} OVERRIDING SYSTEM VALUE SELECT * FROM {TABLE}"
+    )
+    cursor.execute(f"DROP TABLE {TABLE}")
+    cursor.execute(f"ALTER TABLE {STAGING} RENAME TO {TABLE}")
+    cursor.execute(
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT {PRIMARY_KEY} PRIMARY KEY ({primary_key})"
+    )
+
+    for name, sql in indexes:
+        if not sql.startswith("CREATE UNIQUE INDEX"):
+            cursor.execute(sql)
+    for name, definition in foreign_keys:
+        cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+        f"COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM {TABLE}"
+    )
+    cursor.execute(f"ANALYZE {TABLE}")
+
+
+def partition_transactions(apps, schema_editor):
+    # TRANSACTION_PARTITIONING 이 꺼져 있거나 PostgreSQL 이 아니면 아무것도 하지 않음
+    connection = schema_editor.connection
+    if not settings.TRANSACTION_PARTITIONING or connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        if is_partitioned(cursor):
+            return
+        indexes, _ = table_definition(cursor)
+        unique = {
+            name for name, sql in indexes if sql.startswith("CREATE UNIQUE INDEX")
+        } - {RECURRING_UNIQUE}
+        if unique:
+            # 파티션 키(date)를 포함하지 않는 유일 인덱스는 파티션 테이블에 걸 수 없음
+            raise ValueError(
+                "파티션 테이블로 옮길 수 없는 유일 인덱스가 있습니다: "
+                + ", ".join(sorted(unique))
+            )
+
+        cursor.execute(
+            "SELECT EXTRACT(YEAR FROM MIN(date))::int, EXTRACT(YEAR FROM MAX(date))::int "
+            f"FROM {TABLE}"
+        )
+        first, last = cursor.fetchone()
+        this_year = date.today().year
+        years_ahead = settings.TRANSACTION_PARTITION_YEARS_AHEAD
+        years = range(
+            min(first or this_year, this_year),
+            max(last or this_year, this_year + years_ahead) + 1,
+        )
+
+        statements = [
+            like(STAGING) + " PARTITION BY RANGE (date)",
+            f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {STAGING} DEFAULT",
+            *(
+                f"CREATE TABLE {TABLE}_y{year} PARTITION OF {STAGING} "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+                for year in years
+            ),
+        ]
+        swap(cursor, statements, "id, date")
+        for name in [DEFAULT_PARTITION, *(f"{TABLE}_y{year}" for year in years)]:
+            cursor.execute(recurring_unique_sql(name))
+
+
+def unpartition_transactions(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        if not is_partitioned(cursor):
+            return
+        # 파티션별 유일 인덱스는 파티션과 함께 지워지므로 원래의 부분 유일 인덱스를 다시 만듦
+        swap(cursor, [like(STAGING)], "id")
+        cursor.execute(
+            f"CREATE UNIQUE INDEX {RECURRING_UNIQUE} ON {TABLE} "
+            "(recurring_rule_id, occurrence_date) WHERE recurring_rule_id IS NOT NULL"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0006_recurring_rules"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_transactions, unpartition_transactions),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-17 11:40
+
+from django.db import migrations
+
+# icontains 는 PostgreSQL 에서 UPPER("title"::text) LIKE UPPER(%s) 로 컴파일되므로
+# 원래 컬럼이 아니라 같은 식에 trigram 인덱스를 걸어야 사용됨
+INDEXES = (
+    ("txn_title_trgm_idx", "title"),
+    ("txn_description_trgm_idx", "description"),
+)
+
+
+def index_upper(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, column in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+        schema_editor.execute(
+            f"CREATE INDEX {name} ON transactions_transaction "
+            f"USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+        )
+
+
+def index_column(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, column in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+        schema_editor.execute(
+            f"CREATE INDEX {name} ON transactions_transaction "
+            f"USING gin ({column} gin_trgm_ops)"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0007_transaction_partitioning"),
+    ]
+
+    operations = [
+        migrations.RunPython(index_upper, index_column),
+    ]
@@ -1,7 +1,40 @@
-from django.db import models
+from calendar import monthrange
+from datetime import date, timedelta
+
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.conf import settings
 
 
+class CategoryQuerySet(models.QuerySet):
+    def with_stats(self, start_date=None, end_date=None):
+        """카테고리별 거래 수(transaction_count)와, 기간이 주어지면 기간 합계/건수
+        (period_total, period_count)를 집계 테이블에서 한 번의 쿼리로 함께 조회"""
+        from .rollups import range_filter
+
+        def rollup_sum(field, rollups):
+            subquery = rollups.filter(category=models.OuterRef('pk')).order_by().values(
+                'category'
+            ).annotate(value=models.Sum(field)).values('value')
+            output_field = TransactionRollup._meta.get_field(field)
+            return Coalesce(
+                models.Subquery(subquery, output_field=output_field),
+                models.Value(0),
+                output_field=output_field,
+            )
+
+        queryset = self.annotate(
+            transaction_count=rollup_sum('count', TransactionRollup.objects.filter(period='month'))
+        )
+        if start_date and end_date:
+            in_range = TransactionRollup.objects.filter(range_filter(start_date, end_date))
+            queryset = queryset.annotate(
+                period_total=rollup_sum('total', in_range),
+                period_count=rollup_sum('count', in_range),
+            )
+        return queryset
+
+
 class Category(models.Model):
     """거래 카테고리"""
     CATEGORY_TYPES = [
@@ -15,6 +48,9 @@ class Category(models.Model):
     icon = models.CharField(max_length=50, blank=True, help_text="아이콘 클래스명")
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='categories')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CategoryQuerySet.as_manager()
 
     class Meta:
         verbose_name = "카테고리"
@@ -38,7 +74,13 @@ class Transaction(models.Model):
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='transactions')
     description = models.TextField(blank=True, verbose_name="설명")
     date = models.DateField(verbose_name="날짜")
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='transactions')
+    # user 단독 인덱스는 아래 복합 인덱스들의 앞부분과 겹치므로 만들지 않음
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='transactions', db_index=False)
+    # 반복 규칙으로 만든 거래의 규칙과 발생일 (거래 날짜를 고쳐도 같은 발생일은 다시 만들지 않음)
+    recurring_rule = models.ForeignKey(
+        'RecurringRule', on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions',
+    )
+    occurrence_date = models.DateField(null=True, blank=True, verbose_name="반복 발생일")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -46,6 +88,27 @@ class Transaction(models.Model):
         verbose_name = "거래 내역"
         verbose_name_plural = "거래 내역"
         ordering = ['-date', '-created_at']
+        constraints = [
+            # 반복 거래 생성을 다시 실행해도 같은 발생일의 거래가 중복되지 않도록
+            # 주의: 연도별 파티션 테이블(transactions.partitioning)에서는 파티션 키(date)가 없어
+            # 연도 파티션마다 따로 걸린다. 날짜를 다른 연도로 고친 거래와의 중복은 막지 못하므로
+            # 전체 유일성은 materialize 가 규칙을 잠그고 기존 발생일을 먼저 거르는 것으로 보장한다.
+            models.UniqueConstraint(
+                fields=['recurring_rule', 'occurrence_date'],
+                condition=models.Q(recurring_rule__isnull=False),
+                name='txn_recurring_occurrence_uniq',
+            ),
+        ]
+        indexes = [
+            # 목록 조회(기간 필터 + 기본 정렬)
+            models.Index(fields=['user', '-date', '-created_at'], name='txn_user_date_idx'),
+            # 타입 필터, 전체 예산 사용 금액 (type='expense' + 기간)
+            models.Index(fields=['user', 'type', '-date', '-created_at'], name='txn_user_type_date_idx'),
+            # 카테고리 필터, 카테고리 예산 사용 금액
+            models.Index(fields=['user', 'category', '-date', '-created_at'], name='txn_user_category_date_idx'),
+            # 조건부 GET 검증값 (사용자별 최근 수정 시각)
+            models.Index(fields=['user', 'updated_at'], name='txn_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.amount}원"
@@ -54,4 +117,139 @@ class Transaction(models.Model):
         # 카테고리 타입과 거래 타입이 일치하는지 확인
         if self.category.type != self.type:
             raise ValueError("카테고리 타입과 거래 타입이 일치하지 않습니다.")
-        super().save(*args, **kwargs) 
\ No newline at end of file
+        # 집계 테이블 갱신(post_save 시그널)이 같은 트랜잭션에서 이루어지도록 묶음
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+
+class TransactionRollup(models.Model):
+    """사용자/기간/카테고리별 거래 집계 (transaction_stats 용)"""
+    PERIOD_CHOICES = [
+        ('day', '일별'),
+        ('month', '월별'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='transaction_rollups')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='rollups')
+    type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES, verbose_name="타입")
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES, verbose_name="집계 단위")
+    period_start = models.DateField(verbose_name="기간 시작일")
+    total = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="합계")
+    count = models.IntegerField(default=0, verbose_name="거래 수")
+
+    class Meta:
+        verbose_name = "거래 집계"
+        verbose_name_plural = "거래 집계"
+        unique_together = ['user', 'period', 'period_start', 'category', 'type']
+
+    def __str__(self):
+        return f"{self.user_id} {self.period} {self.period_start} - {self.total}원" 
+
+
+def _clamped(year, month, day):
+    """year-month 의 day 일 (그 달에 없는 날짜면 말일)"""
+    return date(year, month, min(day, monthrange(year, month)[1]))
+
+
+def _add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return index // 12, index % 12 + 1
+
+
+class RecurringRule(models.Model):
+    """반복 거래 규칙 (급여, 월세, 구독료 등)
+
+    materialize_recurring 명령이 next_run 이 지난 규칙들의 거래를 한 번에 만든다.
+    - weekly: start_date 의 요일에 interval 주마다
+    - monthly: interval 개월마다 day_of_month 일 (그 달에 없는 날짜면 말일)
+    - yearly: interval 년마다 start_date 의 달 day_of_month 일
+    """
+    FREQUENCY_CHOICES = [
+        ('weekly', '매주'),
+        ('monthly', '매월'),
+        ('yearly', '매년'),
+    ]
+
+    # 바뀌면 저장할 때 다음 발생일을 다시 계산하는 필드 (API, 관리자 화면 모두)
+    SCHEDULE_FIELDS = ('frequency', 'interval', 'day_of_month', 'start_date', 'end_date', 'is_active')
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='recurring_rules')
+    title = models.CharField(max_length=200, verbose_name="제목")
+    amount = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="금액")
+    type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES, verbose_name="타입")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='recurring_rules')
+    description = models.TextField(blank=True, verbose_name="설명")
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default='monthly', verbose_name="주기")
+    interval = models.PositiveSmallIntegerField(default=1, verbose_name="간격")
+    day_of_month = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name="날짜")
+    start_date = models.DateField(verbose_name="시작일")
+    end_date = models.DateField(null=True, blank=True, verbose_name="종료일")
+    # 아직 만들지 않은 다음 발생일 (종료되면 NULL)
+    next_run = models.DateField(null=True, blank=True, verbose_name="다음 발생일")
+    is_active = models.BooleanField(default=True, verbose_name="활성화")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "반복 거래"
+        verbose_name_plural = "반복 거래"
+        ordering = ['next_run', 'id']
+        indexes = [
+            # materialize_recurring 의 대상 규칙 조회
+            models.Index(fields=['is_active', 'next_run'], name='recurring_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.get_frequency_display()})"
+
+    def _day(self):
+        return self.day_of_month or self.start_date.day
+
+    def occurrence_on_or_after(self, day):
+        """day 이후(당일 포함) 첫 발생일 (종료일이 지나면 None)"""
+        day = max(day, self.start_date)
+        if self.frequency == 'weekly':
+            step = 7 * self.interval
+            occurrence = self.start_date + timedelta(days=-(-(day - self.start_date).days // step) * step)
+        else:
+            months = 12 * self.interval if self.frequency == 'yearly' else self.interval
+            elapsed = (day.year - self.start_date.year) * 12 + day.month - self.start_date.month
+            count = max(elapsed // months, 0)
+            while True:
+                occurrence = _clamped(*_add_months(self.start_date, count * months), self._day())
+                if occurrence >= day:
+                    break
+                count += 1
+        if self.end_date and occurrence > self.end_date:
+            return None
+        return occurrence
+
+    def occurrences(self, until):
+        """next_run 부터 until 까지(당일 포함)의 발생일 목록"""
+        dates = []
+        day = self.occurrence_on_or_after(self.next_run) if self.next_run else None
+        while day is not None and day <= until:
+            dates.append(day)
+            day = self.occurrence_on_or_after(day + timedelta(days=1))
+        return dates
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # only()/defer() 로 일정 필드 일부만 읽은 경우는 비교하지 않음
+        if not instance.get_deferred_fields().intersection(cls.SCHEDULE_FIELDS):
+            instance._loaded_schedule = instance._schedule()
+        return instance
+
+    def _schedule(self):
+        return tuple(getattr(self, name) for name in self.SCHEDULE_FIELDS)
+
+    def save(self, *args, **kwargs):
+        if not self.pk:
+            if self.next_run is None and self.is_active:
+                self.next_run = self.occurrence_on_or_after(self.start_date)
+        elif getattr(self, '_loaded_schedule', None) not in (None, self._schedule()):
+            # 일정이 바뀌거나 다시 활성화되면 오늘 이후의 발생일부터 (지난 발생일은 만들지 않음)
+            self.next_run = self.occurrence_on_or_after(date.today()) if self.is_active else None
+        super().save(*args, **kwargs)
+        self._loaded_schedule = self._schedule()
@@ -0,0 +1,104 @@
+import base64
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class TransactionPageNumberPagination(PageNumberPagination):
+    """기존 페이지 번호 방식 (page_size 파라미터 허용)"""
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class TransactionCursorPagination(BasePagination):
+    """(date, created_at, id) 키셋 기반 커서 페이지네이션
+
+    COUNT(*) 와 OFFSET 없이 마지막으로 본 행 다음부터 인덱스를 따라 읽으므로
+    깊은 페이지도 첫 페이지와 같은 비용이 들고, 조회 중에 거래가 추가되어도
+    이미 본 행이 다시 나오거나 건너뛰어지지 않는다.
+    검색(search) 결과도 이 순서로 정렬되므로 관련도 순서는 적용되지 않는다.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    # Transaction.Meta.ordering 에 id 를 더해 순서를 유일하게 만듦
+    ordering = ('-date', '-created_at', '-id')
+    invalid_cursor_message = '유효하지 않은 커서입니다.'
+
+    @classmethod
+    def requested(cls, request):
+        """cursor 파라미터가 있거나 pagination=cursor 로 요청했는지 여부"""
+        params = request.query_params
+        return cls.cursor_query_param in params or params.get('pagination') == 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            date, created_at, pk = position
+            queryset = queryset.filter(
+                Q(date__lt=date)
+                | Q(date=date, created_at__lt=created_at)
+                | Q(date=date, created_at=created_at, id__lt=pk)
+            )
+
+        results = list(queryset[:page_size + 1])
+        self.has_next = len(results) > page_size
+        results = results[:page_size]
+        self.next_position = None
+        if self.has_next:
+            last = results[-1]
+            self.next_position = (last.date, last.created_at, last.pk)
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = remove_query_param(self.base_url, 'pagination')
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def encode_cursor(self, position):
+        date, created_at, pk = position
+        raw = f'{date.isoformat()}|{created_at.isoformat()}|{pk}'
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode()).decode()
+            date, created_at, pk = raw.split('|')
+            position = (parse_date(date), parse_datetime(created_at), int(pk))
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise ValidationError({'error': self.invalid_cursor_message})
+        # 범위를 벗어난 id 는 쿼리 실행 중 오류가 나므로 미리 거름
+        if None in position or not 0 < position[2] < 2 ** 63:
+            raise ValidationError({'error': self.invalid_cursor_message})
+        return position
@@ -0,0 +1,204 @@
+"""거래 테이블의 연도별 파티셔닝 (PostgreSQL 전용, 선택)
+
+TRANSACTION_PARTITIONING=True 인 PostgreSQL 에서는 transactions_transaction 을
+date 기준 RANGE 파티션 테이블(연도별 transactions_transaction_yYYYY + default)로 바꾼다.
+날짜 범위 조건이 있는 쿼리(예산 사용 금액, 기간 필터가 있는 목록/내보내기, 집계 재계산)는
+해당 연도의 파티션만 읽는다. SQLite 등 다른 DB 에서는 아무것도 하지 않는다.
+
+파티션 테이블의 제약 때문에 달라지는 점
+- 기본 키는 (id, date) 이다. (id 는 계속 시퀀스로 유일하게 발급됨)
+- 반복 거래 발생일 유일 제약(txn_recurring_occurrence_uniq)은 파티션마다 따로 건다.
+  같은 연도 안의 중복만 DB 가 막고, 날짜를 다른 연도로 고친 거래와의 중복은
+  materialize 가 규칙을 잠그고 기존 발생일을 먼저 확인하는 것으로 막는다.
+
+partition_transactions 명령으로 앞으로 쓸 연도의 파티션을 미리 만든다. 파티션이 없는
+날짜의 거래는 default 파티션에 들어가고, 나중에 그 연도 파티션을 만들 때 옮겨진다.
+"""
+from datetime import date
+
+# convert / unpartition 의 SQL 은 0007 마이그레이션에 복사되어 있음 (이미 적용된 DB 에는 반영되지 않음)
+TABLE = 'transactions_transaction'
+DEFAULT_PARTITION = f'{TABLE}_default'
+PRIMARY_KEY = f'{TABLE}_pkey'
+RECURRING_UNIQUE = 'txn_recurring_occurrence_uniq'
+
+
+def partition_name(year):
+    return f'{TABLE}_y{year}'
+
+
+def is_supported(connection):
+    return connection.vendor == 'postgresql'
+
+
+def is_partitioned(connection):
+    if not is_supported(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid '
+            'WHERE c.oid = to_regclass(%s)',
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def partitions(connection):
+    """(파티션 이름, 예상 행 수) 목록 (통계 기반 추정치, ANALYZE 후 정확해짐)"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname, c.reltuples::bigint FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname',
+            [TABLE],
+        )
+        return [(name, max(rows, 0)) for name, rows in cursor.fetchall()]
+
+
+def _recurring_unique_sql(table):
+    return (
+        f'CREATE UNIQUE INDEX IF NOT EXISTS {table}_recurring_uniq ON {table} '
+        f'(recurring_rule_id, occurrence_date) WHERE recurring_rule_id IS NOT NULL'
+    )
+
+
+def _table_definition(cursor, table):
+    """테이블의 인덱스(기본 키 제외)와 외래 키 정의"""
+    cursor.execute(
+        'SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s',
+        [table],
+    )
+    # 파티션 테이블의 인덱스 정의는 'ON ONLY' 로 나오므로 일반 CREATE INDEX 로 바꿈
+    indexes = [
+        (name, sql.replace(' ON ONLY ', ' ON ', 1)) for name, sql in cursor.fetchall() if name != PRIMARY_KEY
+    ]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = to_regclass(%s) "
+        "AND contype = 'f'",
+        [table],
+    )
+    return indexes, cursor.fetchall()
+
+
+def _like(name, *, identity=False):
+    identity = ' INCLUDING IDENTITY' if identity else ''
+    return f'CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE{identity})'
+
+
+def _swap(cursor, create, primary_key):
+    """create(임시 이름) 가 돌려주는 문장들로 같은 컬럼의 새 테이블을 만들어 데이터를 옮기고 기존 테이블과 바꿈
+
+    일반 인덱스와 외래 키는 같은 이름으로 다시 만든다. 유일 인덱스(기본 키 제외)는
+    호출하는 쪽에서 다시 만든다.
+    """
+    staging = f'{TABLE}_staging'
+    cursor.execute(f'LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE')
+    indexes, foreign_keys = _table_definition(cursor, TABLE)
+
+    for sql in create(staging):
+        cursor.execute(sql)
+    cursor.execute(f'INSERT INTO {staging} OVERRIDING SYSTEM VALUE SELECT * FROM {TABLE}')
+    # 이 테이블을 참조하는 외래 키가 있으면 여기서 실패하고 전체가 롤백됨
+    cursor.execute(f'DROP TABLE {TABLE}')
+    cursor.execute(f'ALTER TABLE {staging} RENAME TO {TABLE}')
+    cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {PRIMARY_KEY} PRIMARY KEY ({primary_key})')
+
+    for name, sql in indexes:
+        if not sql.startswith('CREATE UNIQUE INDEX'):
+            cursor.execute(sql)
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) "
+        f'FROM {TABLE}'
+    )
+    cursor.execute(f'ANALYZE {TABLE}')
+
+
+def _partition_sql(year, parent=TABLE):
+    return (
+        f"CREATE TABLE {partition_name(year)} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+    )
+
+
+def convert(connection, years_ahead=2):
+    """기존 거래 테이블을 연도별 파티션 테이블로 변환 (이미 파티션 테이블이면 False)
+
+    테이블 전체를 복사하는 동안 쓰기를 막으므로 점검 시간에 실행한다.
+    호출하는 쪽의 트랜잭션(마이그레이션 등) 안에서 실행해야 실패 시 원래대로 돌아간다.
+    """
+    if not is_supported(connection) or is_partitioned(connection):
+        return False
+
+    with connection.cursor() as cursor:
+        indexes, _ = _table_definition(cursor, TABLE)
+        unique = {name for name, sql in indexes if sql.startswith('CREATE UNIQUE INDEX')} - {RECURRING_UNIQUE}
+        if unique:
+            # 파티션 키(date)를 포함하지 않는 유일 인덱스는 파티션 테이블에 걸 수 없음
+            raise ValueError(f'파티션 테이블로 옮길 수 없는 유일 인덱스가 있습니다: {", ".join(sorted(unique))}')
+
+        cursor.execute(f'SELECT EXTRACT(YEAR FROM MIN(date))::int, EXTRACT(YEAR FROM MAX(date))::int FROM {TABLE}')
+        first, last = cursor.fetchone()
+        this_year = date.today().year
+        years = range(min(first or this_year, this_year), max(last or this_year, this_year + years_ahead) + 1)
+
+        def create(name):
+            yield _like(name, identity=True) + ' PARTITION BY RANGE (date)'
+            yield f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {name} DEFAULT'
+            for year in years:
+                yield _partition_sql(year, parent=name)
+
+        _swap(cursor, create, 'id, date')
+        for name in [DEFAULT_PARTITION, *map(partition_name, years)]:
+            cursor.execute(_recurring_unique_sql(name))
+    return True
+
+
+def unpartition(connection):
+    """파티션 테이블을 일반 테이블로 되돌림 (파티션 테이블이 아니면 False)"""
+    if not is_partitioned(connection):
+        return False
+
+    with connection.cursor() as cursor:
+        # 파티션별 유일 인덱스는 파티션과 함께 지워지므로 원래의 부분 유일 인덱스를 다시 만듦
+        _swap(cursor, lambda name: [_like(name, identity=True)], 'id')
+        cursor.execute(
+            f'CREATE UNIQUE INDEX {RECURRING_UNIQUE} ON {TABLE} (recurring_rule_id, occurrence_date) '
+            f'WHERE recurring_rule_id IS NOT NULL'
+        )
+    return True
+
+
+def create_partition(connection, year):
+    """year 연도 파티션을 만들고 default 파티션에 들어가 있던 그 연도 거래를 옮김 (이미 있으면 False)"""
+    name = partition_name(year)
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s)', [name])
+        if cursor.fetchone()[0] is not None:
+            return False
+
+        start, end = f'{year}-01-01', f'{year + 1}-01-01'
+        cursor.execute(_like(name))
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE date >= %s AND date < %s RETURNING *) '
+            f'INSERT INTO {name} SELECT * FROM moved',
+            [start, end],
+        )
+        # 부모의 기본 키/인덱스/외래 키는 ATTACH 할 때 파티션에 만들어짐
+        cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')")
+        cursor.execute(_recurring_unique_sql(name))
+    return True
+
+
+def ensure_partitions(connection, years_ahead=2):
+    """올해부터 years_ahead 년 뒤까지, 그리고 default 파티션에 들어간 거래의 연도 파티션을 만들고
+    새로 만든 연도 목록을 반환"""
+    if not is_partitioned(connection):
+        return []
+    this_year = date.today().year
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT DISTINCT EXTRACT(YEAR FROM date)::int FROM {DEFAULT_PARTITION}')
+        years = {year for year, in cursor.fetchall()}
+    years.update(range(this_year, this_year + years_ahead + 1))
+    return [year for year in sorted(years) if create_partition(connection, year)]
@@ -0,0 +1,77 @@
+"""반복 거래 규칙(RecurringRule)의 발생일 거래 생성
+
+next_run 이 지난 규칙들을 나눠서 읽고, 규칙마다 밀린 발생일 전체의 거래를 만든 뒤
+bulk_create_transactions 한 번으로 저장한다. (집계/검색/예산 스냅샷/동기화 기록도 한 번에 반영)
+이미 만든 발생일은 (recurring_rule, occurrence_date) 로 미리 걸러내고, 같은 키에
+유일 제약이 있으므로 동시에 실행되거나 중간에 실패한 뒤 다시 실행해도 중복되지 않는다.
+
+거래 테이블이 연도별 파티션 테이블이면 유일 제약이 연도 파티션마다 따로 걸리므로
+(날짜를 다른 연도로 고친 거래는 제약에 걸리지 않음) 규칙 행 잠금과 기존 발생일 확인이
+유일한 보장이다. 반복 거래는 반드시 materialize 로만 만든다.
+"""
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from .bulk import bulk_create_transactions
+from .models import RecurringRule, Transaction
+
+
+def due_rules(today):
+    return RecurringRule.objects.filter(is_active=True, next_run__lte=today)
+
+
+def _materialize_chunk(rules, today, batch_size):
+    # 거래 날짜와 관계없이 발생일로 확인 (파티션 테이블에서는 유일 제약이 연도 파티션 안에서만 걸림)
+    existing = set(
+        Transaction.objects.filter(
+            recurring_rule__in=rules, occurrence_date__gte=min(rule.next_run for rule in rules),
+        ).values_list('recurring_rule_id', 'occurrence_date')
+    )
+
+    transactions = []
+    for rule in rules:
+        occurrences = rule.occurrences(today)
+        for occurrence in occurrences:
+            if (rule.pk, occurrence) in existing:
+                continue
+            transactions.append(Transaction(
+                user_id=rule.user_id, category=rule.category, title=rule.title, amount=rule.amount,
+                type=rule.type, description=rule.description, date=occurrence,
+                recurring_rule=rule, occurrence_date=occurrence,
+            ))
+        # 마지막 발생일 다음 날 이후의 첫 발생일 (종료일이 지나면 None 이 되어 더 이상 대상이 아님)
+        # next_run 이 발생일이 아니거나 종료일 뒤라서 만들 것이 없으면 오늘 다음 날부터 다시 계산
+        last = occurrences[-1] if occurrences else today
+        rule.next_run = rule.occurrence_on_or_after(last + timedelta(days=1))
+
+    created = bulk_create_transactions(transactions, batch_size=batch_size)
+    RecurringRule.objects.bulk_update(rules, ['next_run'], batch_size=batch_size)
+    return created
+
+
+def materialize(today=None, rules=None, chunk_size=500, batch_size=500):
+    """today 까지 밀린 반복 거래를 만들고 (처리한 규칙 수, 만든 거래 수) 반환
+
+    rules 를 주면 그 queryset 안의 규칙만 처리한다.
+    """
+    today = today or date.today()
+    due = due_rules(today)
+    if rules is not None:
+        due = due.filter(pk__in=rules.values('pk'))
+
+    processed = created = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            # 다른 프로세스가 처리 중인 규칙은 건너뜀 (PostgreSQL, SQLite 는 쓰기 잠금으로 직렬화됨)
+            chunk = list(
+                due.filter(pk__gt=last_pk).order_by('pk').select_related('category')
+                .select_for_update(skip_locked=True, of=('self',))[:chunk_size]
+            )
+            if not chunk:
+                break
+            created += len(_materialize_chunk(chunk, today, batch_size))
+        processed += len(chunk)
+        last_pk = chunk[-1].pk
+    return processed, created
@@ -0,0 +1,253 @@
+"""거래 집계(TransactionRollup) 유지 및 조회"""
+import threading
+from calendar import monthrange
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import Transaction, TransactionRollup
+
+PERIODS = ('day', 'month')
+
+ROW_FIELDS = ('user_id', 'category_id', 'type', 'date', 'amount')
+
+_deferred = threading.local()
+
+
+def _first_of_next_month(day):
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _period_start(period, day):
+    return day if period == 'day' else day.replace(day=1)
+
+
+def row_for(instance):
+    """집계에 필요한 거래 값 (user_id, category_id, type, date, amount)"""
+    return (
+        instance.user_id,
+        instance.category_id,
+        instance.type,
+        Transaction._meta.get_field('date').to_python(instance.date),
+        Transaction._meta.get_field('amount').to_python(instance.amount),
+    )
+
+
+def collect_deltas(rows, sign=1, deltas=None):
+    """거래 값 목록을 집계 키별 (합계, 개수) 변화량으로 모음"""
+    if deltas is None:
+        deltas = {}
+    for user_id, category_id, type_, day, amount in rows:
+        for period in PERIODS:
+            key = (user_id, period, _period_start(period, day), category_id, type_)
+            total, count = deltas.get(key, (Decimal('0'), 0))
+            deltas[key] = (total + sign * Decimal(amount), count + sign)
+    return deltas
+
+
+# 변화량이 이보다 많으면 행별 UPDATE 대신 한 번에 읽고 bulk_update/bulk_create 로 반영
+BULK_THRESHOLD = 20
+
+
+@contextmanager
+def deferred():
+    """블록 안에서 발생한 집계 변화량을 모아 두었다가 끝날 때 한 번에 반영
+
+    queryset.delete() 처럼 행마다 post_delete 가 발생하는 작업을 감싸면
+    행별 UPDATE 대신 한 번의 일괄 반영으로 끝난다.
+    """
+    if getattr(_deferred, 'deltas', None) is not None:
+        yield
+        return
+
+    _deferred.deltas = {}
+    try:
+        yield
+        deltas = _deferred.deltas
+    finally:
+        _deferred.deltas = None
+    apply_deltas(deltas)
+
+
+def apply_deltas(deltas):
+    """변화량을 집계 테이블에 반영 (호출하는 쪽의 트랜잭션 안에서 실행)"""
+    pending = getattr(_deferred, 'deltas', None)
+    if pending is not None:
+        for key, (total, count) in deltas.items():
+            pending_total, pending_count = pending.get(key, (Decimal('0'), 0))
+            pending[key] = (pending_total + total, pending_count + count)
+        return
+
+    deltas = {key: value for key, value in deltas.items() if value[0] or value[1]}
+    if len(deltas) > BULK_THRESHOLD:
+        try:
+            with transaction.atomic():
+                _apply_bulk(deltas)
+            return
+        except IntegrityError:
+            # 동시에 다른 요청이 같은 집계 행을 만든 경우 행 단위로 다시 반영
+            pass
+
+    for key, (total, count) in deltas.items():
+        _apply_one(key, total, count)
+
+
+def _apply_one(key, total, count):
+    user_id, period, start, category_id, type_ = key
+    rollups = TransactionRollup.objects.filter(
+        user_id=user_id, period=period, period_start=start,
+        category_id=category_id, type=type_,
+    )
+    changes = {'total': F('total') + total, 'count': F('count') + count}
+    if rollups.update(**changes):
+        if count < 0:
+            rollups.filter(count__lte=0).delete()
+        return
+
+    # 감소분인데 행이 없다면 이미 함께 삭제된 집계 (카테고리 CASCADE 등)
+    if count <= 0:
+        return
+
+    try:
+        with transaction.atomic():
+            TransactionRollup.objects.create(
+                user_id=user_id, period=period, period_start=start,
+                category_id=category_id, type=type_, total=total, count=count,
+            )
+    except IntegrityError:
+        # 동시에 다른 요청이 같은 집계 행을 만든 경우
+        rollups.update(**changes)
+
+
+def _apply_bulk(deltas):
+    starts = [key[2] for key in deltas]
+    existing = TransactionRollup.objects.select_for_update().filter(
+        user_id__in={key[0] for key in deltas},
+        category_id__in={key[3] for key in deltas},
+        period_start__gte=min(starts),
+        period_start__lte=max(starts),
+    )
+    by_key = {
+        (r.user_id, r.period, r.period_start, r.category_id, r.type): r
+        for r in existing
+    }
+
+    to_update, to_create, to_delete = [], [], []
+    for key, (total, count) in deltas.items():
+        rollup = by_key.get(key)
+        if rollup is None:
+            if count > 0:
+                user_id, period, start, category_id, type_ = key
+                to_create.append(TransactionRollup(
+                    user_id=user_id, period=period, period_start=start,
+                    category_id=category_id, type=type_, total=total, count=count,
+                ))
+            continue
+        rollup.total += total
+        rollup.count += count
+        if rollup.count <= 0:
+            to_delete.append(rollup.pk)
+        else:
+            to_update.append(rollup)
+
+    TransactionRollup.objects.bulk_update(to_update, ['total', 'count'], batch_size=500)
+    TransactionRollup.objects.bulk_create(to_create, batch_size=500)
+    if to_delete:
+        TransactionRollup.objects.filter(pk__in=to_delete).delete()
+
+
+def record(rows, sign=1):
+    """거래 값 목록을 집계에 더하거나(sign=1) 뺌(sign=-1)"""
+    apply_deltas(collect_deltas(rows, sign))
+
+
+def range_filter(start, end):
+    """[start, end] 구간을 덮는 집계 행 조건
+
+    구간 안에 온전히 포함된 달은 월별 집계를, 나머지 앞뒤 자투리 날짜는
+    일별 집계를 사용하므로 기간이 길어도 읽는 행 수가 크게 늘지 않는다.
+    """
+    days = Q(period='day', period_start__gte=start, period_start__lte=end)
+
+    first_full = start if start.day == 1 else _first_of_next_month(start)
+    if end.day == monthrange(end.year, end.month)[1]:
+        last_full = end.replace(day=1)
+    else:
+        last_full = (end.replace(day=1) - timedelta(days=1)).replace(day=1)
+
+    if first_full > last_full:
+        return days
+
+    full_end = _first_of_next_month(last_full) - timedelta(days=1)
+    months = Q(period='month', period_start__gte=first_full, period_start__lte=last_full)
+    return months | (days & (Q(period_start__lt=first_full) | Q(period_start__gt=full_end)))
+
+
+def compute_rows(transactions):
+    """거래 queryset 으로부터 집계 키별 (합계, 개수)를 새로 계산"""
+    rows = {}
+
+    daily = transactions.values('user_id', 'category_id', 'type', 'date').annotate(
+        total=Sum('amount'), count=Count('id')
+    ).order_by()
+    for row in daily:
+        key = (row['user_id'], 'day', row['date'], row['category_id'], row['type'])
+        rows[key] = (row['total'], row['count'])
+
+    monthly = transactions.annotate(month=TruncMonth('date')).values(
+        'user_id', 'category_id', 'type', 'month'
+    ).annotate(
+        total=Sum('amount'), count=Count('id')
+    ).order_by()
+    for row in monthly:
+        month = row['month']
+        if not isinstance(month, date):
+            month = month.date()
+        key = (row['user_id'], 'month', month, row['category_id'], row['type'])
+        rows[key] = (row['total'], row['count'])
+
+    return rows
+
+
+def stored_rows(rollups):
+    """집계 테이블에 저장된 키별 (합계, 개수)"""
+    return {
+        (r.user_id, r.period, r.period_start, r.category_id, r.type): (r.total, r.count)
+        for r in rollups
+    }
+
+
+def find_drift(expected, actual):
+    """기대값과 저장값이 다른 집계 키 목록"""
+    drift = []
+    for key in expected.keys() | actual.keys():
+        if expected.get(key, (0, 0)) != actual.get(key, (0, 0)):
+            drift.append((key, expected.get(key), actual.get(key)))
+    return sorted(drift, key=lambda item: tuple(str(part) for part in item[0]))
+
+
+def rebuild(user_ids, check_only=False):
+    """주어진 사용자들의 집계를 원본 거래로부터 다시 계산하고 어긋난 항목을 반환"""
+    expected = compute_rows(Transaction.objects.filter(user_id__in=user_ids))
+    rollups = TransactionRollup.objects.filter(user_id__in=user_ids)
+    drift = find_drift(expected, stored_rows(rollups))
+
+    if drift and not check_only:
+        with transaction.atomic():
+            rollups.delete()
+            TransactionRollup.objects.bulk_create(
+                [
+                    TransactionRollup(
+                        user_id=user_id, period=period, period_start=start,
+                        category_id=category_id, type=type_, total=total, count=count,
+                    )
+                    for (user_id, period, start, category_id, type_), (total, count) in expected.items()
+                ],
+                batch_size=1000,
+            )
+
+    return drift
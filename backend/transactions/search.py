@@ -0,0 +1,91 @@
+"""거래 제목/설명 검색
+
+- PostgreSQL: icontains 가 만드는 UPPER(컬럼) LIKE 조건을 같은 식의 pg_trgm GIN 인덱스로
+  가속하고 trigram 유사도로 순위를 매김
+- SQLite: trigram 토크나이저 FTS5 테이블(시그널로 동기화)을 검색하고 bm25 로 순위를 매김
+
+trigram 방식이라 띄어쓰기 없는 한국어 문장 중간의 단어도 찾을 수 있다.
+"""
+from django.db import connections
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+
+from .models import Transaction
+
+FTS_TABLE = 'transactions_transaction_fts'
+
+# trigram 인덱스는 3글자 이상의 검색어부터 사용할 수 있음
+MIN_INDEXED_LENGTH = 3
+
+
+class FtsRank(Func):
+    """거래의 FTS 검색 순위 (bm25, 작을수록 관련도 높음, SQLite 전용)"""
+    template = f'(SELECT bm25({FTS_TABLE}) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %(expressions)s)'
+    arg_joiner = ' AND rowid = '
+    output_field = FloatField()
+
+    def __init__(self, phrase):
+        super().__init__(Value(phrase), F('id'))
+
+
+def icontains_search(queryset, query):
+    """인덱스를 사용하지 않는 기존 검색 (제목/설명 부분 일치)"""
+    return queryset.filter(Q(title__icontains=query) | Q(description__icontains=query))
+
+
+def search_transactions(queryset, query):
+    """검색어와 일치하는 거래를 관련도 순으로 정렬해 반환 (다른 필터와 함께 사용 가능)
+
+    커서 페이지네이션은 (date, created_at, id) 키셋으로 다시 정렬하므로
+    cursor 모드의 검색 결과는 관련도 순이 아니라 최신순이다.
+    """
+    query = query.strip()
+    vendor = connections[queryset.db].vendor
+    if len(query) < MIN_INDEXED_LENGTH or vendor not in ('postgresql', 'sqlite'):
+        return icontains_search(queryset, query)
+
+    ordering = Transaction._meta.ordering
+    if vendor == 'postgresql':
+        # psycopg 가 있어야 import 되므로 PostgreSQL 일 때만 불러옴
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        return icontains_search(queryset, query).annotate(
+            search_rank=Greatest(
+                TrigramWordSimilarity(query, 'title'),
+                TrigramWordSimilarity(query, 'description'),
+            )
+        ).order_by('-search_rank', *ordering)
+
+    # 검색어 전체를 하나의 구문으로 취급 (FTS5 쿼리 문법 무력화)
+    phrase = '"{}"'.format(query.replace('"', '""'))
+    matches = RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [phrase])
+    return queryset.filter(id__in=matches).annotate(
+        search_rank=FtsRank(phrase)
+    ).order_by('search_rank', *ordering)
+
+
+def _uses_fts(using):
+    return connections[using].vendor == 'sqlite'
+
+
+def index_transactions(transactions, using='default'):
+    """거래들의 제목/설명을 FTS 테이블에 반영 (SQLite 전용, 다른 DB 에서는 무시)"""
+    if not _uses_fts(using):
+        return
+    rows = [(t.pk, t.title, t.description) for t in transactions]
+    if not rows:
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)', rows
+        )
+
+
+def unindex_transactions(pks, using='default'):
+    """삭제된 거래를 FTS 테이블에서 제거 (SQLite 전용)"""
+    if not _uses_fts(using) or not pks:
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in pks])
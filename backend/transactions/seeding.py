@@ -0,0 +1,181 @@
+"""벤치마크/부하 테스트용 합성 거래 데이터 생성"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction as db_transaction
+
+from accounts.models import Profile
+from budgets import snapshots
+from budgets.models import Budget
+from sync import changelog
+
+from . import rollups, search
+from .models import Category, Transaction
+
+INCOME_CATEGORIES = [
+    ('급여', '#10B981', 'money'),
+    ('용돈', '#F59E0B', 'gift'),
+    ('부업', '#8B5CF6', 'briefcase'),
+]
+
+EXPENSE_CATEGORIES = [
+    ('식비', '#EF4444', 'utensils'),
+    ('교통비', '#3B82F6', 'car'),
+    ('쇼핑', '#EC4899', 'shopping-bag'),
+    ('문화생활', '#F97316', 'film'),
+    ('의료비', '#84CC16', 'heart'),
+    ('교육', '#6366F1', 'book'),
+]
+
+EXPENSE_TITLES = ['점심 식사', '커피', '지하철', '택시', '마트 장보기', '영화', '병원', '온라인 강의', '편의점']
+INCOME_TITLES = ['월급', '용돈', '프리랜서 수입', '중고 판매']
+
+
+def create_users(emails, password_hash=None):
+    """합성 사용자와 프로필을 bulk_create 로 만들고 사용자 목록을 반환 (username 은 이메일 앞부분)
+
+    password_hash 는 make_password 결과이며, 주지 않으면 로그인할 수 없는 비밀번호가 된다.
+    """
+    User = get_user_model()
+    password_hash = password_hash or make_password(None)
+    users = User.objects.bulk_create([
+        User(email=email, username=email.split('@')[0], password=password_hash) for email in emails
+    ])
+    Profile.objects.bulk_create([Profile(user=user) for user in users])
+    return users
+
+
+def create_categories(user):
+    """기본 수입/지출 카테고리를 만들고 타입별 목록을 반환"""
+    categories = {'income': [], 'expense': []}
+    for type_, specs in (('income', INCOME_CATEGORIES), ('expense', EXPENSE_CATEGORIES)):
+        for name, color, icon in specs:
+            category, _ = Category.objects.get_or_create(
+                user=user, name=name, type=type_, defaults={'color': color, 'icon': icon}
+            )
+            categories[type_].append(category)
+    return categories
+
+
+def build_transactions(user, categories, count, end=None, days=3 * 365, income_ratio=0.1, rng=None):
+    """저장하지 않은 Transaction 객체를 count 개 생성 (seed 가 같으면 같은 결과)"""
+    rng = rng or random.Random(0)
+    end = end or date.today()
+    for _ in range(count):
+        if rng.random() < income_ratio:
+            type_, title = 'income', rng.choice(INCOME_TITLES)
+            amount = Decimal(rng.randrange(100_000, 5_000_000, 1000))
+        else:
+            type_, title = 'expense', rng.choice(EXPENSE_TITLES)
+            amount = Decimal(rng.randrange(1_000, 200_000, 100))
+        yield Transaction(
+            user=user,
+            category=rng.choice(categories[type_]),
+            type=type_,
+            title=title,
+            description=f'{title} 메모 {rng.randrange(10_000)}',
+            amount=amount,
+            date=end - timedelta(days=rng.randrange(days)),
+        )
+
+
+def seed_ledger(user, count, seed=0, days=3 * 365, chunk_size=2000):
+    """user 에게 카테고리와 거래 count 개를 bulk_create 로 생성하고 집계를 맞춤"""
+    rng = random.Random(seed)
+    categories = create_categories(user)
+
+    def flush(batch):
+        created = Transaction.objects.bulk_create(batch)
+        search.index_transactions(created)
+        changelog.record('transaction', created)
+
+    batch = []
+    for transaction in build_transactions(user, categories, count, days=days, rng=rng):
+        batch.append(transaction)
+        if len(batch) >= chunk_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    # bulk_create 는 시그널을 보내지 않으므로 집계를 한 번에 다시 계산
+    rollups.rebuild([user.pk])
+    return categories
+
+
+def build_categories(user, expense_categories=len(EXPENSE_CATEGORIES)):
+    """저장하지 않은 기본 수입 카테고리와 앞에서부터 expense_categories 개의 지출 카테고리"""
+    specs = [('income', spec) for spec in INCOME_CATEGORIES]
+    specs += [('expense', spec) for spec in EXPENSE_CATEGORIES[:expense_categories]]
+    return [
+        Category(user=user, name=name, type=type_, color=color, icon=icon)
+        for type_, (name, color, icon) in specs
+    ]
+
+
+def build_budgets(user, expense_categories, count, end, rng):
+    """저장하지 않은 이번 달 예산 count 개 (전체 예산 1개 + 지출 카테고리 예산)"""
+    start = end.replace(day=1)
+    month_end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    budgets = []
+    if count:
+        budgets.append(Budget(
+            user=user, name='이번 달 전체', amount=Decimal(rng.randrange(1_000_000, 5_000_000, 10_000)),
+            start_date=start, end_date=month_end,
+        ))
+    for category in rng.sample(expense_categories, min(max(count - 1, 0), len(expense_categories))):
+        budgets.append(Budget(
+            user=user, name=f'{category.name} 예산', category=category,
+            amount=Decimal(rng.randrange(100_000, 1_000_000, 10_000)), start_date=start, end_date=month_end,
+        ))
+    return budgets
+
+
+def seed_users(count, prefix='load', seed=0, per_month=30, spread=0.5, months=12, income_ratio=0.1,
+               expense_categories=len(EXPENSE_CATEGORIES), budgets=3, password=None, end=None,
+               users_per_chunk=200, batch_size=5000, progress=None):
+    """합성 사용자 count 명과 각자의 카테고리/거래/예산을 사용자 묶음 단위 bulk_create 로 생성
+
+    사용자 i 의 데이터는 (seed, i) 로만 정해지므로 seed 와 end 가 같으면 같은 데이터가 만들어진다.
+    사용자별 거래 수는 per_month x months 에 ±spread 비율의 차이를 둔다.
+    """
+    end = end or date.today()
+    # 모든 사용자가 같은 비밀번호를 쓰므로 해시는 한 번만 계산
+    password_hash = make_password(password)
+
+    for chunk_start in range(0, count, users_per_chunk):
+        indexes = range(chunk_start, min(count, chunk_start + users_per_chunk))
+        with db_transaction.atomic():
+            users = create_users([f'{prefix}-{index:06d}@example.com' for index in indexes], password_hash)
+            categories = Category.objects.bulk_create(
+                [category for user in users for category in build_categories(user, expense_categories)]
+            )
+            by_user = {}
+            for category in categories:
+                by_user.setdefault(category.user_id, {'income': [], 'expense': []})[category.type].append(category)
+
+            transactions, user_budgets = [], []
+            for index, user in zip(indexes, users):
+                rng = random.Random(seed * 1_000_003 + index)
+                density = rng.uniform(1 - spread, 1 + spread)
+                transactions.extend(build_transactions(
+                    user, by_user[user.pk], max(1, round(per_month * months * density)),
+                    end=end, days=months * 30, income_ratio=income_ratio, rng=rng,
+                ))
+                user_budgets.extend(build_budgets(user, by_user[user.pk]['expense'], budgets, end, rng))
+
+            created = Transaction.objects.bulk_create(transactions, batch_size=batch_size)
+            search.index_transactions(created)
+            user_budgets = Budget.objects.bulk_create(user_budgets, batch_size=batch_size)
+            changelog.record('category', categories)
+            changelog.record('transaction', created)
+            changelog.record('budget', user_budgets)
+            # bulk_create 는 시그널을 보내지 않으므로 집계를 한 번에 다시 계산
+            rollups.rebuild([user.pk for user in users])
+            snapshots.refresh(Budget.objects.filter(pk__in=[budget.pk for budget in user_budgets]))
+
+        if progress:
+            progress(indexes.stop, len(created))
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Category, Transaction
+from .models import Category, RecurringRule, Transaction
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -12,9 +12,21 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created_at')
 
     def get_transaction_count(self, obj):
-        """해당 카테고리의 거래 개수 반환"""
+        """해당 카테고리의 거래 개수 반환 (with_stats 로 조회했다면 추가 쿼리 없음)"""
+        if hasattr(obj, 'transaction_count'):
+            return obj.transaction_count
         return obj.transactions.count()
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # 기간을 지정해 조회한 경우 기간 합계/건수도 포함
+        if hasattr(instance, 'period_total'):
+            data['period_total'] = serializers.DecimalField(
+                max_digits=15, decimal_places=2
+            ).to_representation(instance.period_total)
+            data['period_count'] = instance.period_count
+        return data
+
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
@@ -31,9 +43,9 @@ class TransactionSerializer(serializers.ModelSerializer):
         fields = (
             'id', 'title', 'amount', 'type', 'category', 'category_name', 
             'category_color', 'category_icon', 'description', 'date', 
-            'created_at', 'updated_at'
+            'recurring_rule', 'created_at', 'updated_at'
         )
-        read_only_fields = ('id', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'recurring_rule', 'created_at', 'updated_at')
 
     def validate_category(self, value):
         """카테고리가 현재 사용자의 것인지 확인"""
@@ -60,11 +72,68 @@ class TransactionSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class RecurringRuleSerializer(serializers.ModelSerializer):
+    """반복 거래 규칙 시리얼라이저"""
+    category_name = serializers.CharField(source='category.name', read_only=True)
+
+    class Meta:
+        model = RecurringRule
+        fields = (
+            'id', 'title', 'amount', 'type', 'category', 'category_name', 'description',
+            'frequency', 'interval', 'day_of_month', 'start_date', 'end_date', 'next_run',
+            'is_active', 'created_at', 'updated_at'
+        )
+        read_only_fields = ('id', 'next_run', 'created_at', 'updated_at')
+
+    def validate_category(self, value):
+        """카테고리가 현재 사용자의 것인지 확인"""
+        user = self.context['request'].user
+        if value.user != user:
+            raise serializers.ValidationError("본인의 카테고리만 사용할 수 있습니다.")
+        return value
+
+    def validate_amount(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("금액은 0보다 커야 합니다.")
+        return value
+
+    def validate_interval(self, value):
+        if value < 1:
+            raise serializers.ValidationError("간격은 1 이상이어야 합니다.")
+        return value
+
+    def validate_day_of_month(self, value):
+        if value is not None and not 1 <= value <= 31:
+            raise serializers.ValidationError("날짜는 1~31 사이여야 합니다.")
+        return value
+
+    def validate(self, attrs):
+        """카테고리/거래 타입 일치, 시작일과 종료일 확인"""
+        category = attrs.get('category', getattr(self.instance, 'category', None))
+        transaction_type = attrs.get('type', getattr(self.instance, 'type', None))
+        if category and transaction_type and category.type != transaction_type:
+            raise serializers.ValidationError({
+                'category': '카테고리 타입과 거래 타입이 일치하지 않습니다.'
+            })
+
+        start_date = attrs.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = attrs.get('end_date', getattr(self.instance, 'end_date', None))
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError({
+                'end_date': '종료일은 시작일보다 빠를 수 없습니다.'
+            })
+        return attrs
+
+    def create(self, validated_data):
+        validated_data['user'] = self.context['request'].user
+        return super().create(validated_data)
+
+
 class TransactionStatsSerializer(serializers.Serializer):
     """거래 통계 시리얼라이저"""
-    total_income = serializers.DecimalField(max_digits=10, decimal_places=2)
-    total_expense = serializers.DecimalField(max_digits=10, decimal_places=2)
-    balance = serializers.DecimalField(max_digits=10, decimal_places=2)
+    total_income = serializers.DecimalField(max_digits=15, decimal_places=2)
+    total_expense = serializers.DecimalField(max_digits=15, decimal_places=2)
+    balance = serializers.DecimalField(max_digits=15, decimal_places=2)
     transaction_count = serializers.IntegerField()
     
     # 카테고리별 통계
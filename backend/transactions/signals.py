@@ -0,0 +1,77 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from core.cache import bump_data_version
+
+from . import rollups, search
+from .models import Category, Transaction
+
+# bulk_create 는 post_save 를 보내지 않으므로 대량 생성 경로에서 직접 보내는 시그널
+# (sender=Transaction, created=생성된 거래 목록, using=DB 별칭)
+transactions_bulk_created = Signal()
+# bulk_update 용 (updated=(수정 전 rollups.ROW_FIELDS 값, 수정된 거래) 목록)
+transactions_bulk_updated = Signal()
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_rollup_row(sender, instance, raw, **kwargs):
+    """수정 전 거래 값을 기억해 두었다가 집계에서 빼기 위함"""
+    instance._rollup_previous = None
+    if raw or instance._state.adding:
+        return
+    instance._rollup_previous = sender.objects.filter(pk=instance.pk).values_list(
+        *rollups.ROW_FIELDS
+    ).first()
+
+
+@receiver(post_save, sender=Transaction)
+def update_rollups_on_save(sender, instance, raw, **kwargs):
+    """거래 생성/수정 시 집계 반영 (날짜, 금액, 타입, 카테고리 이동 포함)"""
+    if raw:
+        return
+    deltas = rollups.collect_deltas([rollups.row_for(instance)])
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous:
+        rollups.collect_deltas([previous], sign=-1, deltas=deltas)
+    rollups.apply_deltas(deltas)
+    search.index_transactions([instance], using=kwargs['using'])
+
+
+@receiver(post_delete, sender=Transaction)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    """거래 삭제 시 집계에서 제외"""
+    rollups.record([rollups.row_for(instance)], sign=-1)
+    search.unindex_transactions([instance.pk], using=kwargs['using'])
+
+
+@receiver(transactions_bulk_created, sender=Transaction)
+def update_rollups_on_bulk_create(sender, created, using, **kwargs):
+    """대량 생성된 거래를 집계와 검색 인덱스에 한 번에 반영"""
+    rollups.record([rollups.row_for(instance) for instance in created])
+    search.index_transactions(created, using=using)
+
+
+@receiver(transactions_bulk_updated, sender=Transaction)
+def update_rollups_on_bulk_update(sender, updated, using, **kwargs):
+    """대량 수정된 거래의 이전 값을 빼고 새 값을 더함"""
+    deltas = rollups.collect_deltas([previous for previous, _ in updated], sign=-1)
+    rollups.collect_deltas([rollups.row_for(instance) for _, instance in updated], deltas=deltas)
+    rollups.apply_deltas(deltas)
+    search.index_transactions([instance for _, instance in updated], using=using)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_cached_responses(sender, instance, **kwargs):
+    """거래/카테고리가 바뀌면 해당 사용자의 캐시된 응답을 무효화"""
+    bump_data_version(instance.user_id)
+
+
+@receiver(transactions_bulk_created, sender=Transaction)
+@receiver(transactions_bulk_updated, sender=Transaction)
+def invalidate_cached_responses_on_bulk(sender, created=(), updated=(), **kwargs):
+    instances = list(created) + [instance for _, instance in updated]
+    for user_id in {instance.user_id for instance in instances}:
+        bump_data_version(user_id)
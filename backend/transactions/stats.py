@@ -0,0 +1,115 @@
+"""거래 통계 계산 (동기/비동기 뷰 공용)
+
+각 함수는 집계 테이블에 쿼리 한 번만 실행하므로 서로 독립적이고,
+비동기 뷰에서는 스레드 풀에서 동시에 실행할 수 있다.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils.dateparse import parse_date
+
+from .models import TransactionRollup
+from .rollups import range_filter
+from .serializers import TransactionStatsSerializer
+
+
+def parse_day(value):
+    """YYYY-MM-DD 문자열을 date 로 변환 (빈 값은 None)
+
+    형식이 잘못되었거나 없는 날짜(2024-02-30 등)면 ValueError 를 발생시킨다.
+    """
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValueError('날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)')
+    return day
+
+
+def parse_period(params):
+    """start_date, end_date 를 (시작일, 종료일) 로 변환, 없으면 이번 달
+
+    날짜 형식이 잘못되었으면 ValueError 를 발생시킨다.
+    """
+    start_date = params.get('start_date')
+    end_date = params.get('end_date')
+    if not start_date or not end_date:
+        today = date.today()
+        return today.replace(day=1), today
+
+    return parse_day(start_date), parse_day(end_date)
+
+
+def _rollups(user_id, start_date, end_date):
+    # 원본 거래 대신 일별/월별 집계 테이블에서 계산
+    return TransactionRollup.objects.filter(user_id=user_id).filter(range_filter(start_date, end_date))
+
+
+def totals(user_id, start_date, end_date):
+    """기간 수입/지출 합계, 잔액, 거래 수"""
+    totals = _rollups(user_id, start_date, end_date).aggregate(
+        income=Sum('total', filter=Q(type='income')),
+        expense=Sum('total', filter=Q(type='expense')),
+        count=Sum('count'),
+    )
+    income_sum = totals['income'] or Decimal('0')
+    expense_sum = totals['expense'] or Decimal('0')
+    return {
+        'total_income': income_sum,
+        'total_expense': expense_sum,
+        'balance': income_sum - expense_sum,
+        'transaction_count': totals['count'] or 0,
+    }
+
+
+def category_breakdown(user_id, start_date, end_date):
+    """카테고리별 합계/건수 (합계 큰 순)"""
+    return list(_rollups(user_id, start_date, end_date).values(
+        'category__name', 'category__color', 'category__type'
+    ).annotate(
+        total=Sum('total'),
+        count=Sum('count')
+    ).order_by('-total'))
+
+
+def monthly_breakdown(user_id, start_date, end_date):
+    """월별 수입/지출/잔액"""
+    monthly_stats = _rollups(user_id, start_date, end_date).annotate(
+        month=TruncMonth('period_start')
+    ).values('month').annotate(
+        income=Sum('total', filter=Q(type='income')),
+        expense=Sum('total', filter=Q(type='expense'))
+    ).order_by('month')
+
+    monthly_data = []
+    for stat in monthly_stats:
+        monthly_data.append({
+            'month': stat['month'].strftime('%Y-%m'),
+            'income': stat['income'] or 0,
+            'expense': stat['expense'] or 0,
+            'balance': (stat['income'] or 0) - (stat['expense'] or 0)
+        })
+    return monthly_data
+
+
+# 통계 응답을 이루는 독립적인 계산들
+STATS_PARTS = (totals, category_breakdown, monthly_breakdown)
+
+
+def assemble_stats(totals, category_stats, monthly_stats):
+    """STATS_PARTS 결과를 통계 응답 데이터로 직렬화"""
+    return TransactionStatsSerializer({
+        **totals,
+        'category_stats': category_stats,
+        'monthly_stats': monthly_stats,
+    }).data
+
+
+def build_stats(user_id, start_date, end_date):
+    """통계 응답 데이터 (순차 실행)"""
+    return assemble_stats(*(part(user_id, start_date, end_date) for part in STATS_PARTS))
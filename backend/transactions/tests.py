@@ -0,0 +1,835 @@
+import base64
+import csv
+import io
+from datetime import date, timedelta
+from decimal import Decimal
+from importlib import import_module
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+
+from core.testing import (
+    COVERED_URLS, TEST_SETTINGS, AsyncEndpointPerformanceTestCase, EndpointPerformanceTestCase, covers,
+    create_ledger, url_names,
+)
+from sync.models import Change
+
+from . import partitioning, rollups
+from .bulk import bulk_create_transactions, bulk_delete_transactions, bulk_update_transactions
+from .importers import read_csv
+from .models import Category, RecurringRule, Transaction, TransactionRollup
+from .recurring import materialize
+from .search import FTS_TABLE, search_transactions
+from .seeding import create_users
+
+
+class TransactionEndpointTests(EndpointPerformanceTestCase):
+    """transactions.urls 엔드포인트의 쿼리 수 / 응답 시간"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.categories = create_ledger('transactions-perf@example.com')
+        cls.food = cls.categories['expense'][0]
+        cls.transaction = Transaction.objects.filter(user=cls.user, category=cls.food).first()
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.authenticate(self.user)
+
+    def new_category(self):
+        return (Category.objects.create(user=self.user, name='삭제할 카테고리', type='expense'),)
+
+    def new_transaction(self):
+        return (Transaction.objects.create(
+            user=self.user, category=self.food, type='expense', title='삭제할 거래', amount=1000, date=date.today(),
+        ),)
+
+    def new_rule(self):
+        return (RecurringRule.objects.create(
+            user=self.user, category=self.food, type='expense', title='삭제할 구독', amount=9900,
+            frequency='monthly', start_date=date.today() + timedelta(days=1),
+        ),)
+
+    def transaction_data(self, **overrides):
+        return {
+            'category': self.food.id, 'type': 'expense', 'title': '점심 식사',
+            'amount': '12000.00', 'date': date.today().isoformat(), **overrides,
+        }
+
+    @covers('category-list-create')
+    def test_category_list_create(self):
+        # 카테고리 수와 관계없이 거래 개수를 한 번에 조회
+        self.check('transactions:category-list-create GET', lambda: self.client.get('/api/categories/'), max_queries=4)
+        names = (f'새 카테고리 {index}' for index in range(100))
+        self.check('transactions:category-list-create POST', lambda name: self.client.post('/api/categories/', {
+            'name': name, 'type': 'expense',
+        }, format='json'), max_queries=7, status=201, setup=lambda: (next(names),))
+
+    @covers('category-detail')
+    def test_category_detail(self):
+        url = f'/api/categories/{self.food.id}/'
+        self.check('transactions:category-detail GET', lambda: self.client.get(url), max_queries=2)
+        self.check('transactions:category-detail PATCH', lambda: self.client.patch(url, {
+            'color': '#000000',
+        }, format='json'), max_queries=7)
+        self.check(
+            'transactions:category-detail DELETE',
+            lambda category: self.client.delete(f'/api/categories/{category.id}/'),
+            max_queries=13, status=204, setup=self.new_category,
+        )
+
+    @covers('create-default-categories')
+    def test_create_default_categories(self):
+        self.check(
+            'transactions:create-default-categories POST',
+            lambda: self.client.post('/api/categories/create-defaults/'), max_queries=28, status=201,
+        )
+
+    @covers('transaction-list-create')
+    def test_transaction_list_create(self):
+        self.check('transactions:transaction-list-create GET', lambda: self.client.get('/api/transactions/'), max_queries=4)
+        self.check(
+            'transactions:transaction-list-create GET search',
+            lambda: self.client.get('/api/transactions/', {'search': '점심', 'type': 'expense'}), max_queries=3,
+        )
+        # 관련 예산 스냅샷 갱신(조회 1, upsert 1) 포함
+        self.check('transactions:transaction-list-create POST', lambda: self.client.post(
+            '/api/transactions/', self.transaction_data(), format='json',
+        ), max_queries=19, status=201)
+
+    @covers('transaction-batch')
+    def test_transaction_batch(self):
+        def batch(target):
+            return self.client.post('/api/transactions/batch/', {'operations': [
+                *({'op': 'create', 'data': self.transaction_data(title=f'일괄 {index}')} for index in range(10)),
+                {'op': 'update', 'id': self.transaction.id, 'data': {'title': '일괄 수정'}},
+                {'op': 'delete', 'id': target.id},
+            ]}, format='json')
+        self.check('transactions:transaction-batch POST', batch, max_queries=37, setup=self.new_transaction)
+
+    @covers('transaction-import')
+    def test_transaction_import(self):
+        rows = '\n'.join(
+            f'{date.today().isoformat()},가져온 거래 {index},{1000 + index},expense,{self.food.name}'
+            for index in range(50)
+        )
+        content = f'date,title,amount,type,category\n{rows}\n'.encode()
+
+        def upload():
+            upload = io.BytesIO(content)
+            upload.name = 'bank.csv'
+            return self.client.post('/api/transactions/import/', {'file': upload}, format='multipart')
+        self.check('transactions:transaction-import POST', upload, max_queries=19, status=201)
+
+    @covers('transaction-export')
+    def test_transaction_export(self):
+        self.check(
+            'transactions:transaction-export GET',
+            lambda: self.client.get('/api/transactions/export/', {'export_format': 'csv'}), max_queries=2,
+        )
+
+    @covers('transaction-detail')
+    def test_transaction_detail(self):
+        url = f'/api/transactions/{self.transaction.id}/'
+        self.check('transactions:transaction-detail GET', lambda: self.client.get(url), max_queries=3)
+        self.check('transactions:transaction-detail PATCH', lambda: self.client.patch(url, {
+            'amount': '9000.00',
+        }, format='json'), max_queries=17)
+        self.check(
+            'transactions:transaction-detail DELETE',
+            lambda target: self.client.delete(f'/api/transactions/{target.id}/'),
+            max_queries=14, status=204, setup=self.new_transaction,
+        )
+
+    @covers('recurring-rule-list-create')
+    def test_recurring_rule_list_create(self):
+        self.check(
+            'transactions:recurring-rule-list-create GET', lambda: self.client.get('/api/recurring-rules/'),
+            max_queries=2,
+        )
+        # 시작일이 오늘이면 첫 거래를 바로 만듦
+        self.check('transactions:recurring-rule-list-create POST', lambda: self.client.post('/api/recurring-rules/', {
+            'category': self.food.id, 'type': 'expense', 'title': '음악 구독', 'amount': '10900.00',
+            'frequency': 'monthly', 'start_date': date.today().isoformat(),
+        }, format='json'), max_queries=27, status=201)
+
+    @covers('recurring-rule-detail')
+    def test_recurring_rule_detail(self):
+        rule, = self.new_rule()
+        url = f'/api/recurring-rules/{rule.id}/'
+        self.check('transactions:recurring-rule-detail GET', lambda: self.client.get(url), max_queries=2)
+        self.check('transactions:recurring-rule-detail PATCH', lambda: self.client.patch(url, {
+            'amount': '11900.00',
+        }, format='json'), max_queries=6)
+        self.check(
+            'transactions:recurring-rule-detail DELETE',
+            lambda target: self.client.delete(f'/api/recurring-rules/{target.id}/'),
+            max_queries=3, status=204, setup=self.new_rule,
+        )
+
+    @covers('transaction-stats')
+    def test_transaction_stats(self):
+        self.check('transactions:transaction-stats GET', lambda: self.client.get('/api/stats/'), max_queries=5)
+        self.check('transactions:transaction-stats GET year', lambda: self.client.get('/api/stats/', {
+            'start_date': f'{date.today().year}-01-01', 'end_date': date.today().isoformat(),
+        }), max_queries=5)
+
+    @covers('dashboard')
+    def test_dashboard(self):
+        self.check('transactions:dashboard GET', lambda: self.client.get('/api/dashboard/'), max_queries=7)
+
+    def test_invalid_date_filters(self):
+        # 없는 날짜(2월 30일)도 500 이 아닌 400
+        for url in ('/api/categories/', '/api/stats/'):
+            response = self.client.get(url, {'start_date': '2024-02-30', 'end_date': '2024-03-01'})
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn('error', response.json())
+
+    def test_all_urls_covered(self):
+        self.assertEqual(url_names('transactions.urls') - COVERED_URLS, set())
+
+
+@override_settings(**TEST_SETTINGS)
+class RecurringMaterializeTests(TestCase):
+    """밀린 반복 거래를 한 번에 만들고, 다시 실행해도 중복되지 않는지"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.categories = create_ledger('recurring@example.com', transactions=10)
+        cls.rule = RecurringRule.objects.create(
+            user=cls.user, category=cls.categories['income'][0], type='income', title='월급', amount=3000000,
+            frequency='monthly', day_of_month=31, start_date=date(2024, 1, 1),
+        )
+
+    def test_catch_up_and_rerun(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(materialize(date(2024, 6, 30)), (1, 6))
+        # 밀린 6개월치를 INSERT 한 번으로
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "transactions_transaction"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            list(self.rule.transactions.order_by('date').values_list('date', flat=True)),
+            [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30), date(2024, 5, 31),
+             date(2024, 6, 30)],
+        )
+        self.rule.refresh_from_db()
+        self.assertEqual(self.rule.next_run, date(2024, 7, 31))
+
+        # next_run 이 저장되지 않은 채로 다시 실행되어도 이미 만든 발생일은 건너뜀
+        RecurringRule.objects.filter(pk=self.rule.pk).update(next_run=date(2024, 1, 1))
+        self.assertEqual(materialize(date(2024, 7, 31)), (1, 1))
+        self.assertEqual(self.rule.transactions.count(), 7)
+
+    def test_stale_next_run(self):
+        # 발생일이 아닌 next_run (일정을 바꾼 뒤 next_run 을 다시 계산하지 않은 경우)
+        RecurringRule.objects.filter(pk=self.rule.pk).update(next_run=date(2024, 1, 10))
+        self.assertEqual(materialize(date(2024, 1, 17)), (1, 0))
+        self.rule.refresh_from_db()
+        self.assertEqual(self.rule.next_run, date(2024, 1, 31))
+
+        # 종료일이 next_run 보다 앞선 경우
+        RecurringRule.objects.filter(pk=self.rule.pk).update(next_run=date(2024, 1, 31), end_date=date(2024, 1, 20))
+        self.assertEqual(materialize(date(2024, 2, 5)), (1, 0))
+        self.rule.refresh_from_db()
+        self.assertIsNone(self.rule.next_run)
+        self.assertFalse(self.rule.transactions.exists())
+
+    def test_schedule_change_recomputes_next_run(self):
+        rule = RecurringRule.objects.get(pk=self.rule.pk)
+        rule.end_date = date(2000, 1, 1)
+        rule.save()
+        self.assertIsNone(rule.next_run)
+
+        rule.end_date = None
+        rule.day_of_month = 1
+        rule.save()
+        today = date.today()
+        self.assertEqual(rule.next_run, rule.occurrence_on_or_after(today))
+        self.assertEqual(rule.next_run.day, 1)
+
+    def test_moved_occurrence_not_recreated(self):
+        # 날짜를 다른 연도로 고친 거래 (파티션 테이블에서는 유일 제약으로 막을 수 없는 경우)
+        materialize(date(2024, 1, 31))
+        self.rule.transactions.update(date=date(2025, 1, 5))
+        RecurringRule.objects.filter(pk=self.rule.pk).update(next_run=date(2024, 1, 1))
+        self.assertEqual(materialize(date(2024, 1, 31)), (1, 0))
+        self.assertEqual(self.rule.transactions.count(), 1)
+
+    def test_unique_occurrence(self):
+        materialize(date(2024, 1, 31))
+        with self.assertRaises(IntegrityError):
+            Transaction.objects.create(
+                user=self.user, category=self.rule.category, type='income', title='월급', amount=1,
+                date=date(2024, 2, 1), recurring_rule=self.rule, occurrence_date=date(2024, 1, 31),
+            )
+
+
+@override_settings(**TEST_SETTINGS)
+class TransactionSearchTests(TestCase):
+    """제목/설명 검색 (단어 중간 일치, 짧은 검색어, 따옴표, 다른 queryset 연산과의 조합)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, = create_users(['search@example.com'])
+        cls.food = Category.objects.create(user=cls.user, name='식비', type='expense')
+        today = date.today()
+        cls.transactions = {
+            key: Transaction.objects.create(
+                user=cls.user, category=cls.food, type='expense', amount=Decimal('5000'),
+                date=today - timedelta(days=days), title=title, description=description,
+            )
+            for key, title, description, days in [
+                ('korean', '회사근처점심식사', '', 1),
+                ('english', 'Lunch at Starbucks', '', 2),
+                ('description', '카드 결제', '편의점 아이스커피', 3),
+                ('quoted', 'Bought "Big" box', '', 4),
+                ('other', '월세', '', 5),
+            ]
+        }
+
+    def search(self, query):
+        return search_transactions(Transaction.objects.filter(user=self.user), query)
+
+    def keys(self, queryset):
+        ids = {transaction.pk: key for key, transaction in self.transactions.items()}
+        return {ids[pk] for pk in queryset.values_list('id', flat=True)}
+
+    def test_mid_word(self):
+        self.assertEqual(self.keys(self.search('근처점심')), {'korean'})
+        self.assertEqual(self.keys(self.search('arbuck')), {'english'})
+        self.assertEqual(self.keys(self.search('STARBUCKS')), {'english'})
+        self.assertEqual(self.keys(self.search('아이스커')), {'description'})
+        self.assertEqual(self.keys(self.search('없는검색어')), set())
+
+    def test_short_query_fallback(self):
+        # 3글자 미만은 인덱스 없이 부분 일치로 찾음
+        self.assertEqual(self.keys(self.search('점심')), {'korean'})
+        self.assertEqual(self.keys(self.search(' 커피 ')), {'description'})
+        self.assertEqual(self.keys(self.search('월')), {'other'})
+
+    def test_quotes_and_syntax(self):
+        self.assertEqual(self.keys(self.search('"Big"')), {'quoted'})
+        self.assertEqual(self.keys(self.search('Big" box')), {'quoted'})
+        # FTS5 연산자로 해석되지 않음
+        self.assertEqual(self.keys(self.search('Lunch OR 월세')), set())
+        self.assertEqual(self.keys(self.search('Lun*')), set())
+
+    def test_queryset_operations(self):
+        results = self.search('점심식')
+        self.assertEqual(results.count(), 1)
+        self.assertTrue(results.exists())
+        self.assertEqual(list(results.values('title')), [{'title': '회사근처점심식사'}])
+        self.assertEqual(self.search('ucks').filter(type='income').count(), 0)
+        self.assertEqual(
+            list(self.search('at Star').select_related('category').values_list('category__name', flat=True)),
+            ['식비'],
+        )
+        # 다른 queryset 의 서브쿼리로 사용
+        self.assertEqual(Transaction.objects.filter(id__in=self.search('Starbucks').values('id')).count(), 1)
+        ranked = list(self.search('Bought'))
+        self.assertEqual(len(ranked), 1)
+        self.assertIsNotNone(ranked[0].search_rank)
+
+    def test_list_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for params in [{}, {'pagination': 'cursor'}]:
+            response = client.get('/api/transactions/', {'search': 'starbucks', **params})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([row['title'] for row in response.json()['results']], ['Lunch at Starbucks'])
+
+
+@override_settings(**TEST_SETTINGS)
+class TransactionCursorPaginationTests(TestCase):
+    """커서 페이지네이션이 조회 중 추가된 거래와 같은 정렬 값에서도 중복/누락 없이 이어지는지"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, = create_users(['cursor@example.com'])
+        cls.food = Category.objects.create(user=cls.user, name='식비', type='expense')
+        cls.day = date(2024, 5, 10)
+        cls.created_at = timezone.now().replace(microsecond=0)
+        cls.add(25, cls.day)
+
+    @classmethod
+    def add(cls, count, day, title='거래'):
+        """date 와 created_at 이 모두 같은 거래 count 개"""
+        created = bulk_create_transactions([
+            Transaction(
+                user=cls.user, category=cls.food, type='expense', title=f'{title} {index}',
+                amount=Decimal('1000'), date=day,
+            )
+            for index in range(count)
+        ])
+        Transaction.objects.filter(pk__in=[t.pk for t in created]).update(created_at=cls.created_at)
+        return [t.pk for t in created]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def page(self, **params):
+        response = self.client.get('/api/transactions/', {'pagination': 'cursor', **params})
+        self.assertEqual(response.status_code, 200, response.json())
+        data = response.json()
+        cursor = None
+        if data['next']:
+            cursor = parse_qs(urlparse(data['next']).query)['cursor'][0]
+        return [row['id'] for row in data['results']], cursor
+
+    def test_ties_and_inserts_while_paging(self):
+        ids, cursor = self.page(page_size=10)
+        seen = list(ids)
+        # 이미 지나간 위치(같은 date/created_at, 더 큰 id)와 아직 읽지 않은 위치(이전 날짜)에 추가
+        passed = self.add(5, self.day, '중간 추가')
+        ahead = self.add(3, self.day - timedelta(days=1), '이전 날짜')
+        while cursor:
+            ids, cursor = self.page(page_size=10, cursor=cursor)
+            seen.extend(ids)
+
+        self.assertEqual(len(seen), len(set(seen)))
+        expected = Transaction.objects.filter(user=self.user).exclude(pk__in=passed)
+        self.assertEqual(set(seen), set(expected.values_list('id', flat=True)))
+        self.assertEqual(seen, list(expected.order_by('-date', '-created_at', '-id').values_list('id', flat=True)))
+        self.assertTrue(set(ahead) <= set(seen))
+
+    def test_invalid_cursor(self):
+        def encode(raw):
+            return base64.urlsafe_b64encode(raw.encode()).decode()
+
+        for cursor in [
+            'garbage', '%%%', encode('not|a|cursor'), encode('2024-05-10|2024-05-10T00:00:00+00:00'),
+            encode('2024-02-30|2024-05-10T00:00:00+00:00|1'), encode('2024-05-10|yesterday|1'),
+            encode('2024-05-10|2024-05-10T00:00:00+00:00|' + '9' * 30), base64.urlsafe_b64encode(b'\xff\xfe').decode(),
+        ]:
+            response = self.client.get('/api/transactions/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 400, cursor)
+            self.assertIn('error', response.json())
+
+    def test_page_size_capped(self):
+        self.add(100, self.day - timedelta(days=2))
+        ids, cursor = self.page(page_size=1000)
+        self.assertEqual(len(ids), 100)
+        self.assertIsNotNone(cursor)
+        ids, _ = self.page(page_size=0)
+        self.assertEqual(len(ids), api_settings.PAGE_SIZE)
+
+
+@override_settings(**TEST_SETTINGS)
+class TransactionFileTests(TestCase):
+    """CSV/OFX 가져오기와 CSV 내보내기"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, = create_users(['files@example.com'])
+        cls.food = Category.objects.create(user=cls.user, name='식비', type='expense')
+        cls.salary = Category.objects.create(user=cls.user, name='급여', type='income')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def export_csv(self):
+        response = self.client.get('/api/transactions/export/', {'export_format': 'csv'})
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def test_csv_formula_escaped(self):
+        titles = ['=HYPERLINK("http://example.com")', '+82 송금', '-5000 환불', '@SUM(A1)', '점심']
+        for title in titles:
+            Transaction.objects.create(
+                user=self.user, category=self.food, type='expense', title=title, amount=Decimal('1000'),
+                date=date(2024, 5, 1), description='=1+1',
+            )
+
+        content = self.export_csv()
+        self.assertTrue(content.startswith('\ufeff'.encode()))
+        rows = list(csv.DictReader(io.StringIO(content.decode('utf-8-sig'))))
+        self.assertEqual(
+            sorted(row['title'] for row in rows),
+            sorted("'" + title if title != '점심' else title for title in titles),
+        )
+        self.assertEqual({row['description'] for row in rows}, {"'=1+1"})
+        self.assertEqual({row['amount'] for row in rows}, {'1000.00'})
+
+        # 다시 가져오면 붙인 ' 는 제거됨
+        imported = [values for _, values in read_csv(io.BytesIO(content), {})]
+        self.assertEqual(sorted(values['title'] for values in imported), sorted(titles))
+
+    def upload(self, content, name, **data):
+        upload = io.BytesIO(content)
+        upload.name = name
+        return self.client.post('/api/transactions/import/', {'file': upload, **data}, format='multipart')
+
+    def test_bad_rows_reported(self):
+        content = '\n'.join([
+            'date,title,amount,type,category',
+            '2024-05-01,점심,9000,expense,식비',
+            '2024-05-02,없는 카테고리,9000,expense,여행',
+            '2024-13-45,날짜 오류,9000,expense,식비',
+            '2024-05-03,금액 오류,구천원,expense,식비',
+            '2024-05-04,타입 불일치,9000,expense,' + str(self.salary.id),
+            '2024.05.05,월급,"3,000,000",income,급여',
+            '2024-05-06,0원,0,expense,식비',
+        ]).encode()
+        response = self.upload(content, 'bank.csv')
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual((report['total_rows'], report['created'], report['failed']), (7, 2, 5))
+        errors = {error['row']: error['errors'] for error in report['errors']}
+        self.assertEqual(sorted(errors), [3, 4, 5, 6, 8])
+        self.assertIn('category', errors[3])
+        self.assertIn('date', errors[4])
+        self.assertIn('amount', errors[5])
+        self.assertIn('category', errors[6])
+        self.assertIn('amount', errors[8])
+        self.assertEqual(
+            sorted(Transaction.objects.filter(user=self.user).values_list('title', 'amount', 'type', 'date')),
+            [('월급', Decimal('3000000.00'), 'income', date(2024, 5, 5)),
+             ('점심', Decimal('9000.00'), 'expense', date(2024, 5, 1))],
+        )
+        self.assertEqual(TransactionRollup.objects.filter(user=self.user, period='month').count(), 2)
+
+        # dry_run 은 같은 보고서를 만들지만 저장하지 않음
+        response = self.upload(content, 'bank.csv', dry_run='true')
+        self.assertEqual((response.json()['created'], response.json()['failed']), (2, 5))
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 2)
+
+    def test_ofx(self):
+        content = '''OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240105120000[+9:KST]<TRNAMT>-15000.00<NAME>편의점<MEMO>간식</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240125<TRNAMT>3000000<NAME>급여 입금</STMTTRN>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>unknown<TRNAMT>-100<NAME>날짜 없음</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+'''.encode()
+        response = self.upload(
+            content, 'statement.ofx', default_expense_category=self.food.id, default_income_category=self.salary.id,
+        )
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual((report['created'], report['failed']), (2, 1))
+        self.assertEqual(report['errors'][0]['row'], 3)
+        self.assertEqual(
+            sorted(Transaction.objects.filter(user=self.user).values_list(
+                'title', 'description', 'amount', 'type', 'category_id', 'date',
+            )),
+            [('급여 입금', '', Decimal('3000000.00'), 'income', self.salary.id, date(2024, 1, 25)),
+             ('편의점', '간식', Decimal('15000.00'), 'expense', self.food.id, date(2024, 1, 5))],
+        )
+
+    def test_bom_round_trip(self):
+        fields = ('title', 'amount', 'type', 'category_id', 'date', 'description')
+        for index, (category, type_) in enumerate([(self.food, 'expense'), (self.salary, 'income')] * 3):
+            Transaction.objects.create(
+                user=self.user, category=category, type=type_, title=f'한글 거래 {index}',
+                amount=Decimal('1234.50') + index, date=date(2024, 4, index + 1), description='메모, "따옴표"',
+            )
+        exported = sorted(Transaction.objects.filter(user=self.user).values_list(*fields))
+
+        content = self.export_csv()
+        self.assertTrue(content.startswith(b'\xef\xbb\xbf'))
+        response = self.upload(content, 'export.csv')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.json()['created'], response.json()['failed']), (6, 0))
+        self.assertEqual(sorted(Transaction.objects.filter(user=self.user).values_list(*fields)), sorted(exported * 2))
+
+
+class RollupAssertionsMixin:
+    """집계와 통계를 원본 거래로 새로 계산한 값과 비교하는 TestCase 믹스인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.categories = create_ledger('rollups@example.com', transactions=60)
+        cls.food, cls.transport = cls.categories['expense'][:2]
+        cls.salary = cls.categories['income'][0]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def new_transaction(self, **fields):
+        return Transaction.objects.create(**{
+            'user': self.user, 'category': self.food, 'type': 'expense', 'title': '점심',
+            'amount': Decimal('9000'), 'date': date.today(), **fields,
+        })
+
+    def expected_stats(self, start, end):
+        transactions = Transaction.objects.filter(user=self.user, date__gte=start, date__lte=end)
+        income = sum((t.amount for t in transactions if t.type == 'income'), Decimal('0'))
+        expense = sum((t.amount for t in transactions if t.type == 'expense'), Decimal('0'))
+        categories = {}
+        for t in transactions.select_related('category'):
+            total, count = categories.get(t.category.name, (Decimal('0'), 0))
+            categories[t.category.name] = (total + t.amount, count + 1)
+        return income, expense, len(transactions), categories
+
+    def assertRollupsMatch(self):
+        transactions = Transaction.objects.filter(user=self.user)
+        self.assertEqual(
+            rollups.find_drift(
+                rollups.compute_rows(transactions),
+                rollups.stored_rows(TransactionRollup.objects.filter(user=self.user)),
+            ),
+            [],
+        )
+        call_command('rebuild_rollups', '--check', stdout=io.StringIO())
+
+        today = date.today()
+        # 월 경계에 걸친 기간(일별+월별 집계)과 전체 기간
+        for start, end in [(today - timedelta(days=45), today), (date(2000, 1, 1), today + timedelta(days=400))]:
+            response = self.client.get('/api/stats/', {'start_date': start.isoformat(), 'end_date': end.isoformat()})
+            self.assertEqual(response.status_code, 200)
+            income, expense, count, categories = self.expected_stats(start, end)
+            data = response.json()
+            self.assertEqual(Decimal(data['total_income']), income)
+            self.assertEqual(Decimal(data['total_expense']), expense)
+            self.assertEqual(Decimal(data['balance']), income - expense)
+            self.assertEqual(data['transaction_count'], count)
+            self.assertEqual(
+                {row['category__name']: (Decimal(str(row['total'])), row['count']) for row in data['category_stats']},
+                categories,
+            )
+
+
+
+@override_settings(**TEST_SETTINGS)
+class RollupConsistencyTests(RollupAssertionsMixin, TestCase):
+    """거래 수정/삭제/대량 작업 후 집계와 통계가 원본 거래로 새로 계산한 값과 같은지"""
+
+    def test_save_moves(self):
+        self.assertRollupsMatch()
+        transaction = self.new_transaction()
+        self.assertRollupsMatch()
+
+        # 날짜를 다른 달로
+        transaction.date = date.today().replace(day=1) - timedelta(days=40)
+        transaction.save()
+        self.assertRollupsMatch()
+
+        transaction.amount = Decimal('15500.50')
+        transaction.save()
+        self.assertRollupsMatch()
+
+        transaction.category = self.transport
+        transaction.save()
+        self.assertRollupsMatch()
+
+        # 타입과 카테고리를 함께
+        transaction.type = 'income'
+        transaction.category = self.salary
+        transaction.save()
+        self.assertRollupsMatch()
+
+        transaction.delete()
+        self.assertRollupsMatch()
+
+    def test_cascade_delete(self):
+        self.new_transaction(date=date.today() - timedelta(days=3))
+        self.food.delete()
+        self.assertFalse(TransactionRollup.objects.filter(category=self.food).exists())
+        self.assertRollupsMatch()
+
+        response = self.client.delete(f'/api/categories/{self.transport.id}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertRollupsMatch()
+
+    def test_bulk_signals(self):
+        created = bulk_create_transactions([
+            Transaction(
+                user=self.user, category=self.food, type='expense', title=f'간식 {i}',
+                amount=Decimal(1000 + i), date=date.today() - timedelta(days=i * 7),
+            )
+            for i in range(10)
+        ])
+        self.assertRollupsMatch()
+
+        updated = []
+        for i, transaction in enumerate(created):
+            previous = rollups.row_for(transaction)
+            transaction.amount += i
+            transaction.date -= timedelta(days=i * 5)
+            if i % 2:
+                transaction.category = self.salary
+                transaction.type = 'income'
+            updated.append((previous, transaction))
+        bulk_update_transactions(updated, ['amount', 'date', 'category', 'type'])
+        self.assertRollupsMatch()
+
+        self.assertEqual(
+            bulk_delete_transactions(Transaction.objects.filter(pk__in=[t.pk for t in created[:6]])), 6
+        )
+        self.assertRollupsMatch()
+
+
+@override_settings(**TEST_SETTINGS)
+class TransactionBatchTests(RollupAssertionsMixin, TestCase):
+    """일괄 작업이 전부 반영되거나 전부 취소되고, 반영 후 집계/변경 기록/검색 인덱스가 맞는지"""
+
+    def post(self, *operations):
+        return self.client.post('/api/transactions/batch/', {'operations': list(operations)}, format='json')
+
+    def create_data(self, **fields):
+        return {
+            'title': '일괄 거래', 'amount': '12000.00', 'type': 'expense', 'category': self.food.id,
+            'date': date.today().isoformat(), **fields,
+        }
+
+    def state(self):
+        """거래, 집계, 변경 기록, 검색 인덱스의 현재 상태"""
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT rowid, title, description FROM {FTS_TABLE} ORDER BY rowid')
+            fts = cursor.fetchall()
+        return (
+            list(Transaction.objects.filter(user=self.user).order_by('id').values_list(
+                'id', 'title', 'amount', 'type', 'category_id', 'date',
+            )),
+            rollups.stored_rows(TransactionRollup.objects.filter(user=self.user)),
+            list(Change.objects.filter(user=self.user).order_by('seq').values_list('seq', 'model', 'object_id')),
+            fts,
+        )
+
+    def test_validation_failure_rolls_back(self):
+        target, deleted = Transaction.objects.filter(user=self.user)[:2]
+        before = self.state()
+        response = self.post(
+            {'op': 'create', 'data': self.create_data(title='검증 실패 묶음')},
+            {'op': 'update', 'id': target.id, 'data': {'amount': '1.00', 'category': self.salary.id, 'type': 'income'}},
+            {'op': 'delete', 'id': deleted.id},
+            {'op': 'create', 'data': self.create_data(amount='-5')},
+        )
+        self.assertEqual(response.status_code, 400)
+        results = response.json()['results']
+        self.assertEqual([result['status'] for result in results], ['skipped', 'skipped', 'skipped', 'error'])
+        self.assertIn('amount', results[3]['errors'])
+        self.assertEqual(self.state(), before)
+
+    def test_invalid_targets(self):
+        other, _ = create_ledger('batch-other@example.com', transactions=3)
+        foreign = Transaction.objects.filter(user=other).first()
+        target = Transaction.objects.filter(user=self.user).first()
+        before = self.state()
+
+        cases = [
+            # 같은 거래를 두 번 변경
+            [{'op': 'update', 'id': target.id, 'data': {'title': '수정'}}, {'op': 'delete', 'id': target.id}],
+            # 다른 사용자의 거래와 없는 거래
+            [{'op': 'delete', 'id': foreign.id}],
+            [{'op': 'update', 'id': foreign.id, 'data': {'title': '남의 거래'}}],
+            [{'op': 'delete', 'id': 0}],
+            [{'op': 'delete'}],
+            # 다른 사용자의 카테고리
+            [{'op': 'create', 'data': self.create_data(category=foreign.category_id)}],
+        ]
+        for operations in cases:
+            response = self.post(*operations)
+            self.assertEqual(response.status_code, 400, operations)
+            errors = response.json()['results'][-1]['errors']
+            self.assertTrue({'id', 'category'} & errors.keys(), errors)
+        self.assertEqual(self.state(), before)
+        self.assertEqual(Transaction.objects.get(pk=foreign.pk).title, foreign.title)
+
+    def test_mixed_batch(self):
+        updated, moved, deleted = Transaction.objects.filter(user=self.user).order_by('id')[:3]
+        response = self.post(
+            {'op': 'create', 'data': self.create_data(title='일괄생성거래 하나')},
+            {'op': 'create', 'data': self.create_data(
+                title='일괄생성거래 둘', type='income', category=self.salary.id,
+                date=(date.today() - timedelta(days=70)).isoformat(),
+            )},
+            {'op': 'update', 'id': updated.id, 'data': {'amount': '77777.00', 'title': '일괄수정거래'}},
+            {'op': 'update', 'id': moved.id, 'data': {
+                'type': 'income', 'category': self.salary.id, 'date': (date.today() - timedelta(days=40)).isoformat(),
+            }},
+            {'op': 'delete', 'id': deleted.id},
+        )
+        self.assertEqual(response.status_code, 200, response.json())
+        self.assertEqual(
+            [result['status'] for result in response.json()['results']],
+            ['created', 'created', 'updated', 'updated', 'deleted'],
+        )
+        self.assertFalse(Transaction.objects.filter(pk=deleted.pk).exists())
+        self.assertRollupsMatch()
+
+        transactions = Transaction.objects.filter(user=self.user)
+        self.assertEqual(search_transactions(transactions, '일괄생성').count(), 2)
+        self.assertEqual(list(search_transactions(transactions, '일괄수정').values_list('id', flat=True)), [updated.id])
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE} WHERE rowid = %s', [deleted.id])
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+        deletions = Change.objects.filter(user=self.user, model='transaction', deleted=True)
+        self.assertEqual(list(deletions.values_list('object_id', flat=True)), [deleted.id])
+
+
+@override_settings(**TEST_SETTINGS)
+class SeedLedgerCommandTests(TestCase):
+    """seed_ledger --clear 로 다시 만들어도 같은 데이터가 되고, 삭제된 사용자의 집계/기록이 남지 않는지"""
+
+    def seed(self, *args):
+        call_command(
+            'seed_ledger', '--users', '3', '--per-month', '5', '--months', '2', '--prefix', 'seed-test',
+            '--end-date', '2024-06-30', *args, stdout=io.StringIO(),
+        )
+        return sorted(Transaction.objects.values_list('user__email', 'date', 'title', 'amount'))
+
+    def test_clear_and_reseed(self):
+        first = self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.seed('--clear'), first)
+        # 거래마다 집계를 갱신하지 않음 (rollups.deferred)
+        updates = [query for query in queries if query['sql'].startswith('UPDATE "transactions_transactionrollup"')]
+        self.assertEqual(updates, [])
+        self.assertFalse(TransactionRollup.objects.exclude(user__email__startswith='seed-test-').exists())
+        self.assertFalse(Change.objects.exclude(user__email__startswith='seed-test-').exists())
+
+
+@override_settings(TRANSACTION_PARTITIONING=True)
+class PartitioningTests(TestCase):
+    """PostgreSQL 이 아니면 파티셔닝 설정이 켜져 있어도 아무것도 하지 않는지"""
+
+    def test_noop_on_sqlite(self):
+        migration = import_module('transactions.migrations.0007_transaction_partitioning')
+        with CaptureQueriesContext(connection) as queries:
+            migration.partition_transactions(None, SimpleNamespace(connection=connection))
+            migration.unpartition_transactions(None, SimpleNamespace(connection=connection))
+            self.assertFalse(partitioning.is_partitioned(connection))
+            self.assertFalse(partitioning.convert(connection))
+            self.assertFalse(partitioning.unpartition(connection))
+            self.assertEqual(partitioning.ensure_partitions(connection), [])
+        self.assertEqual(len(queries), 0)
+
+    def test_commands_on_sqlite(self):
+        out = io.StringIO()
+        call_command('partition_transactions', '--convert', stdout=out)
+        self.assertIn('sqlite 에서는', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('benchmark_partitioning', stdout=io.StringIO())
+
+
+class AsyncTransactionEndpointTests(AsyncEndpointPerformanceTestCase):
+    """비동기 통계 / 대시보드 (스레드 풀에서 실행된 쿼리까지 셈)"""
+
+    def setUp(self):
+        super().setUp()
+        self.user, _ = create_ledger('transactions-async-perf@example.com')
+        self.client = self.authenticate(self.user)
+
+    @covers('async-transaction-stats')
+    def test_async_transaction_stats(self):
+        self.check('transactions:async-transaction-stats GET', lambda: self.client.get('/api/async/stats/'), max_queries=4)
+
+    @covers('async-dashboard')
+    def test_async_dashboard(self):
+        self.check('transactions:async-dashboard GET', lambda: self.client.get('/api/async/dashboard/'), max_queries=6)
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     # 카테고리 관련 URL
@@ -9,8 +9,20 @@ urlpatterns = [
     
     # 거래 내역 관련 URL
     path('transactions/', views.TransactionListCreateView.as_view(), name='transaction-list-create'),
+    path('transactions/batch/', views.TransactionBatchView.as_view(), name='transaction-batch'),
+    path('transactions/import/', views.TransactionImportView.as_view(), name='transaction-import'),
+    path('transactions/export/', views.TransactionExportView.as_view(), name='transaction-export'),
     path('transactions/<int:pk>/', views.TransactionDetailView.as_view(), name='transaction-detail'),
+
+    # 반복 거래 규칙
+    path('recurring-rules/', views.RecurringRuleListCreateView.as_view(), name='recurring-rule-list-create'),
+    path('recurring-rules/<int:pk>/', views.RecurringRuleDetailView.as_view(), name='recurring-rule-detail'),
     
     # 통계 관련 URL
     path('stats/', views.transaction_stats, name='transaction-stats'),
+    path('dashboard/', views.dashboard, name='dashboard'),
+
+    # ASGI 비동기 버전 (독립적인 쿼리를 동시에 실행)
+    path('async/stats/', async_views.async_transaction_stats, name='async-transaction-stats'),
+    path('async/dashboard/', async_views.async_dashboard, name='async-dashboard'),
 ] 
\ No newline at end of file
@@ -1,12 +1,57 @@
+import csv
+import json
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
-from django.db.models import Sum, Count, Q
-from django.db.models.functions import TruncMonth
+from rest_framework.views import APIView
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from datetime import datetime, date
-from decimal import Decimal
-from .models import Category, Transaction
-from .serializers import CategorySerializer, TransactionSerializer, TransactionStatsSerializer
+from core.cache import cache_per_user
+from core.conditional import conditional_per_user
+from core.db_router import use_read_replica
+from sync import changelog
+from budgets import snapshots
+from budgets.models import Budget
+from . import rollups, stats
+from .dashboard import build_dashboard
+from .models import Category, RecurringRule, Transaction
+from .bulk import apply_batch, validate_batch
+from .recurring import materialize
+from .exporters import EXPORT_FORMATS
+from .importers import ImportFormatError, import_transactions, read_csv, read_ofx
+from .search import search_transactions
+from .pagination import TransactionCursorPagination, TransactionPageNumberPagination
+from .serializers import CategorySerializer, RecurringRuleSerializer, TransactionSerializer
+
+
+def filter_transactions(queryset, params):
+    """거래 목록/내보내기 공통 필터 (type, category, start_date, end_date, search)"""
+    # 필터링 옵션들
+    transaction_type = params.get('type', None)
+    category_id = params.get('category', None)
+    start_date = params.get('start_date', None)
+    end_date = params.get('end_date', None)
+    search = params.get('search', None)
+
+    if transaction_type:
+        queryset = queryset.filter(type=transaction_type)
+    
+    if category_id:
+        queryset = queryset.filter(category_id=category_id)
+    
+    if start_date:
+        queryset = queryset.filter(date__gte=start_date)
+    
+    if end_date:
+        queryset = queryset.filter(date__lte=end_date)
+    
+    if search:
+        queryset = search_transactions(queryset, search)
+
+    return queryset
 
 
 class CategoryListCreateView(generics.ListCreateAPIView):
@@ -14,12 +59,24 @@ class CategoryListCreateView(generics.ListCreateAPIView):
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @use_read_replica
+    @conditional_per_user('categories', Category, Transaction)
+    @cache_per_user('categories')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_queryset(self):
         queryset = Category.objects.filter(user=self.request.user)
         category_type = self.request.query_params.get('type', None)
         if category_type:
             queryset = queryset.filter(type=category_type)
-        return queryset
+        # start_date, end_date 를 함께 주면 기간별 합계도 조회
+        try:
+            start_date = stats.parse_day(self.request.query_params.get('start_date'))
+            end_date = stats.parse_day(self.request.query_params.get('end_date'))
+        except ValueError as e:
+            raise ValidationError({'error': str(e)})
+        return queryset.with_stats(start_date, end_date)
 
 
 class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -28,7 +85,12 @@ class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Category.objects.filter(user=self.request.user)
+        return Category.objects.filter(user=self.request.user).with_stats()
+
+    def perform_destroy(self, instance):
+        # CASCADE 로 함께 지워지는 거래/예산의 집계와 변경 기록을 한 번에 반영
+        with transaction.atomic(), rollups.deferred(), changelog.deferred(), snapshots.deferred():
+            instance.delete()
 
 
 class TransactionListCreateView(generics.ListCreateAPIView):
@@ -36,35 +98,162 @@ class TransactionListCreateView(generics.ListCreateAPIView):
     serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @property
+    def paginator(self):
+        """cursor 요청이면 키셋 페이지네이션, 아니면 기존 페이지 번호 방식"""
+        if not hasattr(self, '_paginator'):
+            if TransactionCursorPagination.requested(self.request):
+                self._paginator = TransactionCursorPagination()
+            else:
+                self._paginator = TransactionPageNumberPagination()
+        return self._paginator
+
+    @use_read_replica
+    @conditional_per_user('transactions', Transaction, Category)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_queryset(self):
         queryset = Transaction.objects.filter(user=self.request.user)
-        
-        # 필터링 옵션들
-        transaction_type = self.request.query_params.get('type', None)
-        category_id = self.request.query_params.get('category', None)
-        start_date = self.request.query_params.get('start_date', None)
-        end_date = self.request.query_params.get('end_date', None)
-        search = self.request.query_params.get('search', None)
-
-        if transaction_type:
-            queryset = queryset.filter(type=transaction_type)
-        
-        if category_id:
-            queryset = queryset.filter(category_id=category_id)
-        
-        if start_date:
-            queryset = queryset.filter(date__gte=start_date)
-        
-        if end_date:
-            queryset = queryset.filter(date__lte=end_date)
-        
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(description__icontains=search)
+        return filter_transactions(queryset, self.request.query_params).select_related('category')
+
+
+class RecurringRuleListCreateView(generics.ListCreateAPIView):
+    """반복 거래 규칙 목록 조회 및 생성"""
+    serializer_class = RecurringRuleSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return RecurringRule.objects.filter(user=self.request.user).select_related('category')
+
+    def perform_create(self, serializer):
+        # 시작일이 지났다면 밀린 발생일의 거래를 바로 만듦
+        rule = serializer.save()
+        materialize(rules=RecurringRule.objects.filter(pk=rule.pk))
+        rule.refresh_from_db(fields=['next_run'])
+
+
+class RecurringRuleDetailView(generics.RetrieveUpdateDestroyAPIView):
+    """반복 거래 규칙 상세 조회, 수정, 삭제 (이미 만든 거래는 남김)"""
+    serializer_class = RecurringRuleSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return RecurringRule.objects.filter(user=self.request.user).select_related('category')
+
+    def perform_update(self, serializer):
+        rule = serializer.save()
+        materialize(rules=RecurringRule.objects.filter(pk=rule.pk))
+        rule.refresh_from_db(fields=['next_run'])
+
+
+class TransactionImportView(APIView):
+    """은행 거래내역 파일(CSV/OFX) 일괄 가져오기"""
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': '가져올 파일을 첨부해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get('format') or upload.name.rsplit('.', 1)[-1]
+        file_format = file_format.lower()
+        if file_format not in ('csv', 'ofx', 'qfx'):
+            return Response({'error': 'CSV 또는 OFX 파일만 가져올 수 있습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            mapping = json.loads(request.data.get('mapping') or '{}')
+        except ValueError:
+            mapping = None
+        if not isinstance(mapping, dict):
+            return Response({'mapping': '열 매핑은 JSON 객체여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if file_format == 'csv':
+            rows = read_csv(
+                upload.file, mapping,
+                encoding=request.data.get('encoding') or 'utf-8-sig',
+                delimiter=request.data.get('delimiter') or ',',
+            )
+        else:
+            rows = read_ofx(upload.file, encoding=request.data.get('encoding') or 'utf-8')
+
+        try:
+            report = import_transactions(
+                request.user, rows,
+                default_categories={
+                    'income': request.data.get('default_income_category'),
+                    'expense': request.data.get('default_expense_category'),
+                },
+                dry_run=str(request.data.get('dry_run', '')).lower() in ('1', 'true'),
             )
+        except (ImportFormatError, LookupError, csv.Error) as e:
+            return Response({'error': f'파일을 읽을 수 없습니다: {e}'}, status=status.HTTP_400_BAD_REQUEST)
 
-        return queryset.select_related('category')
+        return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK)
+
+
+class TransactionExportView(APIView):
+    """거래 내역 전체 내보내기 (목록과 같은 필터, CSV / NDJSON 스트리밍)"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    @use_read_replica
+    def get(self, request):
+        export_format = request.query_params.get('export_format', 'csv').lower()
+        if export_format not in EXPORT_FORMATS:
+            return Response({'error': 'csv 또는 ndjson 형식만 지원합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = filter_transactions(
+            Transaction.objects.filter(user=request.user), request.query_params
+        )
+        # 스트리밍은 뷰가 반환된 뒤에 쿼리하므로 지금 고른 DB(복제본)로 고정
+        queryset = queryset.using(queryset.db)
+        stream, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(stream(queryset), content_type=content_type)
+        filename = f'transactions-{date.today():%Y%m%d}.{export_format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class TransactionBatchView(APIView):
+    """거래 내역 일괄 생성/수정/삭제 (하나의 DB 트랜잭션)"""
+    permission_classes = [permissions.IsAuthenticated]
+    max_operations = 500
+
+    def post(self, request):
+        operations = request.data.get('operations') if isinstance(request.data, dict) else None
+        if not isinstance(operations, list) or not operations:
+            return Response({'operations': '작업 목록을 입력해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(operations) > self.max_operations:
+            return Response({
+                'operations': f'한 번에 최대 {self.max_operations}개의 작업만 요청할 수 있습니다.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            results, has_errors = validate_batch(request.user, operations)
+            if has_errors:
+                # 하나라도 실패하면 아무것도 반영하지 않음
+                return Response({
+                    'results': [self.describe(result, 'error') for result in results]
+                }, status=status.HTTP_400_BAD_REQUEST)
+            apply_batch(results)
+
+        statuses = {'create': 'created', 'update': 'updated', 'delete': 'deleted'}
+        return Response({
+            'results': [self.describe(result, statuses[result['op']]) for result in results]
+        })
+
+    def describe(self, result, result_status):
+        item = {'index': result['index'], 'op': result['op'], 'status': result_status}
+        if 'errors' in result:
+            item['errors'] = result['errors']
+        elif result_status == 'error':
+            item['status'] = 'skipped'
+        if result['op'] in ('create', 'update') and result_status != 'error':
+            item['data'] = TransactionSerializer(result['instance']).data
+        elif 'id' in result:
+            item['id'] = result['id']
+        return item
 
 
 class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -78,75 +267,30 @@ class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@use_read_replica
+@conditional_per_user('stats', Transaction, Category)
+@cache_per_user('stats')
 def transaction_stats(request):
     """거래 통계 조회"""
-    user = request.user
-    
-    # 날짜 필터링
-    start_date = request.query_params.get('start_date')
-    end_date = request.query_params.get('end_date')
-    
-    # 기본값: 현재 월
-    if not start_date or not end_date:
-        today = date.today()
-        start_date = today.replace(day=1)
-        end_date = today
-    
-    transactions = Transaction.objects.filter(
-        user=user,
-        date__gte=start_date,
-        date__lte=end_date
-    )
-    
-    # 기본 통계
-    income_sum = transactions.filter(type='income').aggregate(
-        total=Sum('amount')
-    )['total'] or Decimal('0')
-    
-    expense_sum = transactions.filter(type='expense').aggregate(
-        total=Sum('amount')
-    )['total'] or Decimal('0')
-    
-    balance = income_sum - expense_sum
-    transaction_count = transactions.count()
-    
-    # 카테고리별 통계
-    category_stats = transactions.values(
-        'category__name', 'category__color', 'category__type'
-    ).annotate(
-        total=Sum('amount'),
-        count=Count('id')
-    ).order_by('-total')
-    
-    # 월별 통계 (최근 12개월)
-    monthly_stats = transactions.annotate(
-        month=TruncMonth('date')
-    ).values('month').annotate(
-        income=Sum('amount', filter=Q(type='income')),
-        expense=Sum('amount', filter=Q(type='expense'))
-    ).order_by('month')
-    
-    # 월별 통계 데이터 정리
-    monthly_data = []
-    for stat in monthly_stats:
-        monthly_data.append({
-            'month': stat['month'].strftime('%Y-%m'),
-            'income': stat['income'] or 0,
-            'expense': stat['expense'] or 0,
-            'balance': (stat['income'] or 0) - (stat['expense'] or 0)
-        })
-    
-    stats_data = {
-        'total_income': income_sum,
-        'total_expense': expense_sum,
-        'balance': balance,
-        'transaction_count': transaction_count,
-        'category_stats': list(category_stats),
-        'monthly_stats': monthly_data
-    }
-    
-    serializer = TransactionStatsSerializer(stats_data)
-    return Response(serializer.data)
+    # 날짜 필터링 (기본값: 현재 월)
+    try:
+        start_date, end_date = stats.parse_period(request.query_params)
+    except ValueError as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(stats.build_stats(request.user.pk, start_date, end_date))
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@use_read_replica
+@conditional_per_user('dashboard', Transaction, Category, Budget)
+@cache_per_user('dashboard')
+def dashboard(request):
+    """대시보드 조회 (이번 달 통계, 최근 거래 5개, 활성 예산 사용 현황)"""
+    return Response(build_dashboard(request.user.pk))
 
 
 @api_view(['POST'])
@@ -188,6 +332,7 @@ def create_default_categories(request):
             }
         )
         if created:
+            category.transaction_count = 0
             created_categories.append(category)
     
     # 지출 카테고리 생성
@@ -202,6 +347,7 @@ def create_default_categories(request):
             }
         )
         if created:
+            category.transaction_count = 0
             created_categories.append(category)
     
     serializer = CategorySerializer(created_categories, many=True)
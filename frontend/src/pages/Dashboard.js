@@ -18,6 +18,7 @@ import {
 const Dashboard = () => {
   const [stats, setStats] = useState(null);
   const [recentTransactions, setRecentTransactions] = useState([]);
+  const [budgetSummary, setBudgetSummary] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [chartType, setChartType] = useState("pie"); // 'pie' 또는 'bar'
@@ -31,14 +32,12 @@ const Dashboard = () => {
       setLoading(true);
       setError("");
 
-      // 병렬로 데이터 로드
-      const [statsData, transactionsData] = await Promise.all([
-        transactionService.getStats(),
-        transactionService.getTransactions({ page_size: 5 }),
-      ]);
+      // 통계, 최근 거래, 예산 현황을 한 번의 요청으로 로드
+      const data = await transactionService.getDashboard();
 
-      setStats(statsData);
-      setRecentTransactions(transactionsData.results || []);
+      setStats(data.stats);
+      setRecentTransactions(data.recent_transactions || []);
+      setBudgetSummary(data.budgets);
     } catch (err) {
       console.error("대시보드 데이터 로드 오류:", err);
       if (err.response?.status === 404) {
@@ -581,6 +580,60 @@ const Dashboard = () => {
           </div>
         </div>
       </div>
+
+      {/* 예산 현황 */}
+      {budgetSummary?.budgets?.length > 0 && (
+        <div className="bg-white rounded-lg shadow-sm border border-gray-200">
+          <div className="px-6 py-4 border-b border-gray-200">
+            <div className="flex justify-between items-center">
+              <h3 className="text-lg font-medium text-gray-900">
+                예산 현황
+                {budgetSummary.over_budget_count > 0 && (
+                  <span className="ml-2 text-sm font-medium text-danger-600">
+                    초과 {budgetSummary.over_budget_count}건
+                  </span>
+                )}
+              </h3>
+              <Link
+                to="/budgets"
+                className="text-sm text-primary-600 hover:text-primary-700 font-medium"
+              >
+                전체 보기
+              </Link>
+            </div>
+          </div>
+          <div className="p-6 space-y-4">
+            {budgetSummary.budgets.map((budget) => {
+              const usagePercentage = Number(budget.usage_percentage) || 0;
+              return (
+                <div key={budget.id}>
+                  <div className="flex justify-between text-sm mb-1">
+                    <span className="font-medium text-gray-900">
+                      {budget.name}
+                    </span>
+                    <span className="text-gray-600">
+                      {formatCurrency(budget.spent_amount)} /{" "}
+                      {formatCurrency(budget.amount)}
+                    </span>
+                  </div>
+                  <div className="w-full bg-gray-200 rounded-full h-2">
+                    <div
+                      className={`h-2 rounded-full ${
+                        usagePercentage >= 100
+                          ? "bg-danger-500"
+                          : usagePercentage >= 80
+                          ? "bg-warning-500"
+                          : "bg-success-500"
+                      }`}
+                      style={{ width: `${Math.min(usagePercentage, 100)}%` }}
+                    />
+                  </div>
+                </div>
+              );
+            })}
+          </div>
+        </div>
+      )}
     </div>
   );
 };
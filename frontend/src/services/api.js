@@ -66,4 +66,43 @@ api.interceptors.response.use(
   }
 );
 
+// 조건부 GET 캐시 - 요청 키별로 마지막 ETag 와 응답 데이터를 보관
+const revalidationCache = new Map();
+
+const revalidationKey = (url, params) =>
+  `${url}?${JSON.stringify(params || {})}`;
+
+// ETag 로 재검증하는 GET - 서버가 304 를 주면 보관해 둔 데이터를 그대로 반환
+export const getWithRevalidation = async (url, config = {}) => {
+  const key = revalidationKey(url, config.params);
+  const cached = revalidationCache.get(key);
+
+  const response = await api.get(url, {
+    ...config,
+    headers: {
+      ...config.headers,
+      ...(cached ? { "If-None-Match": cached.etag } : {}),
+    },
+    validateStatus: (status) =>
+      (status >= 200 && status < 300) || status === 304,
+  });
+
+  if (response.status === 304 && cached) {
+    return { ...response, data: cached.data };
+  }
+
+  const etag = response.headers.etag;
+  if (etag) {
+    revalidationCache.set(key, { etag, data: response.data });
+  } else {
+    revalidationCache.delete(key);
+  }
+  return response;
+};
+
+// 로그아웃 시 다른 사용자의 응답이 남지 않도록 비움
+export const clearRevalidationCache = () => {
+  revalidationCache.clear();
+};
+
 export default api;
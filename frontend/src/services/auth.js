@@ -1,4 +1,4 @@
-import api from "./api";
+import api, { clearRevalidationCache } from "./api";
 
 export const authService = {
   // 로그인
@@ -53,6 +53,7 @@ export const authService = {
       localStorage.removeItem("access_token");
       localStorage.removeItem("refresh_token");
       localStorage.removeItem("user");
+      clearRevalidationCache();
     }
   },
 
@@ -1,9 +1,9 @@
-import api from "./api";
+import api, { getWithRevalidation } from "./api";
 
 export const transactionService = {
   // 거래 내역 목록 조회
   getTransactions: async (params = {}) => {
-    const response = await api.get("/transactions/", { params });
+    const response = await getWithRevalidation("/transactions/", { params });
     return response.data;
   },
 
@@ -32,7 +32,13 @@ export const transactionService = {
 
   // 통계 조회
   getStats: async (params = {}) => {
-    const response = await api.get("/stats/", { params });
+    const response = await getWithRevalidation("/stats/", { params });
+    return response.data;
+  },
+
+  // 대시보드 조회 (이번 달 통계, 최근 거래, 예산 현황을 한 번에)
+  getDashboard: async () => {
+    const response = await getWithRevalidation("/dashboard/");
     return response.data;
   },
 };
@@ -40,7 +46,7 @@ export const transactionService = {
 export const categoryService = {
   // 카테고리 목록 조회
   getCategories: async (params = {}) => {
-    const response = await api.get("/categories/", { params });
+    const response = await getWithRevalidation("/categories/", { params });
     return response.data;
   },
 
@@ -77,7 +83,7 @@ export const categoryService = {
 export const budgetService = {
   // 예산 목록 조회
   getBudgets: async (params = {}) => {
-    const response = await api.get("/budgets/", { params });
+    const response = await getWithRevalidation("/budgets/", { params });
     return response.data;
   },
 
@@ -104,3 +110,13 @@ export const budgetService = {
     await api.delete(`/budgets/${id}/`);
   },
 };
+
+export const syncService = {
+  // since 커서 이후 변경/삭제 내역 조회
+  getChanges: async (since = 0, params = {}) => {
+    const response = await api.get("/sync/changes/", {
+      params: { ...params, since },
+    });
+    return response.data;
+  },
+};